@@ -5,7 +5,19 @@ Input: a list of bead IDs (argv, --input-file JSON, or stdin JSON).
 Output: JSON array, one entry per bead:
     {id, title, status, priority, type, parent, blocks, blocked_by, error?}
 
-Under the hood:
+Under the hood (default `--backend batch`): ids are grouped into chunks
+of 100 and each chunk is ONE call
+
+    bd show <id1> <id2> ... --json --include-dependents
+
+whose array is split back out by `id`, so 500 beads cost 5 bd process
+starts / DB opens instead of 500. bd exits non-zero when any id is
+unknown, so its stdout is parsed regardless of exit code and only the
+ids it did not return fall back to the per-bead call. If bd printed
+nothing at all, the chunk is split in half and each half retried, so
+one bad id costs ~2·log2(100) calls rather than 100. The per-bead call
+is the whole story under `--backend single`:
+
     bd show <id> --json --include-dependents
 
 **Array-vs-object quirk**: `bd show --json` returns a single-element
@@ -15,11 +27,42 @@ array when the bead is found. Normalize with
 `dependencies` and `dependents` lists (see `normalize_bead`).
 """
 
+import functools
 import json
+import os
 import subprocess
-from typing import Any
+from typing import Any, Iterator
+
+from .common import (
+    DEFAULT_MAX_WORKERS,
+    BatchStats,
+    ResponseCache,
+    cached_run,
+    emit_json,
+    emit_ndjson,
+    iter_parallel,
+    log,
+    log_cache_stats,
+    open_cache,
+    open_stats,
+    parse_executor,
+    parse_max_workers,
+    read_inputs,
+    report_stats,
+)
+
+# Adaptive-concurrency key for `--max-workers auto` (see common.limiter_for).
+LIMITER_KEY = "bd"
+
+# Beads are edited locally and often; keep cached `bd show` output short-lived.
+CACHE_TTL_SECONDS = 30
 
-from .common import DEFAULT_MAX_WORKERS, emit_json, log, parallel_map, read_inputs
+# `--backend`: one multi-id `bd show` per chunk, or one call per bead.
+BACKENDS = ("batch", "single")
+
+# Ids per multi-id `bd show`. Bounds argv length and the bisection
+# depth when one bad id makes bd refuse the whole call.
+BD_BATCH_SIZE = 100
 
 
 def normalize_bead(raw: Any, requested_id: str) -> dict:
@@ -127,18 +170,218 @@ def fetch_bead(
     return normalize_bead(payload, bid)
 
 
+def fetch_bead_batch(
+    bead_ids: list[str],
+    *,
+    run: Any = None,
+) -> dict:
+    """Fetch a chunk of beads with as few multi-id `bd show` calls as possible.
+
+    Returns `{"results": [...]}` aligned with `bead_ids`: the
+    `fetch_bead`-shaped dict for every bead bd returned (or whose id was
+    empty, or that bd refused on its own), and `None` for every bead it
+    did not — the caller re-fetches those one at a time. See
+    `_show_chunk` for how a refused call is narrowed down. If a call
+    raises (timeout, bd missing) or prints unparseable JSON, the dict
+    also carries a chunk-level `error` and the affected beads get it
+    too, so the limiter and `--stats` see the failure.
+
+    `run=None` resolves to `subprocess.run` at call time, like `fetch_bead`.
+    """
+    if run is None:
+        run = subprocess.run
+    out: list[dict | None] = [None] * len(bead_ids)
+    wanted: dict[str, list[int]] = {}
+    for i, bead_id in enumerate(bead_ids):
+        bid = str(bead_id).strip()
+        if not bid:
+            out[i] = {"id": bead_id, "error": "empty bead id"}
+        else:
+            wanted.setdefault(bid, []).append(i)
+    if not wanted:
+        return {"results": out}
+    found, error = _show_chunk(list(wanted), run)
+    for bid, positions in wanted.items():
+        for i in positions:
+            out[i] = found.get(bid)
+    if error is None:
+        return {"results": out}
+    return {"results": out, "error": error}
+
+
+# `_show_many` outcomes: bd answered (possibly partially), bd refused the
+# call and printed nothing parseable, or the call itself failed.
+_SHOW_OK, _SHOW_REFUSED, _SHOW_FAILED = "ok", "refused", "failed"
+
+
+def _show_many(ids: list[str], run: Any) -> tuple[str, dict[str, dict], str | None]:
+    """One `bd show <ids...>` call → `(outcome, {id: bead}, error)`."""
+    cmd = ["bd", "show", *ids, "--json", "--include-dependents"]
+    try:
+        result = run(cmd, capture_output=True, text=True, timeout=120)
+    except Exception as exc:  # noqa: BLE001 — tool boundary
+        error = f"{type(exc).__name__}: {exc}"
+        return _SHOW_FAILED, {bid: {"id": bid, "error": error} for bid in ids}, error
+    stdout = (result.stdout or "").strip()
+    try:
+        payload = json.loads(stdout) if stdout else None
+    except json.JSONDecodeError as exc:
+        if result.returncode == 0:
+            error = f"invalid bd JSON: {exc}"
+            return (
+                _SHOW_FAILED,
+                {bid: {"id": bid, "error": error} for bid in ids},
+                error,
+            )
+        payload = None
+    if payload is None and result.returncode != 0:
+        error = (result.stderr or "").strip() or f"bd exited {result.returncode}"
+        return _SHOW_REFUSED, {}, error
+    found: dict[str, dict] = {}
+    for raw in payload if isinstance(payload, list) else [payload]:
+        bid = raw.get("id") if isinstance(raw, dict) else None
+        if isinstance(bid, str) and bid in ids:
+            found[bid] = normalize_bead(raw, bid)
+    return _SHOW_OK, found, None
+
+
+def _show_chunk(
+    ids: list[str],
+    run: Any,
+    first: tuple[str, dict[str, dict], str | None] | None = None,
+) -> tuple[dict[str, dict], str | None]:
+    """`{id: bead}` for `ids`, bisecting when bd refuses the whole call.
+
+    A refused single id is that bead's answer (bd's stderr as its
+    `error`). A refused chunk is split in half and each half retried,
+    recursing into the halves that are refused again. If BOTH halves
+    are refused too (several bad ids, or bd itself failing) splitting
+    stops and those ids are left to the per-bead fallback. `first` is
+    an already-made `_show_many(ids)` result.
+    """
+    outcome, found, error = first or _show_many(ids, run)
+    if outcome != _SHOW_REFUSED:
+        return found, error
+    if len(ids) == 1:
+        return {ids[0]: {"id": ids[0], "error": error}}, None
+    mid = len(ids) // 2
+    halves = [(half, _show_many(half, run)) for half in (ids[:mid], ids[mid:])]
+    if all(call[0] == _SHOW_REFUSED for _, call in halves):
+        return {}, None
+    found, error = {}, None
+    for half, call in halves:
+        half_found, half_error = _show_chunk(half, run, call)
+        found.update(half_found)
+        error = error or half_error
+    return found, error
+
+
+def iter_beads_batched(
+    bead_ids: list[str],
+    *,
+    run: Any = None,
+    batch_size: int = BD_BATCH_SIZE,
+    max_workers: int | str = DEFAULT_MAX_WORKERS,
+    stats: BatchStats | None = None,
+    executor: str = "thread",
+) -> Iterator[tuple[int, dict]]:
+    """Yield `(index, result)` for every bead id via multi-id `bd show`.
+
+    Same two-phase shape as `gh_pr_details.iter_prs_batched`: chunks in
+    parallel first, then per-bead `fetch_bead` for the ids they did not
+    return.
+    """
+    chunks = [
+        list(range(start, min(start + batch_size, len(bead_ids))))
+        for start in range(0, len(bead_ids), batch_size)
+    ]
+    fallback: list[int] = []
+    for chunk_idx, payload in iter_parallel(
+        [[bead_ids[i] for i in chunk] for chunk in chunks],
+        functools.partial(fetch_bead_batch, run=run),
+        max_workers=max_workers,
+        limiter_key=LIMITER_KEY,
+        stats=stats,
+        executor=executor,
+    ):
+        results = payload.get("results")
+        if results is None:
+            # The worker itself blew up (a dead process-pool task): report
+            # it per bead rather than re-running the chunk bead by bead.
+            error = payload.get("error", "no result")
+            results = [{"id": bead_ids[i], "error": error} for i in chunks[chunk_idx]]
+        for idx, result in zip(chunks[chunk_idx], results):
+            if result is None:
+                fallback.append(idx)
+            else:
+                yield idx, result
+    if not fallback:
+        return
+    log(
+        f"batch: {len(fallback)} bead(s) missing from multi-id bd show; fetching singly"
+    )
+    for pos, result in iter_parallel(
+        [bead_ids[i] for i in fallback],
+        functools.partial(fetch_bead, run=run),
+        max_workers=max_workers,
+        limiter_key=LIMITER_KEY,
+        stats=stats,
+        executor=executor,
+    ):
+        yield fallback[pos], result
+
+
 def run_cli(
     bead_ids: list[str],
     *,
-    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_workers: int | str = DEFAULT_MAX_WORKERS,
     pretty: bool = False,
+    stream: bool = False,
+    cache: ResponseCache | None = None,
+    refresh: bool = False,
+    stats: BatchStats | None = None,
+    executor: str = "thread",
+    backend: str = "batch",
+    run: Any = None,
 ) -> int:
     if not bead_ids:
         log("error: no bead ids provided")
         return 2
-    log(f"fetching {len(bead_ids)} bead(s) with max_workers={max_workers}")
-    results = parallel_map(bead_ids, fetch_bead, max_workers=max_workers)
-    emit_json(results, pretty=pretty)
+    if backend not in BACKENDS:
+        log(
+            f"error: unknown backend {backend!r}; expected one of {', '.join(BACKENDS)}"
+        )
+        return 2
+    log(
+        f"fetching {len(bead_ids)} bead(s) via {backend} with max_workers={max_workers}"
+    )
+    if cache is not None:
+        # bd resolves its database from the cwd; key the cache on it too.
+        run = cached_run(
+            cache, CACHE_TTL_SECONDS, refresh=refresh, run=run, namespace=os.getcwd()
+        )
+    if backend == "batch":
+        pairs = iter_beads_batched(
+            bead_ids, run=run, max_workers=max_workers, stats=stats, executor=executor
+        )
+    else:
+        pairs = iter_parallel(
+            bead_ids,
+            functools.partial(fetch_bead, run=run),
+            max_workers=max_workers,
+            limiter_key=LIMITER_KEY,
+            stats=stats,
+            executor=executor,
+        )
+    if stream:
+        emit_ndjson(pairs)
+    else:
+        results: list[dict] = [{"error": "no result"}] * len(bead_ids)
+        for idx, result in pairs:
+            results[idx] = result
+        emit_json(results, pretty=pretty)
+    log_cache_stats(cache)
+    report_stats(stats)
     return 0
 
 
@@ -164,24 +407,78 @@ def _build_app():  # pragma: no cover
         input_file: str = typer.Option(
             None, "--input-file", help="JSON file: array of bead IDs."
         ),
-        max_workers: int = typer.Option(
-            DEFAULT_MAX_WORKERS,
+        max_workers: str = typer.Option(
+            str(DEFAULT_MAX_WORKERS),
             "--max-workers",
-            min=1,
-            help="Max parallel `bd show` calls.",
+            help=(
+                "Max parallel `bd show` calls. "
+                "Integer >= 1, or 'auto' to adapt to backend health."
+            ),
+        ),
+        backend: str = typer.Option(
+            "batch",
+            "--backend",
+            help="batch: 100 ids per `bd show` call; single: one `bd show` per bead.",
         ),
         pretty: bool = typer.Option(
             False, "--pretty", help="Pretty-print JSON output."
         ),
+        stream: bool = typer.Option(
+            False,
+            "--stream",
+            help="Emit one NDJSON line per bead as it completes, tagged with its input index.",
+        ),
+        no_cache: bool = typer.Option(
+            False,
+            "--no-cache",
+            help="Bypass the on-disk response cache entirely (no reads, no writes).",
+        ),
+        refresh: bool = typer.Option(
+            False,
+            "--refresh",
+            help="Ignore cached responses but store the fresh ones.",
+        ),
+        executor: str = typer.Option(
+            "thread",
+            "--executor",
+            help=(
+                "thread (default; subprocess-bound work) or process "
+                "(CPU-bound decode/normalise across cores)."
+            ),
+        ),
+        show_stats: bool = typer.Option(
+            False,
+            "--stats",
+            help="Log per-item latency, throughput and utilisation to stderr when done.",
+        ),
+        stats_file: str = typer.Option(
+            None,
+            "--stats-file",
+            help="Also write the stats summary and per-item timings as JSON here (implies --stats).",
+        ),
     ) -> None:
         if ctx.invoked_subcommand is not None:
             return
         try:
+            workers = parse_max_workers(max_workers)
+            executor = parse_executor(executor)
             items = read_inputs(bead_ids, input_file)
         except (ValueError, OSError, json.JSONDecodeError) as exc:
             log(f"error: {exc}")
             raise typer.Exit(2)
-        raise typer.Exit(run_cli(items, max_workers=max_workers, pretty=pretty))
+        raise typer.Exit(
+            run_cli(
+                items,
+                max_workers=workers,
+                pretty=pretty,
+                stream=stream,
+                cache=open_cache(no_cache),
+                refresh=refresh,
+                stats=open_stats(show_stats, stats_file),
+                executor=executor,
+                backend=backend,
+            )
+        )
 
     return app
 
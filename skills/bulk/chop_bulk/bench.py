@@ -0,0 +1,375 @@
+"""bulk bench — throughput / tail-latency harness for the bulk CLIs.
+
+Drives each tool's `run_cli` against `FakeBackend`, a `subprocess.run`
+stand-in injected through the same `run=` seam the tests use. It
+answers `gh pr view`, `gh api graphql`, `gh pr list`, `bd show` and
+the up-to-date diagnose with canned JSON after a sampled latency, and
+fails a configurable fraction of calls (plain errors, or HTTP 429 so
+`--max-workers auto` backoff is exercised). No network, gh, or bd.
+
+    python -m chop_bulk.bench --items 200 --workers 1,8,32,auto
+    python -m chop_bulk.bench --tools bd,gh-pr --error-rate 0.02 --json > base.json
+    python -m chop_bulk.bench --baseline base.json --tolerance 0.2   # exit 1 on regression
+
+Per (tool, workers) it reports wall time, items/sec, per-unit latency
+p50/p95/max (a unit is one worker call: a GraphQL / multi-id chunk
+counts once — see `BatchStats`), item errors, and backend calls.
+
+Stdlib-only like `common`, so it runs without the tool's uv env.
+"""
+
+import argparse
+import io
+import json
+import math
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, Callable
+
+from . import bd_show, gh_pr_details, gh_prs_open, up_to_date
+from .common import AUTO_WORKERS, BatchStats, parse_max_workers, reset_limiters
+
+_GRAPHQL_ALIAS_RE = re.compile(
+    r'pr(\d+): repository\(owner: "([^"]*)", name: "([^"]*)"\) '
+    r"\{ pullRequest\(number: (\d+)\)"
+)
+
+
+class FakeBackend:
+    """Thread-safe fake `subprocess.run` for gh / bd / diagnose commands.
+
+    Latency is lognormal around `latency_ms` (`jitter` is sigma, so 0
+    is constant) plus `per_item_ms` for every PR / bead a batched call
+    carries. `error_rate` / `rate_limit_rate` are per-call probabilities.
+    Seeded, so two runs with the same config see the same draws.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 20.0,
+        jitter: float = 0.5,
+        per_item_ms: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: int = 0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.per_item_ms = per_item_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.sleep = sleep
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self) -> tuple[float, float]:
+        with self._lock:
+            self.calls += 1
+            return self._rng.gauss(0.0, 1.0), self._rng.random()
+
+    def __call__(self, cmd: list[str], **kwargs: Any) -> subprocess.CompletedProcess:
+        z, roll = self._draw()
+        stdout, items = self._respond(cmd)
+        delay_ms = self.latency_ms * math.exp(self.jitter * z)
+        self.sleep((delay_ms + self.per_item_ms * items) / 1000)
+        if roll < self.rate_limit_rate:
+            return subprocess.CompletedProcess(
+                cmd, 1, "", "HTTP 429: API rate limit exceeded (fake)"
+            )
+        if roll < self.rate_limit_rate + self.error_rate:
+            return subprocess.CompletedProcess(cmd, 1, "", "fake backend error")
+        return subprocess.CompletedProcess(cmd, 0, stdout, "")
+
+    def _respond(self, cmd: list[str]) -> tuple[str, int]:
+        """Canned stdout for `cmd`, and how many items it answers."""
+        head = list(cmd[:3])
+        if head == ["gh", "pr", "view"]:
+            number = int(cmd[5])
+            return json.dumps(_pr(cmd[4], number)), 1
+        if head == ["gh", "api", "graphql"]:
+            query = next(c for c in cmd if c.startswith("query="))
+            data = {
+                f"pr{alias}": {"pullRequest": _pr(f"{owner}/{name}", int(number))}
+                for alias, owner, name, number in _GRAPHQL_ALIAS_RE.findall(query)
+            }
+            return json.dumps({"data": data}), len(data)
+        if head == ["gh", "pr", "list"]:
+            prs = [
+                {"number": n, "title": f"PR {n}", "headRefName": f"branch-{n}"}
+                for n in range(1, 4)
+            ]
+            return json.dumps(prs), 1
+        if head[:2] == ["bd", "show"]:
+            ids = [c for c in cmd[2:] if not c.startswith("--")]
+            return json.dumps([_bead(i) for i in ids]), len(ids)
+        return json.dumps({"fake": True, "cmd": cmd[0]}), 1
+
+
+def _pr(repo: str, number: int) -> dict:
+    return {
+        "title": f"PR {number}",
+        "state": "OPEN",
+        "mergeable": "MERGEABLE",
+        "mergeStateStatus": "CLEAN",
+        "url": f"https://github.com/{repo}/pull/{number}",
+    }
+
+
+def _bead(bead_id: str) -> dict:
+    return {
+        "id": bead_id,
+        "title": f"Bead {bead_id}",
+        "status": "open",
+        "priority": 2,
+        "issue_type": "task",
+        "dependencies": [],
+        "dependents": [],
+    }
+
+
+def _fake_diagnose_cmd() -> list[str]:
+    return ["up-to-date-diag"]
+
+
+def _fake_repos(n: int, root: Path) -> list[str]:
+    """`n` empty dirs with a `.git` marker — all `diagnose_repo` checks."""
+    paths = []
+    for i in range(n):
+        repo = root / f"repo{i}"
+        (repo / ".git").mkdir(parents=True, exist_ok=True)
+        paths.append(str(repo))
+    return paths
+
+
+# name -> (run_cli, inputs(n, tmpdir), extra run_cli kwargs)
+TOOLS: dict[str, tuple[Callable[..., int], Callable[[int, Path], list], dict]] = {
+    "gh-pr": (
+        gh_pr_details.run_cli,
+        lambda n, _tmp: [f"o/r#{i}" for i in range(1, n + 1)],
+        {"backend": "graphql"},
+    ),
+    "gh-pr-view": (
+        gh_pr_details.run_cli,
+        lambda n, _tmp: [f"o/r#{i}" for i in range(1, n + 1)],
+        {"backend": "view"},
+    ),
+    "gh-open": (
+        gh_prs_open.run_cli,
+        lambda n, _tmp: [f"o/repo{i}" for i in range(n)],
+        {},
+    ),
+    "bd": (
+        bd_show.run_cli,
+        lambda n, _tmp: [f"bench-{i}" for i in range(n)],
+        {"backend": "batch"},
+    ),
+    "bd-single": (
+        bd_show.run_cli,
+        lambda n, _tmp: [f"bench-{i}" for i in range(n)],
+        {"backend": "single"},
+    ),
+    "up-to-date": (
+        up_to_date.run_cli,
+        _fake_repos,
+        {"resolve": _fake_diagnose_cmd},
+    ),
+}
+
+
+def _count_errors(stdout: str) -> int:
+    try:
+        results = json.loads(stdout)
+    except json.JSONDecodeError:
+        return -1
+    return sum(1 for r in results if isinstance(r, dict) and r.get("error"))
+
+
+def run_bench(
+    tool: str,
+    items: int,
+    workers: int | str,
+    backend: FakeBackend,
+) -> dict:
+    """Run one (tool, workers) cell and return its report row."""
+    run_cli, make_inputs, extra = TOOLS[tool]
+    stats = BatchStats()
+    reset_limiters()  # every auto cell starts from the same limit
+    calls_before = backend.calls
+    out, err = io.StringIO(), io.StringIO()
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = make_inputs(items, Path(tmp))
+        with redirect_stdout(out), redirect_stderr(err):
+            start = time.monotonic()
+            rc = run_cli(inputs, max_workers=workers, stats=stats, run=backend, **extra)
+            wall = time.monotonic() - start
+    summary = stats.summary()
+    return {
+        "tool": tool,
+        "workers": str(workers),
+        "items": items,
+        "rc": rc,
+        "wall": wall,
+        "items_per_sec": items / wall if wall > 0 else 0.0,
+        "units": summary["items"],
+        "p50_ms": summary["latency"]["p50"] * 1000,
+        "p95_ms": summary["latency"]["p95"] * 1000,
+        "max_ms": summary["latency"]["max"] * 1000,
+        "errors": _count_errors(out.getvalue()),
+        "calls": backend.calls - calls_before,
+    }
+
+
+def compare(rows: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Regression messages for `rows` vs `baseline` (matched on tool/workers/items).
+
+    A cell regresses when items/sec drops, or p95 latency grows, by more
+    than `tolerance` (a fraction). Cells missing from either side are
+    ignored.
+    """
+    base = {(r["tool"], r["workers"], r["items"]): r for r in baseline}
+    problems = []
+    for row in rows:
+        old = base.get((row["tool"], row["workers"], row["items"]))
+        if old is None:
+            continue
+        cell = f"{row['tool']} workers={row['workers']}"
+        if row["items_per_sec"] < old["items_per_sec"] * (1 - tolerance):
+            problems.append(
+                f"{cell}: items/sec {row['items_per_sec']:.1f} < "
+                f"baseline {old['items_per_sec']:.1f}"
+            )
+        if row["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            problems.append(
+                f"{cell}: p95 {row['p95_ms']:.1f}ms > baseline {old['p95_ms']:.1f}ms"
+            )
+    return problems
+
+
+def format_table(rows: list[dict]) -> str:
+    header = (
+        f"{'tool':<12} {'workers':>7} {'items':>6} {'wall s':>7} {'items/s':>8} "
+        f"{'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} {'errors':>6} {'calls':>6}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r['tool']:<12} {r['workers']:>7} {r['items']:>6} {r['wall']:>7.2f} "
+            f"{r['items_per_sec']:>8.1f} {r['p50_ms']:>7.1f} {r['p95_ms']:>7.1f} "
+            f"{r['max_ms']:>7.1f} {r['errors']:>6} {r['calls']:>6}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="python -m chop_bulk.bench",
+        description="Benchmark the bulk CLIs against a fake gh/bd backend.",
+    )
+    p.add_argument(
+        "--tools",
+        default=",".join(TOOLS),
+        help=f"Comma-separated subset of: {', '.join(TOOLS)} (default: all).",
+    )
+    p.add_argument(
+        "--items", type=int, default=100, help="Inputs per run (default 100)."
+    )
+    p.add_argument(
+        "--workers",
+        default=f"1,8,32,{AUTO_WORKERS}",
+        help="Comma-separated --max-workers values to sweep (default 1,8,32,auto).",
+    )
+    p.add_argument(
+        "--latency-ms", type=float, default=20.0, help="Median call latency."
+    )
+    p.add_argument(
+        "--jitter",
+        type=float,
+        default=0.5,
+        help="Lognormal sigma of latency (0 = fixed).",
+    )
+    p.add_argument(
+        "--per-item-ms",
+        type=float,
+        default=0.5,
+        help="Extra latency per PR / bead in a batched call.",
+    )
+    p.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of calls that fail."
+    )
+    p.add_argument(
+        "--rate-limit-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of calls that fail with HTTP 429.",
+    )
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument(
+        "--json", action="store_true", help="Emit rows as JSON instead of a table."
+    )
+    p.add_argument(
+        "--baseline", help="JSON from an earlier --json run to compare against."
+    )
+    p.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed fractional slowdown vs --baseline (default 0.2).",
+    )
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    tools = [t.strip() for t in args.tools.split(",") if t.strip()]
+    unknown = [t for t in tools if t not in TOOLS]
+    if unknown:
+        print(f"error: unknown tool(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    try:
+        worker_counts = [parse_max_workers(w.strip()) for w in args.workers.split(",")]
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    knobs = ("latency_ms", "jitter", "per_item_ms", "error_rate", "rate_limit_rate")
+    config = {k: getattr(args, k) for k in ("items", *knobs, "seed")}
+    backend = FakeBackend(
+        latency_ms=args.latency_ms,
+        jitter=args.jitter,
+        per_item_ms=args.per_item_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+    rows = []
+    for tool in tools:
+        for workers in worker_counts:
+            rows.append(run_bench(tool, args.items, workers, backend))
+            if not args.json:
+                print(f"  {tool} workers={workers} done", file=sys.stderr)
+    if args.json:
+        print(json.dumps({"config": config, "rows": rows}, indent=2))
+    else:
+        print(format_table(rows))
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        problems = compare(rows, baseline.get("rows", []), args.tolerance)
+        for line in problems:
+            print(f"REGRESSION: {line}", file=sys.stderr)
+        if problems:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
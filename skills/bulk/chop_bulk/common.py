@@ -8,18 +8,69 @@ Every bulk tool follows the same shape:
     3. Capture per-item failures as `{..., "error": "..."}` in the result —
        never fail the whole batch.
     4. Emit the result list as JSON to stdout; log progress to stderr.
+       With `--stream`, emit one NDJSON line per item as it completes
+       instead, tagged with its input `index` so callers can re-order.
+
+`--max-workers auto` swaps the fixed pool for an `AdaptiveLimiter`
+per backend (github / bd / fs / git): concurrency grows while the
+backend is healthy, halves on rate-limit errors, and rate-limited items
+are retried after a jittered backoff.
+
+`--executor process` runs workers on a `ProcessPoolExecutor` instead,
+in chunks, so CPU-bound decode/normalise work scales past the GIL.
+Process workers must be picklable: top-level functions, optionally
+bound with `functools.partial` — never closures.
+
+`--stats` / `--stats-file` record per-item wall time, queue wait and
+attempts into a `BatchStats` and report latency percentiles,
+throughput and worker utilisation when the batch finishes.
+
+`gh` / `bd` lookups can be memoised across invocations through
+`ResponseCache` (SQLite under the XDG cache dir) — see `cached_run`.
 
 Kept stdlib-only so tests and pre-commit hooks (no uv) can import this
 module directly. Typer lives only in each tool's `_build_app()`.
 """
 
+import functools
 import json
+import math
+import os
+import pickle
+import random
+import re
+import sqlite3
+import subprocess
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Callable, Iterable
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
 
 DEFAULT_MAX_WORKERS = 8
 
+# `--max-workers auto`: start where the fixed default sits, never exceed
+# the ceiling. Each backend adapts independently inside that range.
+AUTO_WORKERS = "auto"
+AUTO_MAX_WORKERS = 32
+
+# `--executor`: threads suit subprocess waits; processes suit CPU-bound
+# post-processing (JSON decode, normalisation) that threads serialise.
+EXECUTORS = ("thread", "process")
+
+# Errors that mean "slow down", not "this item is broken": GitHub's
+# primary/secondary rate limits and abuse detection surface as HTTP
+# 403/429 with one of these phrases in `gh`'s stderr.
+_RATE_LIMIT_RE = re.compile(
+    r"rate limit|HTTP 4(?:03|29)\b|abuse detection|too many requests", re.IGNORECASE
+)
+
+# Total stdout bytes the response cache may hold before least-recently-
+# used rows are evicted. PR/bead JSON is ~1 KB, so this is ~tens of
+# thousands of entries — far more than any session touches.
+DEFAULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
 
 def read_inputs(
     positional: list[str] | None,
@@ -57,16 +108,514 @@ def read_inputs(
         raise ValueError("stdin was empty; pass positional args or --input-file PATH")
     data = json.loads(raw)
     if not isinstance(data, list):
+        raise ValueError(f"stdin JSON must be an array; got {type(data).__name__}")
+    return data
+
+
+def parse_max_workers(value: str | int) -> int | str:
+    """Parse `--max-workers`: an integer >= 1, or `"auto"`.
+
+    Raises ValueError so each CLI surfaces it like any other bad input.
+    """
+    if isinstance(value, str) and value.strip().lower() == AUTO_WORKERS:
+        return AUTO_WORKERS
+    try:
+        n = int(value)
+    except (TypeError, ValueError):
         raise ValueError(
-            f"stdin JSON must be an array; got {type(data).__name__}"
+            f"--max-workers must be an integer >= 1 or 'auto'; got {value!r}"
+        ) from None
+    if n < 1:
+        raise ValueError(f"--max-workers must be >= 1; got {n}")
+    return n
+
+
+def parse_executor(value: str) -> str:
+    """Parse `--executor`: one of `EXECUTORS`. Raises ValueError otherwise."""
+    name = value.strip().lower()
+    if name not in EXECUTORS:
+        raise ValueError(
+            f"--executor must be one of {', '.join(EXECUTORS)}; got {value!r}"
+        )
+    return name
+
+
+def is_rate_limited(result: dict) -> bool:
+    """True if a worker result's `error` reads as backend throttling."""
+    error = result.get("error") if isinstance(result, dict) else None
+    return isinstance(error, str) and bool(_RATE_LIMIT_RE.search(error))
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency gate for one backend, shared by every batch using it.
+
+    - Additive increase: after `limit` consecutive healthy calls, allow
+      one more concurrent call — unless the latency EWMA has drifted past
+      2x the best seen (backend saturating), in which case hold; past 4x,
+      give one slot back.
+    - Multiplicative decrease: a rate-limited result halves `limit` and
+      pauses ALL callers for a jittered exponential backoff, since GitHub's
+      secondary limits are per-token, not per-request.
+    - The caller retries a rate-limited item up to `max_attempts` times.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_MAX_WORKERS,
+        ceiling: int = AUTO_MAX_WORKERS,
+        *,
+        max_attempts: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.limit = max(1, min(initial, ceiling))
+        self.ceiling = ceiling
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng
+        self.active = 0
+        self.peak = self.limit
+        self.throttles = 0
+        self.latency_ewma: float | None = None
+        self.best_latency: float | None = None
+        self._healthy_streak = 0
+        self._pause_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                wait = self._pause_until - time.monotonic()
+                if wait <= 0 and self.active < self.limit:
+                    self.active += 1
+                    return
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self) -> None:
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def record_success(self, latency: float) -> None:
+        with self._cond:
+            if self.latency_ewma is None:
+                self.latency_ewma = latency
+            else:
+                self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * latency
+            if self.best_latency is None or self.latency_ewma < self.best_latency:
+                self.best_latency = self.latency_ewma
+            self._healthy_streak += 1
+            if self._healthy_streak < self.limit:
+                return
+            self._healthy_streak = 0
+            best = self.best_latency or 0.0
+            if self.latency_ewma <= 2 * best and self.limit < self.ceiling:
+                self.limit += 1
+                self.peak = max(self.peak, self.limit)
+                self._cond.notify_all()
+            elif self.latency_ewma > 4 * best and self.limit > 1:
+                self.limit -= 1
+
+    def record_throttle(self, attempt: int) -> None:
+        with self._cond:
+            self.throttles += 1
+            self._healthy_streak = 0
+            now = time.monotonic()
+            # One halving per backoff window: the other in-flight calls
+            # that hit the same limit must not collapse `limit` to 1.
+            if now >= self._pause_until:
+                self.limit = max(1, self.limit // 2)
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+            delay *= 0.5 + self.rng()  # full jitter in [0.5x, 1.5x)
+            self._pause_until = max(self._pause_until, now + delay)
+
+    def call(self, worker: Callable[[Any], dict], item: Any) -> dict:
+        """Run `worker(item)` under the gate, retrying while rate-limited."""
+        return self.call_counted(worker, item)[0]
+
+    def call_counted(
+        self, worker: Callable[[Any], dict], item: Any
+    ) -> tuple[dict, int]:
+        """`call`, plus how many attempts it took (for `BatchStats`)."""
+        attempt = 0
+        while True:
+            attempt += 1
+            self.acquire()
+            start = time.monotonic()
+            try:
+                result = worker(item)
+            except Exception as exc:  # noqa: BLE001 — tool boundary
+                result = {"error": f"{type(exc).__name__}: {exc}"}
+            finally:
+                self.release()
+            if not is_rate_limited(result):
+                self.record_success(time.monotonic() - start)
+                return result, attempt
+            self.record_throttle(attempt)
+            if attempt >= self.max_attempts:
+                return result, attempt
+
+
+_LIMITERS: dict[str, AdaptiveLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def limiter_for(backend: str) -> AdaptiveLimiter:
+    """The process-wide `AdaptiveLimiter` for `backend` (created on first use)."""
+    with _LIMITERS_LOCK:
+        if backend not in _LIMITERS:
+            _LIMITERS[backend] = AdaptiveLimiter()
+        return _LIMITERS[backend]
+
+
+def reset_limiters() -> None:
+    """Forget every backend's learned concurrency (benchmarks, tests)."""
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of `values` (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _item_label(item: Any) -> str:
+    """Short human label for a work item: the item itself, or a chunk's head."""
+    if isinstance(item, (list, tuple)) and item:
+        text = f"{item[0]} (+{len(item) - 1} more)" if len(item) > 1 else str(item[0])
+    else:
+        text = str(item)
+    return text if len(text) <= 120 else text[:117] + "..."
+
+
+class BatchStats:
+    """Opt-in per-item telemetry for `iter_parallel` / `parallel_map`.
+
+    Each completed item records its wall time (inside the worker,
+    including rate-limit retries), queue wait (submit -> start), and
+    attempt count. `summary()` rolls those up into latency percentiles,
+    throughput, and worker utilisation (busy time / pool capacity).
+    One instance may span several `iter_parallel` calls — e.g. the
+    GraphQL chunks and per-PR fallbacks of `bulk-gh-pr-details` — so a
+    unit is whatever the caller handed to the pool.
+
+    `report()` writes the summary to stderr and, when `path` is set,
+    a JSON sidecar with the summary plus every per-item record.
+    """
+
+    def __init__(self, path: Path | str | None = None, *, slowest: int = 5) -> None:
+        self.path = Path(path) if path is not None else None
+        self.slowest = slowest
+        self.records: list[dict] = []
+        self.workers = 0
+        self.started: float | None = None
+        self.finished: float | None = None
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        item: Any,
+        *,
+        submitted: float,
+        started: float,
+        finished: float,
+        attempts: int,
+        error: bool,
+    ) -> None:
+        entry = {
+            "item": _item_label(item),
+            "wall": finished - started,
+            "queue_wait": started - submitted,
+            "attempts": attempts,
+            "error": error,
+        }
+        with self._lock:
+            self.records.append(entry)
+            if self.started is None or submitted < self.started:
+                self.started = submitted
+            if self.finished is None or finished > self.finished:
+                self.finished = finished
+
+    def note_workers(self, n: int) -> None:
+        with self._lock:
+            self.workers = max(self.workers, n)
+
+    def summary(self) -> dict:
+        with self._lock:
+            records = list(self.records)
+            elapsed = (
+                self.finished - self.started
+                if self.started is not None and self.finished is not None
+                else 0.0
+            )
+            workers = self.workers
+        walls = [r["wall"] for r in records]
+        waits = [r["queue_wait"] for r in records]
+        busy = sum(walls)
+        capacity = workers * elapsed
+        return {
+            "items": len(records),
+            "errors": sum(1 for r in records if r["error"]),
+            "elapsed": elapsed,
+            "items_per_sec": len(records) / elapsed if elapsed > 0 else 0.0,
+            "workers": workers,
+            "utilisation": min(1.0, busy / capacity) if capacity > 0 else 0.0,
+            "attempts": sum(r["attempts"] for r in records),
+            "retried": sum(1 for r in records if r["attempts"] > 1),
+            "latency": {
+                "p50": _percentile(walls, 50),
+                "p95": _percentile(walls, 95),
+                "max": max(walls, default=0.0),
+            },
+            "queue_wait": {
+                "p50": _percentile(waits, 50),
+                "p95": _percentile(waits, 95),
+                "max": max(waits, default=0.0),
+            },
+            "slowest": sorted(records, key=lambda r: r["wall"], reverse=True)[
+                : self.slowest
+            ],
+        }
+
+    def report(self) -> None:
+        """Log the summary to stderr; also write the JSON sidecar if `path` is set."""
+        s = self.summary()
+        lat, wait = s["latency"], s["queue_wait"]
+        log(
+            f"stats: {s['items']} item(s), {s['errors']} error(s) in "
+            f"{s['elapsed']:.2f}s ({s['items_per_sec']:.1f}/s); "
+            f"latency p50 {lat['p50']:.3f}s p95 {lat['p95']:.3f}s max {lat['max']:.3f}s; "
+            f"queue p50 {wait['p50']:.3f}s p95 {wait['p95']:.3f}s; "
+            f"{s['attempts']} attempt(s), {s['retried']} retried; "
+            f"utilisation {s['utilisation']:.0%} of {s['workers']} worker(s)"
+        )
+        if s["slowest"]:
+            log(
+                "stats: slowest: "
+                + ", ".join(f"{r['item']} {r['wall']:.3f}s" for r in s["slowest"])
+            )
+        if self.path is not None:
+            with self._lock:
+                records = list(self.records)
+            try:
+                self.path.write_text(
+                    json.dumps({"summary": s, "items": records}, indent=2) + "\n",
+                    encoding="utf-8",
+                )
+            except OSError as exc:
+                log(f"warning: could not write --stats-file {self.path}: {exc}")
+
+
+def open_stats(enabled: bool, stats_file: str | None) -> BatchStats | None:
+    """CLI helper: a `BatchStats` when `--stats` or `--stats-file` is given."""
+    if not enabled and not stats_file:
+        return None
+    return BatchStats(stats_file)
+
+
+def report_stats(stats: BatchStats | None) -> None:
+    """`stats.report()`; no-op when telemetry is off."""
+    if stats is not None:
+        stats.report()
+
+
+def _submit_args(
+    call: Callable[..., dict], item: Any, stats: BatchStats | None
+) -> tuple[Any, ...]:
+    # Timed calls also need their submit timestamp to measure queue wait.
+    return (call, item) if stats is None else (call, item, time.monotonic())
+
+
+def _timed_call(
+    worker: Callable[[Any], dict],
+    limiter: AdaptiveLimiter | None,
+    stats: BatchStats,
+    item: Any,
+    submitted: float,
+) -> dict:
+    """Run one item (through `limiter` if set) and record it into `stats`."""
+    started = time.monotonic()
+    try:
+        if limiter is not None:
+            result, attempts = limiter.call_counted(worker, item)
+        else:
+            result, attempts = worker(item), 1
+    except Exception as exc:  # noqa: BLE001 — tool boundary
+        result, attempts = {"error": f"{type(exc).__name__}: {exc}"}, 1
+    stats.record(
+        item,
+        submitted=submitted,
+        started=started,
+        finished=time.monotonic(),
+        attempts=attempts,
+        error=isinstance(result, dict) and "error" in result,
+    )
+    return result
+
+
+def _run_chunk(
+    worker: Callable[[Any], dict], chunk: list[Any]
+) -> list[tuple[dict, float, float]]:
+    """Process-pool task: run `worker` over `chunk`, never raising.
+
+    Returns `(result, started, finished)` per item. `time.monotonic` is
+    system-wide on Linux and macOS, so the parent can compare the
+    timestamps with its own submit time.
+    """
+    out = []
+    for item in chunk:
+        started = time.monotonic()
+        try:
+            result = worker(item)
+        except Exception as exc:  # noqa: BLE001 — tool boundary
+            result = {"error": f"{type(exc).__name__}: {exc}"}
+        out.append((result, started, time.monotonic()))
+    return out
+
+
+def _iter_process(
+    items_list: list[Any],
+    worker: Callable[[Any], dict],
+    max_workers: int | str,
+    stats: BatchStats | None,
+    chunksize: int | None,
+) -> Iterator[tuple[int, dict]]:
+    """`iter_parallel` on a ProcessPoolExecutor, `chunksize` items per task.
+
+    Chunking amortises the pickle round-trip per task; the default aims
+    for ~4 chunks per process so a slow chunk doesn't idle the rest.
+    `max_workers="auto"` means one process per CPU — the rate-limit
+    limiter lives in one process and cannot gate a pool of them.
+    """
+    try:
+        pickle.dumps(worker)
+    except Exception as exc:  # noqa: BLE001 — any pickling failure
+        raise TypeError(
+            f"executor='process' needs a picklable worker (top-level function or "
+            f"functools.partial of one); got {worker!r}: {exc}"
+        ) from exc
+    n = len(items_list)
+    if max_workers == AUTO_WORKERS:
+        pool_size = min(os.cpu_count() or 1, n)
+    else:
+        pool_size = max(1, min(int(max_workers), n))
+    size = chunksize or max(1, math.ceil(n / (pool_size * 4)))
+    starts = range(0, n, size)
+    with ProcessPoolExecutor(max_workers=pool_size) as executor:
+        futures = {}
+        for start in starts:
+            fut = executor.submit(_run_chunk, worker, items_list[start : start + size])
+            futures[fut] = (start, time.monotonic())
+        for fut in as_completed(futures):
+            start, submitted = futures.pop(fut)
+            chunk = items_list[start : start + size]
+            try:
+                timed = fut.result()
+            except Exception as exc:  # noqa: BLE001 — e.g. a worker process died
+                error = {"error": f"{type(exc).__name__}: {exc}"}
+                now = time.monotonic()
+                timed = [(error, now, now)] * len(chunk)
+            for offset, (result, started, finished) in enumerate(timed):
+                if stats is not None:
+                    stats.record(
+                        chunk[offset],
+                        submitted=submitted,
+                        started=max(started, submitted),
+                        finished=max(finished, submitted),
+                        attempts=1,
+                        error=isinstance(result, dict) and "error" in result,
+                    )
+                yield start + offset, result
+    if stats is not None:
+        stats.note_workers(pool_size)
+
+
+def iter_parallel(
+    items: Iterable[Any],
+    worker: Callable[[Any], dict],
+    max_workers: int | str = DEFAULT_MAX_WORKERS,
+    *,
+    limiter_key: str = "default",
+    stats: BatchStats | None = None,
+    executor: str = "thread",
+    chunksize: int | None = None,
+) -> Iterator[tuple[int, dict]]:
+    """Yield `(index, worker(item))` pairs in COMPLETION order.
+
+    The streaming core under `parallel_map`: same never-partial-fail
+    contract (a raising worker yields an `{"error": ...}` entry), but
+    each result is handed to the caller as soon as its future finishes
+    and the executor's reference is dropped right after, so a caller
+    that writes-and-forgets keeps peak memory flat on large batches.
+    `index` is the item's position in `items`.
+
+    `max_workers="auto"` routes every call through `limiter_for(limiter_key)`;
+    the thread pool is sized to the limiter's ceiling and the limiter
+    decides how many of those threads may be inside `worker` at once.
+
+    With `stats`, every item's timing and attempt count is recorded
+    into it (see `BatchStats`); without, the worker runs unwrapped.
+
+    `executor="process"` dispatches `chunksize` items per task to a
+    process pool (see `_iter_process`); results still arrive as
+    `(index, result)` pairs, a chunk at a time.
+    """
+    items_list = list(items)
+    if not items_list:
+        return
+    if executor == "process":
+        yield from _iter_process(items_list, worker, max_workers, stats, chunksize)
+        return
+    if executor != "thread":
+        raise ValueError(
+            f"unknown executor {executor!r}; expected one of {', '.join(EXECUTORS)}"
+        )
+    limiter: AdaptiveLimiter | None = None
+    if max_workers == AUTO_WORKERS:
+        limiter = limiter_for(limiter_key)
+        pool_size = min(limiter.ceiling, len(items_list))
+        call = functools.partial(limiter.call, worker)
+    else:
+        pool_size = max(1, min(int(max_workers), len(items_list)))
+        call = worker
+    if stats is not None:
+        call = functools.partial(_timed_call, worker, limiter, stats)
+    with ThreadPoolExecutor(max_workers=pool_size) as executor:
+        futures = {
+            executor.submit(*_submit_args(call, item, stats)): idx
+            for idx, item in enumerate(items_list)
+        }
+        for fut in as_completed(futures):
+            idx = futures.pop(fut)
+            try:
+                result = fut.result()
+            except Exception as exc:  # noqa: BLE001 — tool boundary
+                result = {"error": f"{type(exc).__name__}: {exc}"}
+            yield idx, result
+    if stats is not None:
+        stats.note_workers(limiter.peak if limiter is not None else pool_size)
+    if limiter is not None:
+        log(
+            f"auto: {limiter_key} backend at {limiter.limit} worker(s) "
+            f"(peak {limiter.peak}, {limiter.throttles} rate-limit backoff(s))"
         )
-    return data
 
 
 def parallel_map(
     items: Iterable[Any],
     worker: Callable[[Any], dict],
-    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_workers: int | str = DEFAULT_MAX_WORKERS,
+    *,
+    limiter_key: str = "default",
+    stats: BatchStats | None = None,
+    executor: str = "thread",
+    chunksize: int | None = None,
 ) -> list[dict]:
     """Run `worker(item)` for every item on a ThreadPoolExecutor.
 
@@ -76,18 +625,22 @@ def parallel_map(
     entry so the batch never partial-fails.
 
     Order is preserved — results come out in the same order as `items`.
+    `max_workers="auto"` adapts concurrency per `limiter_key`, `stats`
+    collects per-item telemetry, and `executor="process"` fans out
+    across processes in `chunksize` batches; see `iter_parallel`.
     """
     items_list = list(items)
-    max_workers = max(1, min(max_workers, max(1, len(items_list))))
     results: list[dict | None] = [None] * len(items_list)
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(worker, item): idx for idx, item in enumerate(items_list)}
-        for fut in as_completed(futures):
-            idx = futures[fut]
-            try:
-                results[idx] = fut.result()
-            except Exception as exc:  # noqa: BLE001 — tool boundary
-                results[idx] = {"error": f"{type(exc).__name__}: {exc}"}
+    for idx, result in iter_parallel(
+        items_list,
+        worker,
+        max_workers=max_workers,
+        limiter_key=limiter_key,
+        stats=stats,
+        executor=executor,
+        chunksize=chunksize,
+    ):
+        results[idx] = result
     # Remove the None placeholders (mypy/pyright happiness) — every slot
     # is filled by the loop above.
     return [r if r is not None else {"error": "no result"} for r in results]
@@ -103,6 +656,240 @@ def emit_json(payload: Any, pretty: bool) -> None:
     sys.stdout.flush()
 
 
+def emit_ndjson(pairs: Iterable[tuple[int, dict]]) -> None:
+    """Write each `(index, record)` pair as one NDJSON line, flushing per line.
+
+    The `--stream` counterpart of `emit_json`: downstream `jq` / agents
+    can consume results while the batch is still running. `index` is
+    merged into the record so out-of-order lines can be re-sorted.
+    Never pretty-printed — one object per line is the whole contract.
+    """
+    for idx, record in pairs:
+        sys.stdout.write(json.dumps({"index": idx, **record}))
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+
+def default_cache_path() -> Path:
+    """`$XDG_CACHE_HOME/chop-bulk/responses.sqlite` (XDG default `~/.cache`)."""
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "chop-bulk" / "responses.sqlite"
+
+
+def cache_key(cmd: list[str], namespace: str = "") -> str:
+    """Cache key for a subprocess invocation: the exact argv, JSON-encoded.
+
+    `namespace` scopes the key for commands whose output depends on more
+    than argv — `bd show` resolves its database from the cwd, so the same
+    argv in two checkouts must not share a row.
+    """
+    argv = [str(c) for c in cmd]
+    return json.dumps([namespace, argv] if namespace else argv)
+
+
+class ResponseCache:
+    """Size-bounded LRU store of successful subprocess stdout, in SQLite.
+
+    One row per `cache_key(cmd)`. Freshness is decided at read time by
+    the caller's `ttl` (seconds), so each tool picks its own TTL against
+    the same shared file — a sibling agent's `gh pr view` warms the
+    cache for everyone. When the stored stdout exceeds `max_bytes`, the
+    least-recently-read rows are evicted.
+
+    SQLite handles cross-process locking; each thread gets its own
+    connection. Every SQLite failure (locked, corrupt, read-only disk)
+    degrades to a cache miss — the cache must never fail a batch.
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        *,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " stdout TEXT NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL,"
+                " size INTEGER NOT NULL)"
+            )
+
+    def __getstate__(self) -> dict:
+        # Process-pool workers get their own connections (and counters).
+        state = self.__dict__.copy()
+        del state["_local"], state["_stats_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str, ttl: float) -> str | None:
+        """Return cached stdout if written within the last `ttl` seconds."""
+        now = self.clock()
+        try:
+            with self._conn() as conn:
+                row = conn.execute(
+                    "SELECT stdout FROM responses WHERE key = ? AND created >= ?",
+                    (key, now - ttl),
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+                    )
+        except sqlite3.Error:
+            row = None
+        self._count(row is not None)
+        return row[0] if row is not None else None
+
+    def put(self, key: str, stdout: str) -> None:
+        """Store `stdout` under `key`, then evict LRU rows past `max_bytes`."""
+        now = self.clock()
+        try:
+            with self._conn() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                    (key, stdout, now, now, len(stdout.encode("utf-8"))),
+                )
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM ("
+                    "  SELECT key, SUM(size) OVER ("
+                    "   ORDER BY accessed DESC, key"
+                    "  ) AS running FROM responses"
+                    " ) WHERE running > ?)",
+                    (self.max_bytes,),
+                )
+        except sqlite3.Error:
+            pass
+
+
+class CachedRun:
+    """`subprocess.run`-shaped callable backed by a `ResponseCache`.
+
+    A class rather than a closure so it pickles into process-pool
+    workers (`--executor process`). Build it with `cached_run`.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        ttl: float,
+        refresh: bool = False,
+        run: Any = None,
+        namespace: str = "",
+    ) -> None:
+        self.cache = cache
+        self.ttl = ttl
+        self.refresh = refresh
+        self.run = run
+        self.namespace = namespace
+
+    def __call__(self, cmd: list[str], **kwargs: Any) -> Any:
+        key = cache_key(cmd, self.namespace)
+        if not self.refresh:
+            stdout = self.cache.get(key, self.ttl)
+            if stdout is not None:
+                return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+        result = (self.run or subprocess.run)(cmd, **kwargs)
+        if result.returncode == 0 and isinstance(result.stdout, str):
+            self.cache.put(key, result.stdout)
+        return result
+
+
+def cached_run(
+    cache: ResponseCache,
+    ttl: float,
+    *,
+    refresh: bool = False,
+    run: Any = None,
+    namespace: str = "",
+) -> Callable[..., Any]:
+    """Wrap a `subprocess.run`-shaped callable with `cache` lookups.
+
+    The returned callable has the same signature the workers already
+    inject as `run=`, so caching needs no worker changes. Only
+    zero-exit results are stored — errors are always re-tried. A hit
+    returns a synthetic `CompletedProcess` with the cached stdout.
+    `refresh=True` skips reads but still writes, re-warming the cache.
+    `namespace` is folded into every key (see `cache_key`).
+
+    `run=None` resolves to `subprocess.run` at call time (same
+    late-binding the workers use, so test patches are honoured).
+    """
+    return CachedRun(cache, ttl, refresh, run, namespace)
+
+
+def cached_worker(
+    worker: Callable[..., dict],
+    cache: ResponseCache | None,
+    ttl: float,
+    *,
+    refresh: bool = False,
+    run: Any = None,
+) -> Callable[[Any], dict]:
+    """Bind `cached_run(cache, ttl)` into `worker`'s `run=` kwarg.
+
+    `run` is the underlying `subprocess.run`-shaped callable (None =
+    the real one); it is bound directly when `cache` is None
+    (`--no-cache`), and `worker` is returned unchanged if both are None.
+    """
+    if cache is None:
+        return worker if run is None else functools.partial(worker, run=run)
+    return functools.partial(
+        worker, run=cached_run(cache, ttl, refresh=refresh, run=run)
+    )
+
+
+def log_cache_stats(cache: ResponseCache | None) -> None:
+    """One stderr line of hit/miss counts; no-op when uncached.
+
+    Counts cover this process only: process-pool workers tally into
+    their own unpickled copies.
+    """
+    if cache is not None:
+        log(f"cache: {cache.hits} hit(s), {cache.misses} miss(es) ({cache.path})")
+
+
+def open_cache(no_cache: bool) -> ResponseCache | None:
+    """CLI helper: the default `ResponseCache`, or None when disabled/unusable."""
+    if no_cache:
+        return None
+    try:
+        return ResponseCache()
+    except (OSError, sqlite3.Error) as exc:
+        log(f"warning: response cache unavailable ({exc}); continuing uncached")
+        return None
+
+
 def log(msg: str) -> None:
     """Write a progress/diagnostic line to stderr."""
     sys.stderr.write(msg)
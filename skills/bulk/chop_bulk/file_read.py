@@ -10,24 +10,233 @@ entry carries `{size_bytes, content_utf8_or_null: null,
 error: "skipped: exceeds max-bytes"}`. Non-UTF-8 files emit
 `content_utf8_or_null: null` with the decode error.
 
+With `--stream`, emits one NDJSON line per file as it is read instead:
+    {index, path, size_bytes, content_utf8_or_null, error_or_null}
+so a large batch never holds every file's content in memory at once.
+
+Window mode (`--range START:END`, `--head N`, `--tail N`) reads only a
+slice of each file through `mmap`, so multi-hundred-MB logs are
+inspectable without loading them: the entry then also carries
+`window: {start, end}` (byte offsets actually returned) and
+`truncated` (window clipped to `--max-bytes`). Byte ranges are snapped
+inward to UTF-8 character boundaries.
+
+Repeat scans: `--fingerprint` adds `fingerprint: {mtime_ns, size,
+sha256}` and `unchanged` to every entry. `--prior PATH` (a previous
+run's output, or a list of `{path, mtime_ns, size, sha256}`) marks
+files whose stat signature — or, failing that, content hash — matches
+as `unchanged: true` with no content; a stat match skips the read
+entirely. `--dedupe` emits each distinct content once per batch; later
+paths with the same sha256 carry `duplicate_of: <first path>`
+instead. Both imply `--fingerprint`.
+
 Purpose: quick multi-file text inventory without individual `Read`
 calls. Skip-rather-than-load on big files keeps the output JSON sane.
 """
 
+import functools
+import hashlib
 import json
+import mmap
 import os
 from pathlib import Path
+from typing import Any, Iterable, Iterator
 
-from .common import DEFAULT_MAX_WORKERS, emit_json, log, parallel_map, read_inputs
+from .common import (
+    DEFAULT_MAX_WORKERS,
+    BatchStats,
+    emit_json,
+    emit_ndjson,
+    iter_parallel,
+    log,
+    open_stats,
+    parallel_map,
+    parse_executor,
+    parse_max_workers,
+    read_inputs,
+    report_stats,
+)
+
+# Adaptive-concurrency key for `--max-workers auto` (see common.limiter_for).
+LIMITER_KEY = "fs"
 
 DEFAULT_MAX_BYTES = 1_000_000  # 1 MB
 
+# A window is ("range", start, end) with Python-slice semantics (None =
+# open end, negative = from EOF), or ("head", n) / ("tail", n) lines.
+Window = tuple
+
+
+def parse_window(
+    byte_range: str | None = None,
+    head: int | None = None,
+    tail: int | None = None,
+) -> Window | None:
+    """Build the window spec from `--range` / `--head` / `--tail`.
+
+    At most one may be given. Raises ValueError on a malformed or
+    conflicting spec so the CLI can exit 2 like any other bad input.
+    """
+    flags = (("--range", byte_range), ("--head", head), ("--tail", tail))
+    given = [name for name, value in flags if value is not None]
+    if len(given) > 1:
+        raise ValueError(f"{' / '.join(given)} are mutually exclusive")
+    if head is not None or tail is not None:
+        n = head if head is not None else tail
+        if n < 0:
+            raise ValueError(f"{given[0]} must be >= 0; got {n}")
+        return ("head", n) if head is not None else ("tail", n)
+    if byte_range is None:
+        return None
+    start_s, sep, end_s = byte_range.partition(":")
+    if not sep:
+        raise ValueError(f"--range must look like START:END; got {byte_range!r}")
+    try:
+        start = int(start_s) if start_s.strip() else None
+        end = int(end_s) if end_s.strip() else None
+    except ValueError:
+        raise ValueError(
+            f"--range bounds must be integers; got {byte_range!r}"
+        ) from None
+    return ("range", start, end)
+
+
+def _utf8_start(buf: Any, pos: int, limit: int) -> int:
+    # Step forward off UTF-8 continuation bytes (0b10xxxxxx).
+    while pos < limit and (buf[pos] & 0xC0) == 0x80:
+        pos += 1
+    return pos
+
+
+def _utf8_end(buf: Any, pos: int, floor: int) -> int:
+    """Pull `pos` back so [.., pos) does not end mid-character."""
+    lead = pos
+    while lead > floor and (buf[lead - 1] & 0xC0) == 0x80:
+        lead -= 1
+    if lead == floor or lead == pos and buf[pos - 1] < 0x80:
+        return pos
+    first = buf[lead - 1]
+    need = 2 if first >> 5 == 0b110 else 3 if first >> 4 == 0b1110 else 4
+    # Complete sequence: keep it. Partial: drop the lead byte too.
+    return pos if pos - (lead - 1) >= need else lead - 1
+
+
+def _window_bounds(buf: Any, size: int, window: Window) -> tuple[int, int]:
+    """Byte offsets [start, end) of `window` within `buf` (len `size`)."""
+    kind = window[0]
+    if kind == "range":
+        start, end, _ = slice(window[1], window[2]).indices(size)
+        end = max(start, end)
+        start = _utf8_start(buf, start, end)
+        return start, _utf8_end(buf, end, start) if end < size else end
+    n = window[1]
+    if kind == "head":
+        end = 0
+        for _ in range(n):
+            nl = buf.find(b"\n", end)
+            if nl < 0:
+                return 0, size
+            end = nl + 1
+        return 0, end
+    # tail: ignore a trailing newline, then walk back n line breaks.
+    if n == 0:
+        return size, size
+    start = size - 1 if size and buf[size - 1] == 0x0A else size
+    for _ in range(n):
+        nl = buf.rfind(b"\n", 0, start)
+        if nl < 0:
+            return 0, size
+        start = nl
+    return start + 1, size
+
+
+def _read_window(
+    p: Path,
+    size: int,
+    window: Window,
+    max_bytes: int,
+    result: dict,
+) -> dict:
+    """Fill `result` with just `window` of the file, via mmap (no full read)."""
+    result["window"] = {"start": 0, "end": 0}
+    result["truncated"] = False
+    if size == 0:  # mmap cannot map an empty file
+        result["content_utf8_or_null"] = ""
+        return result
+    try:
+        with (
+            open(p, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            start, end = _window_bounds(mm, size, window)
+            if end - start > max_bytes:
+                # Keep the end of a tail, the start of anything else.
+                if window[0] == "tail":
+                    start = _utf8_start(mm, end - max_bytes, end)
+                else:
+                    end = _utf8_end(mm, start + max_bytes, start)
+                result["truncated"] = True
+            raw = mm[start:end]
+    except (OSError, ValueError) as exc:
+        result["error_or_null"] = f"read failed: {exc}"
+        return result
+    result["window"] = {"start": start, "end": end}
+    try:
+        result["content_utf8_or_null"] = raw.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        result["error_or_null"] = f"not UTF-8: {exc}"
+    return result
+
+
+def load_prior(path: str) -> dict[str, dict]:
+    """Load `--prior` fingerprints as `{path: {mtime_ns, size, sha256}}`.
+
+    Accepts what this tool emits, so a caller can feed one run's output
+    straight back in: the `{path: {..., fingerprint}}` mapping, or a
+    list of `--stream` records; plus a bare list of
+    `{path, mtime_ns, size, sha256}`. Raises ValueError on other shapes.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        records = [{"path": k, **v} for k, v in data.items() if isinstance(v, dict)]
+    elif isinstance(data, list):
+        records = [r for r in data if isinstance(r, dict)]
+    else:
+        raise ValueError(
+            f"--prior {path!r} must be a JSON object or array; got {type(data).__name__}"
+        )
+    prior: dict[str, dict] = {}
+    for record in records:
+        fp = record.get("fingerprint", record)
+        if isinstance(record.get("path"), str) and isinstance(fp, dict):
+            prior[record["path"]] = fp
+    return prior
+
+
+def _same_stat(fp: dict, stat: os.stat_result) -> bool:
+    return fp.get("mtime_ns") == stat.st_mtime_ns and fp.get("size") == stat.st_size
+
 
 def _read_one(
     path_str: str,
     max_bytes: int,
+    window: Window | None = None,
+    *,
+    fingerprint: bool = False,
+    prior: dict[str, dict] | None = None,
 ) -> dict:
-    """Open/read one file. Always returns a dict; never raises."""
+    """Open/read one file. Always returns a dict; never raises.
+
+    With `window`, only that slice is read (see `_read_window`) and
+    `max_bytes` caps the slice rather than gating the whole file.
+
+    With `fingerprint`, the entry gains `fingerprint` and `unchanged`.
+    A `prior` fingerprint with the same mtime/size short-circuits
+    before any read; a same-sha256 match after the read drops the
+    content. sha256 covers whole-file reads only — it is null for
+    windows and skipped files, which never read the full content.
+    """
     result: dict = {
         "path": path_str,
         "size_bytes": None,
@@ -45,6 +254,20 @@ def _read_one(
         result["error_or_null"] = f"stat failed: {exc}"
         return result
     result["size_bytes"] = stat.st_size
+    before = (prior or {}).get(path_str)
+    if fingerprint:
+        result["fingerprint"] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": None,
+        }
+        result["unchanged"] = False
+        if before is not None and _same_stat(before, stat):
+            result["fingerprint"]["sha256"] = before.get("sha256")
+            result["unchanged"] = True
+            return result
+    if window is not None:
+        return _read_window(p, stat.st_size, window, max_bytes, result)
     if stat.st_size > max_bytes:
         result["error_or_null"] = (
             f"skipped: exceeds max-bytes ({stat.st_size} > {max_bytes})"
@@ -56,6 +279,13 @@ def _read_one(
     except OSError as exc:
         result["error_or_null"] = f"read failed: {exc}"
         return result
+    if fingerprint:
+        sha = hashlib.sha256(raw).hexdigest()
+        result["fingerprint"]["sha256"] = sha
+        if before is not None and before.get("sha256") == sha:
+            # Touched but identical: the caller already has this content.
+            result["unchanged"] = True
+            return result
     try:
         result["content_utf8_or_null"] = raw.decode("utf-8")
     except UnicodeDecodeError as exc:
@@ -63,6 +293,27 @@ def _read_one(
     return result
 
 
+def _dedupe(pairs: Iterable[tuple[int, dict]]) -> Iterator[tuple[int, dict]]:
+    """Blank the content of every entry whose sha256 was already emitted.
+
+    First occurrence (in the order `pairs` arrive) keeps its content;
+    later ones get `duplicate_of: <first path>`.
+    """
+    first_path: dict[str, str] = {}
+    for idx, entry in pairs:
+        sha = (entry.get("fingerprint") or {}).get("sha256")
+        if sha and entry.get("content_utf8_or_null") is not None:
+            if sha in first_path and first_path[sha] != entry.get("path"):
+                entry = {
+                    **entry,
+                    "content_utf8_or_null": None,
+                    "duplicate_of": first_path[sha],
+                }
+            else:
+                first_path.setdefault(sha, entry["path"])
+        yield idx, entry
+
+
 def read_file_worker(path_str: str, *, max_bytes: int = DEFAULT_MAX_BYTES) -> dict:
     """Top-level worker fn. `parallel_map` expects one positional arg, so the
     `max_bytes` default is baked in here; the CLI passes it as a closure.
@@ -70,26 +321,86 @@ def read_file_worker(path_str: str, *, max_bytes: int = DEFAULT_MAX_BYTES) -> di
     return _read_one(path_str, max_bytes)
 
 
+def _trim(entry: dict) -> dict:
+    """The per-path payload: everything `_read_one` returns except `path`."""
+    trimmed = {
+        "size_bytes": entry.get("size_bytes"),
+        "content_utf8_or_null": entry.get("content_utf8_or_null"),
+        "error_or_null": entry.get("error_or_null"),
+    }
+    for key in ("window", "truncated", "fingerprint", "unchanged", "duplicate_of"):
+        if key in entry:
+            trimmed[key] = entry[key]
+    return trimmed
+
+
+def _stream_record(entry: dict) -> dict:
+    """Flatten one result for `--stream`: NDJSON lines can't share a mapping,
+    so `path` rides inline. Worker-raise fallbacks (no `path`) pass through.
+    """
+    if entry.get("path") is None:
+        return entry
+    return {"path": entry["path"], **_trim(entry)}
+
+
 def run_cli(
     file_paths: list[str],
     *,
-    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_workers: int | str = DEFAULT_MAX_WORKERS,
     max_bytes: int = DEFAULT_MAX_BYTES,
     pretty: bool = False,
+    stream: bool = False,
+    stats: BatchStats | None = None,
+    executor: str = "thread",
+    window: Window | None = None,
+    fingerprint: bool = False,
+    prior: dict[str, dict] | None = None,
+    dedupe: bool = False,
 ) -> int:
     if not file_paths:
         log("error: no file paths provided")
         return 2
     log(
         f"reading {len(file_paths)} file(s) with max_workers={max_workers} "
-        f"max_bytes={max_bytes}"
+        f"max_bytes={max_bytes}" + (f" window={window}" if window else "")
     )
+    fingerprint = fingerprint or dedupe or prior is not None
 
-    # Closure so parallel_map's single-arg worker contract is preserved.
-    def worker(path_str: str) -> dict:
-        return _read_one(path_str, max_bytes)
+    # partial (not a closure) keeps the single-arg worker contract and
+    # stays picklable for `executor="process"`.
+    worker = functools.partial(
+        _read_one,
+        max_bytes=max_bytes,
+        window=window,
+        fingerprint=fingerprint,
+        prior=prior,
+    )
 
-    results = parallel_map(file_paths, worker, max_workers=max_workers)
+    if stream:
+        pairs = iter_parallel(
+            file_paths,
+            worker,
+            max_workers=max_workers,
+            limiter_key=LIMITER_KEY,
+            stats=stats,
+            executor=executor,
+        )
+        if dedupe:
+            pairs = _dedupe(pairs)
+        emit_ndjson((idx, _stream_record(entry)) for idx, entry in pairs)
+        report_stats(stats)
+        return 0
+
+    results = parallel_map(
+        file_paths,
+        worker,
+        max_workers=max_workers,
+        limiter_key=LIMITER_KEY,
+        stats=stats,
+        executor=executor,
+    )
+    if dedupe:
+        results = [entry for _, entry in _dedupe(enumerate(results))]
     # Normalize into `{path: {...}}` mapping while still capturing
     # duplicate paths (later wins, with a synthetic flag).
     out: dict[str, dict] = {}
@@ -99,13 +410,9 @@ def run_cli(
             # Worker-raise fallback path: common.parallel_map wrapped it.
             out.setdefault("_error", []).append(entry)  # type: ignore[arg-type]
             continue
-        trimmed = {
-            "size_bytes": entry.get("size_bytes"),
-            "content_utf8_or_null": entry.get("content_utf8_or_null"),
-            "error_or_null": entry.get("error_or_null"),
-        }
-        out[path] = trimmed
+        out[path] = _trim(entry)
     emit_json(out, pretty=pretty)
+    report_stats(stats)
     return 0
 
 
@@ -131,19 +438,86 @@ def _build_app():  # pragma: no cover
         input_file: str = typer.Option(
             None, "--input-file", help="JSON file: array of absolute file paths."
         ),
-        max_workers: int = typer.Option(
-            DEFAULT_MAX_WORKERS, "--max-workers", min=1,
-            help="Max parallel file reads.",
+        max_workers: str = typer.Option(
+            str(DEFAULT_MAX_WORKERS),
+            "--max-workers",
+            help=(
+                "Max parallel file reads. "
+                "Integer >= 1, or 'auto' to adapt to backend health."
+            ),
         ),
         max_bytes: int = typer.Option(
-            DEFAULT_MAX_BYTES, "--max-bytes", min=1,
-            help="Skip (don't load) files larger than this. Default 1 MB.",
+            DEFAULT_MAX_BYTES,
+            "--max-bytes",
+            min=1,
+            help=(
+                "Skip (don't load) files larger than this. Default 1 MB. "
+                "With a window, caps the returned slice instead."
+            ),
+        ),
+        byte_range: str = typer.Option(
+            None,
+            "--range",
+            help="Return only bytes START:END (slice syntax; negative counts from EOF).",
+        ),
+        head: int = typer.Option(
+            None, "--head", help="Return only the first N lines of each file."
+        ),
+        tail: int = typer.Option(
+            None, "--tail", help="Return only the last N lines of each file."
+        ),
+        fingerprint: bool = typer.Option(
+            False,
+            "--fingerprint",
+            help="Add {mtime_ns, size, sha256} and `unchanged` to every entry.",
+        ),
+        prior_file: str = typer.Option(
+            None,
+            "--prior",
+            help=(
+                "JSON fingerprints from an earlier run; matching files come back "
+                "`unchanged: true` without content."
+            ),
+        ),
+        dedupe: bool = typer.Option(
+            False,
+            "--dedupe",
+            help="Emit identical content once; repeats carry `duplicate_of`.",
+        ),
+        pretty: bool = typer.Option(
+            False, "--pretty", help="Pretty-print JSON output."
+        ),
+        stream: bool = typer.Option(
+            False,
+            "--stream",
+            help="Emit one NDJSON line per file as it is read, tagged with its input index.",
+        ),
+        executor: str = typer.Option(
+            "thread",
+            "--executor",
+            help=(
+                "thread (default; subprocess-bound work) or process "
+                "(CPU-bound decode/normalise across cores)."
+            ),
+        ),
+        show_stats: bool = typer.Option(
+            False,
+            "--stats",
+            help="Log per-item latency, throughput and utilisation to stderr when done.",
+        ),
+        stats_file: str = typer.Option(
+            None,
+            "--stats-file",
+            help="Also write the stats summary and per-item timings as JSON here (implies --stats).",
         ),
-        pretty: bool = typer.Option(False, "--pretty", help="Pretty-print JSON output."),
     ) -> None:
         if ctx.invoked_subcommand is not None:
             return
         try:
+            workers = parse_max_workers(max_workers)
+            executor = parse_executor(executor)
+            window = parse_window(byte_range, head, tail)
+            prior = load_prior(prior_file) if prior_file else None
             items = read_inputs(file_paths, input_file)
         except (ValueError, OSError, json.JSONDecodeError) as exc:
             log(f"error: {exc}")
@@ -151,9 +525,16 @@ def _build_app():  # pragma: no cover
         raise typer.Exit(
             run_cli(
                 items,
-                max_workers=max_workers,
+                max_workers=workers,
                 max_bytes=max_bytes,
                 pretty=pretty,
+                stream=stream,
+                stats=open_stats(show_stats, stats_file),
+                executor=executor,
+                window=window,
+                fingerprint=fingerprint,
+                prior=prior,
+                dedupe=dedupe,
             )
         )
 
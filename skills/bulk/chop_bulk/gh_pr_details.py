@@ -7,26 +7,76 @@ Output: JSON array with
     {repo, number, title, state, mergeable, mergeStateStatus, url, error?}
 one entry per input, in input order.
 
-Under the hood:
+Under the hood (default `--backend graphql`): specs are grouped into
+chunks of 50 and each chunk becomes ONE aliased GraphQL query
+
+    gh api graphql -f query='{ pr0: repository(owner:"o", name:"r")
+                              { pullRequest(number: 1) { title state ... } } ... }'
+
+so a 200-PR sweep is 4 requests, not 200 subprocesses. A PR the batch
+answers with `null` (GraphQL partial error) falls back to the per-PR
+call, which is also the whole story under `--backend view`:
+
     gh pr view --repo <r> <n> --json title,state,mergeable,mergeStateStatus,url
 
-Each `gh` call runs on a ThreadPoolExecutor (default 8 workers). A
-failure on one PR is captured inline as `{..., "error": "..."}`; the
-batch never partial-fails.
+A chunk whose call fails outright (rate limit, auth, network, no `data`
+in the body) is NOT fanned out per PR — that would hammer the same
+failing API — but reported as a chunk error, which `--max-workers auto`
+backs off on and retries. Both backends produce the same output shape.
+Calls run on a
+ThreadPoolExecutor (default 8 workers). A failure on one PR is captured
+inline as `{..., "error": "..."}`; the batch never partial-fails.
 
 Typer lives inside `_build_app()` so tests import the pure-function
 layer without `ModuleNotFoundError` on systems lacking typer.
 """
 
+import functools
 import json
 import re
 import subprocess
-from typing import Any
+from typing import Any, Iterator
 
-from .common import DEFAULT_MAX_WORKERS, emit_json, log, parallel_map, read_inputs
+from .common import (
+    DEFAULT_MAX_WORKERS,
+    BatchStats,
+    ResponseCache,
+    cached_run,
+    emit_json,
+    emit_ndjson,
+    iter_parallel,
+    log,
+    log_cache_stats,
+    open_cache,
+    open_stats,
+    parse_executor,
+    parse_max_workers,
+    read_inputs,
+    report_stats,
+)
+
+# Adaptive-concurrency key for `--max-workers auto` (see common.limiter_for).
+LIMITER_KEY = "github"
 
 GH_PR_FIELDS = "title,state,mergeable,mergeStateStatus,url"
 
+# PR state / mergeability flip on every push or base-branch move, so a
+# cached `gh pr view` is only trusted briefly — long enough for sibling
+# agents' back-to-back sweeps to share it.
+CACHE_TTL_SECONDS = 120
+
+BACKENDS = ("graphql", "view")
+
+# PRs per aliased GraphQL query. GitHub caps a query's node count and
+# cost; 50 single-PR lookups stays far below both while still turning a
+# large sweep into a handful of requests.
+GRAPHQL_BATCH_SIZE = 50
+
+# GraphQL spelling of GH_PR_FIELDS. `mergeStateStatus` still sits behind
+# the merge-info preview media type, which `gh pr view` sends implicitly.
+_GRAPHQL_PR_SELECTION = "title state mergeable mergeStateStatus url"
+_GRAPHQL_PREVIEW_HEADER = "Accept: application/vnd.github.merge-info-preview+json"
+
 _SPEC_RE = re.compile(r"^\s*(?P<repo>[^#\s]+)#(?P<num>\d+)\s*$")
 
 
@@ -109,19 +159,229 @@ def fetch_pr(
     }
 
 
+def build_batch_query(pairs: list[tuple[str, int]]) -> str:
+    """Render one GraphQL query fetching every `(repo, number)` in `pairs`.
+
+    Each PR gets alias `pr<i>` (its position in `pairs`) so responses
+    map back without relying on order. `json.dumps` yields a valid
+    GraphQL string literal for owner/name.
+    """
+    parts = []
+    for i, (repo, number) in enumerate(pairs):
+        owner, name = repo.split("/", 1)
+        parts.append(
+            f"pr{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+            f"{{ pullRequest(number: {int(number)}) {{ {_GRAPHQL_PR_SELECTION} }} }}"
+        )
+    return "query { " + " ".join(parts) + " }"
+
+
+def fetch_pr_batch(
+    specs: list[str],
+    *,
+    run: Any = None,
+) -> dict:
+    """Fetch a chunk of PR specs with a single `gh api graphql` call.
+
+    Returns `{"results": [...]}` aligned with `specs`: the
+    `fetch_pr`-shaped dict for every PR the query resolved (or whose
+    spec failed to parse), and `None` for every PR whose alias came back
+    `null` — the caller re-fetches those one at a time. `gh api graphql`
+    exits non-zero on partial errors but still prints the `data` it has,
+    so stdout is parsed regardless of exit code.
+
+    If the call fails outright (raises, or the body has no `data`
+    object) the dict also carries a chunk-level `error` — stderr plus
+    exit code, so `is_rate_limited` sees throttling — and every PR in
+    the chunk gets that error instead of `None`.
+
+    `run=None` resolves to `subprocess.run` at call time, like `fetch_pr`.
+    """
+    if run is None:
+        run = subprocess.run
+    out: list[dict | None] = [None] * len(specs)
+    pairs: list[tuple[str, int]] = []
+    positions: list[int] = []
+    for i, spec in enumerate(specs):
+        try:
+            pairs.append(parse_spec(spec))
+            positions.append(i)
+        except ValueError as exc:
+            out[i] = {"repo": None, "number": None, "error": str(exc)}
+    if not pairs:
+        return {"results": out}
+    cmd = [
+        "gh",
+        "api",
+        "graphql",
+        "-H",
+        _GRAPHQL_PREVIEW_HEADER,
+        "-f",
+        f"query={build_batch_query(pairs)}",
+    ]
+    data: Any = None
+    try:
+        result = run(cmd, capture_output=True, text=True, timeout=60)
+    except Exception as exc:  # noqa: BLE001 — tool boundary
+        error = f"{type(exc).__name__}: {exc}"
+    else:
+        try:
+            payload = json.loads(result.stdout or "null")
+        except json.JSONDecodeError:
+            payload = None
+        data = payload.get("data") if isinstance(payload, dict) else None
+        error = _graphql_error(result, payload)
+    if not isinstance(data, dict):
+        for pos, (repo, number) in zip(positions, pairs):
+            out[pos] = {"repo": repo, "number": number, "error": error}
+        return {"results": out, "error": error}
+    for alias_idx, (pos, (repo, number)) in enumerate(zip(positions, pairs)):
+        node = data.get(f"pr{alias_idx}")
+        pr = node.get("pullRequest") if isinstance(node, dict) else None
+        if not isinstance(pr, dict):
+            continue
+        out[pos] = {
+            "repo": repo,
+            "number": number,
+            "title": pr.get("title"),
+            "state": pr.get("state"),
+            "mergeable": pr.get("mergeable"),
+            "mergeStateStatus": pr.get("mergeStateStatus"),
+            "url": pr.get("url"),
+        }
+    return {"results": out}
+
+
+def _spec_error(spec: str, error: str) -> dict:
+    try:
+        repo, number = parse_spec(spec)
+    except ValueError as exc:
+        return {"repo": None, "number": None, "error": str(exc)}
+    return {"repo": repo, "number": number, "error": error}
+
+
+def _graphql_error(result: Any, payload: Any) -> str:
+    """Chunk-level error text for a `gh api graphql` call with no `data`."""
+    detail = (result.stderr or "").strip()
+    if not detail and isinstance(payload, dict):
+        errors = payload.get("errors")
+        detail = "; ".join(
+            e["message"]
+            for e in (errors if isinstance(errors, list) else [])
+            if isinstance(e, dict) and isinstance(e.get("message"), str)
+        ) or str(payload.get("message") or "")
+    return (
+        f"gh api graphql exited {result.returncode}: {detail or 'no data in response'}"
+    )
+
+
+def iter_prs_batched(
+    specs: list[str],
+    *,
+    run: Any = None,
+    batch_size: int = GRAPHQL_BATCH_SIZE,
+    max_workers: int | str = DEFAULT_MAX_WORKERS,
+    stats: BatchStats | None = None,
+    executor: str = "thread",
+) -> Iterator[tuple[int, dict]]:
+    """Yield `(index, result)` for every spec via batched GraphQL.
+
+    Phase 1 runs the chunk queries in parallel and yields each resolved
+    PR as its chunk lands; a chunk that failed outright yields its error
+    for every PR in it. Phase 2 sends the PRs a batch answered with
+    `null` through per-PR `fetch_pr`, in parallel. Completion order,
+    like `iter_parallel`. With `stats`, each chunk and each fallback
+    PR is one recorded unit.
+    """
+    chunks = [
+        list(range(start, min(start + batch_size, len(specs))))
+        for start in range(0, len(specs), batch_size)
+    ]
+
+    fallback: list[int] = []
+    for chunk_idx, payload in iter_parallel(
+        [[specs[i] for i in chunk] for chunk in chunks],
+        functools.partial(fetch_pr_batch, run=run),
+        max_workers=max_workers,
+        limiter_key=LIMITER_KEY,
+        stats=stats,
+        executor=executor,
+    ):
+        results = payload.get("results")
+        if results is None:
+            # The worker itself blew up (raised, or a dead process-pool
+            # task): same as a failed call, never a per-PR fan-out.
+            error = payload.get("error", "no result")
+            results = [_spec_error(specs[i], error) for i in chunks[chunk_idx]]
+        for idx, result in zip(chunks[chunk_idx], results):
+            if result is None:
+                fallback.append(idx)
+            else:
+                yield idx, result
+    if not fallback:
+        return
+    log(
+        f"graphql: {len(fallback)} PR(s) unresolved in batch; falling back to gh pr view"
+    )
+    worker = functools.partial(fetch_pr, run=run)
+    for pos, result in iter_parallel(
+        [specs[i] for i in fallback],
+        worker,
+        max_workers=max_workers,
+        limiter_key=LIMITER_KEY,
+        stats=stats,
+        executor=executor,
+    ):
+        yield fallback[pos], result
+
+
 def run_cli(
     specs: list[str],
     *,
-    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_workers: int | str = DEFAULT_MAX_WORKERS,
     pretty: bool = False,
+    stream: bool = False,
+    cache: ResponseCache | None = None,
+    refresh: bool = False,
+    backend: str = "graphql",
+    stats: BatchStats | None = None,
+    executor: str = "thread",
+    run: Any = None,
 ) -> int:
     """Fan out, collect, emit. Returns process exit code."""
     if not specs:
         log("error: no PR specs provided")
         return 2
-    log(f"fetching {len(specs)} PR(s) with max_workers={max_workers}")
-    results = parallel_map(specs, fetch_pr, max_workers=max_workers)
-    emit_json(results, pretty=pretty)
+    if backend not in BACKENDS:
+        log(
+            f"error: unknown backend {backend!r}; expected one of {', '.join(BACKENDS)}"
+        )
+        return 2
+    log(f"fetching {len(specs)} PR(s) via {backend} with max_workers={max_workers}")
+    if cache is not None:
+        run = cached_run(cache, CACHE_TTL_SECONDS, refresh=refresh, run=run)
+    if backend == "graphql":
+        pairs = iter_prs_batched(
+            specs, run=run, max_workers=max_workers, stats=stats, executor=executor
+        )
+    else:
+        pairs = iter_parallel(
+            specs,
+            functools.partial(fetch_pr, run=run),
+            max_workers=max_workers,
+            limiter_key=LIMITER_KEY,
+            stats=stats,
+            executor=executor,
+        )
+    if stream:
+        emit_ndjson(pairs)
+    else:
+        results: list[dict] = [{"error": "no result"}] * len(specs)
+        for idx, result in pairs:
+            results[idx] = result
+        emit_json(results, pretty=pretty)
+    log_cache_stats(cache)
+    report_stats(stats)
     return 0
 
 
@@ -149,24 +409,78 @@ def _build_app():  # pragma: no cover — thin Typer wrapper
             "--input-file",
             help="Path to a JSON file containing an array of 'owner/repo#N' strings.",
         ),
-        max_workers: int = typer.Option(
-            DEFAULT_MAX_WORKERS,
+        max_workers: str = typer.Option(
+            str(DEFAULT_MAX_WORKERS),
             "--max-workers",
-            min=1,
-            help="Max parallel `gh pr view` calls.",
+            help=(
+                "Max parallel `gh` calls (GraphQL chunks or per-PR views). "
+                "Integer >= 1, or 'auto' to adapt to backend health."
+            ),
+        ),
+        backend: str = typer.Option(
+            "graphql",
+            "--backend",
+            help="graphql: 50 PRs per `gh api graphql` call; view: one `gh pr view` per PR.",
         ),
         pretty: bool = typer.Option(
             False, "--pretty", help="Pretty-print the JSON output."
         ),
+        stream: bool = typer.Option(
+            False,
+            "--stream",
+            help="Emit one NDJSON line per PR as it completes, tagged with its input index.",
+        ),
+        no_cache: bool = typer.Option(
+            False,
+            "--no-cache",
+            help="Bypass the on-disk response cache entirely (no reads, no writes).",
+        ),
+        refresh: bool = typer.Option(
+            False,
+            "--refresh",
+            help="Ignore cached responses but store the fresh ones.",
+        ),
+        executor: str = typer.Option(
+            "thread",
+            "--executor",
+            help=(
+                "thread (default; subprocess-bound work) or process "
+                "(CPU-bound decode/normalise across cores)."
+            ),
+        ),
+        show_stats: bool = typer.Option(
+            False,
+            "--stats",
+            help="Log per-item latency, throughput and utilisation to stderr when done.",
+        ),
+        stats_file: str = typer.Option(
+            None,
+            "--stats-file",
+            help="Also write the stats summary and per-item timings as JSON here (implies --stats).",
+        ),
     ) -> None:
         if ctx.invoked_subcommand is not None:
             return
         try:
+            workers = parse_max_workers(max_workers)
+            executor = parse_executor(executor)
             items = read_inputs(specs, input_file)
         except (ValueError, OSError, json.JSONDecodeError) as exc:
             log(f"error: {exc}")
             raise typer.Exit(2)
-        raise typer.Exit(run_cli(items, max_workers=max_workers, pretty=pretty))
+        raise typer.Exit(
+            run_cli(
+                items,
+                max_workers=workers,
+                pretty=pretty,
+                stream=stream,
+                cache=open_cache(no_cache),
+                refresh=refresh,
+                backend=backend,
+                stats=open_stats(show_stats, stats_file),
+                executor=executor,
+            )
+        )
 
     return app
 
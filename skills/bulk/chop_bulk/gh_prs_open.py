@@ -13,18 +13,40 @@ import json
 import subprocess
 from typing import Any
 
-from .common import DEFAULT_MAX_WORKERS, emit_json, log, parallel_map, read_inputs
+from .common import (
+    DEFAULT_MAX_WORKERS,
+    BatchStats,
+    ResponseCache,
+    cached_worker,
+    emit_json,
+    emit_ndjson,
+    iter_parallel,
+    log,
+    log_cache_stats,
+    open_cache,
+    open_stats,
+    parallel_map,
+    parse_executor,
+    parse_max_workers,
+    read_inputs,
+    report_stats,
+)
+
+# Adaptive-concurrency key for `--max-workers auto` (see common.limiter_for).
+LIMITER_KEY = "github"
 
 GH_PR_LIST_FIELDS = "number,title,headRefName"
 
+# Open-PR lists change as PRs open/merge; a minute of staleness is fine
+# for the fan-out sweeps this tool serves.
+CACHE_TTL_SECONDS = 60
+
 
 def validate_slug(slug: str) -> str:
     """Return the slug if it looks like `owner/repo`, else raise ValueError."""
     s = slug.strip()
     if not s or s.count("/") != 1 or any(p == "" for p in s.split("/")):
-        raise ValueError(
-            f"invalid repo slug {slug!r}: expected 'owner/repo'"
-        )
+        raise ValueError(f"invalid repo slug {slug!r}: expected 'owner/repo'")
     return s
 
 
@@ -90,15 +112,45 @@ def fetch_open_prs(
 def run_cli(
     slugs: list[str],
     *,
-    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_workers: int | str = DEFAULT_MAX_WORKERS,
     pretty: bool = False,
+    stream: bool = False,
+    cache: ResponseCache | None = None,
+    refresh: bool = False,
+    stats: BatchStats | None = None,
+    executor: str = "thread",
+    run: Any = None,
 ) -> int:
     if not slugs:
         log("error: no repo slugs provided")
         return 2
     log(f"listing open PRs across {len(slugs)} repo(s) with max_workers={max_workers}")
-    results = parallel_map(slugs, fetch_open_prs, max_workers=max_workers)
-    emit_json(results, pretty=pretty)
+    worker = cached_worker(
+        fetch_open_prs, cache, CACHE_TTL_SECONDS, refresh=refresh, run=run
+    )
+    if stream:
+        emit_ndjson(
+            iter_parallel(
+                slugs,
+                worker,
+                max_workers=max_workers,
+                limiter_key=LIMITER_KEY,
+                stats=stats,
+                executor=executor,
+            )
+        )
+    else:
+        results = parallel_map(
+            slugs,
+            worker,
+            max_workers=max_workers,
+            limiter_key=LIMITER_KEY,
+            stats=stats,
+            executor=executor,
+        )
+        emit_json(results, pretty=pretty)
+    log_cache_stats(cache)
+    report_stats(stats)
     return 0
 
 
@@ -124,20 +176,72 @@ def _build_app():  # pragma: no cover
         input_file: str = typer.Option(
             None, "--input-file", help="JSON file: array of 'owner/repo' strings."
         ),
-        max_workers: int = typer.Option(
-            DEFAULT_MAX_WORKERS, "--max-workers", min=1,
-            help="Max parallel `gh pr list` calls.",
+        max_workers: str = typer.Option(
+            str(DEFAULT_MAX_WORKERS),
+            "--max-workers",
+            help=(
+                "Max parallel `gh pr list` calls. "
+                "Integer >= 1, or 'auto' to adapt to backend health."
+            ),
+        ),
+        pretty: bool = typer.Option(
+            False, "--pretty", help="Pretty-print JSON output."
+        ),
+        stream: bool = typer.Option(
+            False,
+            "--stream",
+            help="Emit one NDJSON line per repo as it completes, tagged with its input index.",
+        ),
+        no_cache: bool = typer.Option(
+            False,
+            "--no-cache",
+            help="Bypass the on-disk response cache entirely (no reads, no writes).",
+        ),
+        refresh: bool = typer.Option(
+            False,
+            "--refresh",
+            help="Ignore cached responses but store the fresh ones.",
+        ),
+        executor: str = typer.Option(
+            "thread",
+            "--executor",
+            help=(
+                "thread (default; subprocess-bound work) or process "
+                "(CPU-bound decode/normalise across cores)."
+            ),
+        ),
+        show_stats: bool = typer.Option(
+            False,
+            "--stats",
+            help="Log per-item latency, throughput and utilisation to stderr when done.",
+        ),
+        stats_file: str = typer.Option(
+            None,
+            "--stats-file",
+            help="Also write the stats summary and per-item timings as JSON here (implies --stats).",
         ),
-        pretty: bool = typer.Option(False, "--pretty", help="Pretty-print JSON output."),
     ) -> None:
         if ctx.invoked_subcommand is not None:
             return
         try:
+            workers = parse_max_workers(max_workers)
+            executor = parse_executor(executor)
             items = read_inputs(slugs, input_file)
         except (ValueError, OSError, json.JSONDecodeError) as exc:
             log(f"error: {exc}")
             raise typer.Exit(2)
-        raise typer.Exit(run_cli(items, max_workers=max_workers, pretty=pretty))
+        raise typer.Exit(
+            run_cli(
+                items,
+                max_workers=workers,
+                pretty=pretty,
+                stream=stream,
+                cache=open_cache(no_cache),
+                refresh=refresh,
+                stats=open_stats(show_stats, stats_file),
+                executor=executor,
+            )
+        )
 
     return app
 
@@ -17,6 +17,7 @@ installed:
 The discovery happens once at module load — later calls don't re-probe.
 """
 
+import functools
 import json
 import os
 import shutil
@@ -24,7 +25,23 @@ import subprocess
 from pathlib import Path
 from typing import Any
 
-from .common import DEFAULT_MAX_WORKERS, emit_json, log, parallel_map, read_inputs
+from .common import (
+    DEFAULT_MAX_WORKERS,
+    BatchStats,
+    emit_json,
+    emit_ndjson,
+    iter_parallel,
+    log,
+    open_stats,
+    parallel_map,
+    parse_executor,
+    parse_max_workers,
+    read_inputs,
+    report_stats,
+)
+
+# Adaptive-concurrency key for `--max-workers auto` (see common.limiter_for).
+LIMITER_KEY = "git"
 
 
 def resolve_diagnose_cmd() -> list[str]:
@@ -92,7 +109,8 @@ def diagnose_repo(
         return {
             "repo": str(p),
             "diagnose_json": None,
-            "error": (result.stderr or "").strip() or f"diagnose exited {result.returncode}",
+            "error": (result.stderr or "").strip()
+            or f"diagnose exited {result.returncode}",
         }
     try:
         payload = json.loads(result.stdout or "null")
@@ -108,15 +126,47 @@ def diagnose_repo(
 def run_cli(
     repo_paths: list[str],
     *,
-    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_workers: int | str = DEFAULT_MAX_WORKERS,
     pretty: bool = False,
+    stream: bool = False,
+    stats: BatchStats | None = None,
+    executor: str = "thread",
+    run: Any = None,
+    resolve: Any = None,
 ) -> int:
     if not repo_paths:
         log("error: no repo paths provided")
         return 2
     log(f"diagnosing {len(repo_paths)} repo(s) with max_workers={max_workers}")
-    results = parallel_map(repo_paths, diagnose_repo, max_workers=max_workers)
+    # `run` / `resolve` are injection seams (tests, bench); None = real ones.
+    worker = diagnose_repo
+    if run is not None or resolve is not None:
+        worker = functools.partial(
+            diagnose_repo, run=run, resolve=resolve or resolve_diagnose_cmd
+        )
+    if stream:
+        emit_ndjson(
+            iter_parallel(
+                repo_paths,
+                worker,
+                max_workers=max_workers,
+                limiter_key=LIMITER_KEY,
+                stats=stats,
+                executor=executor,
+            )
+        )
+        report_stats(stats)
+        return 0
+    results = parallel_map(
+        repo_paths,
+        worker,
+        max_workers=max_workers,
+        limiter_key=LIMITER_KEY,
+        stats=stats,
+        executor=executor,
+    )
     emit_json(results, pretty=pretty)
+    report_stats(stats)
     return 0
 
 
@@ -142,20 +192,60 @@ def _build_app():  # pragma: no cover
         input_file: str = typer.Option(
             None, "--input-file", help="JSON file: array of absolute repo paths."
         ),
-        max_workers: int = typer.Option(
-            DEFAULT_MAX_WORKERS, "--max-workers", min=1,
-            help="Max parallel diagnose calls.",
+        max_workers: str = typer.Option(
+            str(DEFAULT_MAX_WORKERS),
+            "--max-workers",
+            help=(
+                "Max parallel diagnose calls. "
+                "Integer >= 1, or 'auto' to adapt to backend health."
+            ),
+        ),
+        pretty: bool = typer.Option(
+            False, "--pretty", help="Pretty-print JSON output."
+        ),
+        stream: bool = typer.Option(
+            False,
+            "--stream",
+            help="Emit one NDJSON line per repo as it completes, tagged with its input index.",
+        ),
+        executor: str = typer.Option(
+            "thread",
+            "--executor",
+            help=(
+                "thread (default; subprocess-bound work) or process "
+                "(CPU-bound decode/normalise across cores)."
+            ),
+        ),
+        show_stats: bool = typer.Option(
+            False,
+            "--stats",
+            help="Log per-item latency, throughput and utilisation to stderr when done.",
+        ),
+        stats_file: str = typer.Option(
+            None,
+            "--stats-file",
+            help="Also write the stats summary and per-item timings as JSON here (implies --stats).",
         ),
-        pretty: bool = typer.Option(False, "--pretty", help="Pretty-print JSON output."),
     ) -> None:
         if ctx.invoked_subcommand is not None:
             return
         try:
+            workers = parse_max_workers(max_workers)
+            executor = parse_executor(executor)
             items = read_inputs(repo_paths, input_file)
         except (ValueError, OSError, json.JSONDecodeError) as exc:
             log(f"error: {exc}")
             raise typer.Exit(2)
-        raise typer.Exit(run_cli(items, max_workers=max_workers, pretty=pretty))
+        raise typer.Exit(
+            run_cli(
+                items,
+                max_workers=workers,
+                pretty=pretty,
+                stream=stream,
+                stats=open_stats(show_stats, stats_file),
+                executor=executor,
+            )
+        )
 
     return app
 
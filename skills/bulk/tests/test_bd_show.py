@@ -7,6 +7,9 @@ Mocks subprocess.run so no real `bd` calls happen. Covers:
     - fetch_bead handles the object-not-array response shape too.
     - bd nonzero exit handled as per-item error.
     - run_cli preserves input order on fan-out.
+    - Multi-id batching: one `bd show id1 id2 ...` per chunk, split by
+      id, with per-bead fallback for ids the chunk did not return.
+    - Cached `bd show` output is keyed on the cwd (bd's database).
 
 Dependency fixtures mirror real payloads captured 2026-07-21 from
 bd 1.0.5 via `bd show <id> --json` / `bd show <id> --json
@@ -20,7 +23,9 @@ from __future__ import annotations
 
 import io
 import json
+import subprocess
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -31,9 +36,12 @@ if str(_SKILL_DIR) not in sys.path:
 
 from chop_bulk.bd_show import (  # noqa: E402
     fetch_bead,
+    fetch_bead_batch,
+    iter_beads_batched,
     normalize_bead,
     run_cli,
 )
+from chop_bulk.common import ResponseCache  # noqa: E402
 
 
 def _mk_result(stdout: str = "", stderr: str = "", returncode: int = 0) -> MagicMock:
@@ -349,5 +357,144 @@ class TestRunCli(unittest.TestCase):
         self.assertNotIn("error", parsed[2])
 
 
+def _bead(bid: str) -> dict:
+    return {"id": bid, "title": bid.upper(), "dependencies": []}
+
+
+class TestBatch(unittest.TestCase):
+    def test_one_call_split_by_id(self):
+        mock_run = MagicMock(
+            return_value=_mk_result(stdout=json.dumps([_bead("b-2"), _bead("a-1")]))
+        )
+        out = fetch_bead_batch(["a-1", "b-2", "a-1", " "], run=mock_run)["results"]
+        self.assertEqual([o["title"] for o in out[:3]], ["A-1", "B-2", "A-1"])
+        self.assertEqual(out[3]["error"], "empty bead id")
+        cmd = mock_run.call_args.args[0]
+        self.assertEqual(
+            cmd, ["bd", "show", "a-1", "b-2", "--json", "--include-dependents"]
+        )
+
+    def test_missing_ids_fall_back_even_on_nonzero_exit(self):
+        partial = MagicMock(
+            return_value=_mk_result(
+                stdout=json.dumps([_bead("a-1")]), stderr="no issue zz-9", returncode=1
+            )
+        )
+        out = fetch_bead_batch(["a-1", "zz-9"], run=partial)
+        self.assertEqual(out["results"][0]["title"], "A-1")
+        self.assertIsNone(out["results"][1])
+        self.assertNotIn("error", out)
+        self.assertEqual(partial.call_count, 1)
+
+    def test_one_unknown_id_in_a_big_chunk_is_bisected(self):
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            ids = cmd[2:-2]
+            calls.append(ids)
+            if "zz-9" in ids:  # bd refuses the whole call, prints nothing
+                return _mk_result(stderr="no issue zz-9", returncode=1)
+            return _mk_result(stdout=json.dumps([_bead(i) for i in ids]))
+
+        ids = [f"b-{n}" for n in range(99)]
+        ids.insert(37, "zz-9")
+        with patch("sys.stderr", new=io.StringIO()):
+            out = dict(iter_beads_batched(ids, run=fake_run, batch_size=100))
+        self.assertEqual(out[37], {"id": "zz-9", "error": "no issue zz-9"})
+        self.assertEqual(out[0]["title"], "B-0")
+        self.assertEqual(out[99]["title"], "B-98")
+        # One refused call, then two per halving down to the bad id
+        # (100 → 50 → 25 → 13 → 7 → 3 → 1): 13 calls instead of 1 + 100.
+        self.assertEqual(len(calls), 13)
+
+    def test_both_halves_refused_falls_back_per_id(self):
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            ids = cmd[2:-2]
+            calls.append(ids)
+            if len(ids) > 1:  # several bad ids: every multi-id call refused
+                return _mk_result(stderr="bad ids", returncode=1)
+            return _mk_result(stdout=json.dumps([_bead(ids[0])]))
+
+        with patch("sys.stderr", new=io.StringIO()):
+            out = dict(iter_beads_batched(["a-1", "b-2", "c-3", "d-4"], run=fake_run))
+        self.assertEqual(
+            [out[i]["title"] for i in range(4)], ["A-1", "B-2", "C-3", "D-4"]
+        )
+        # The chunk, its two halves, then each id singly.
+        self.assertEqual(len(calls), 3 + 4)
+
+    def test_raising_call_is_a_chunk_error_not_a_fan_out(self):
+        mock_run = MagicMock(side_effect=subprocess.TimeoutExpired("bd", 120))
+        with patch("sys.stderr", new=io.StringIO()):
+            out = dict(iter_beads_batched(["a-1", "b-2", "c-3"], run=mock_run))
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertTrue(all("TimeoutExpired" in r["error"] for r in out.values()))
+        self.assertEqual(out[2]["id"], "c-3")
+        payload = fetch_bead_batch(["a-1"], run=mock_run)
+        self.assertIn("TimeoutExpired", payload["error"])
+
+    def test_chunks_then_per_bead_fallback(self):
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            ids = cmd[2:-2]
+            calls.append(ids)
+            if "zz-9" in ids:  # bd fails the whole call on one unknown id
+                return _mk_result(stderr="no issue zz-9", returncode=1)
+            return _mk_result(stdout=json.dumps([_bead(i) for i in ids]))
+
+        with patch("sys.stderr", new=io.StringIO()):
+            pairs = iter_beads_batched(
+                ["a-1", "b-2", "c-3", "zz-9"], run=fake_run, batch_size=2, max_workers=1
+            )
+            out = dict(pairs)
+        self.assertEqual(out[0]["title"], "A-1")
+        self.assertEqual(out[2]["title"], "C-3")
+        self.assertEqual(out[3]["error"], "no issue zz-9")
+        # Two chunks; the refused one is halved into c-3 and zz-9.
+        self.assertEqual(
+            sorted(map(tuple, calls)),
+            [("a-1", "b-2"), ("c-3",), ("c-3", "zz-9"), ("zz-9",)],
+        )
+
+    def test_run_cli_batch_is_one_call(self):
+        mock_run = MagicMock(
+            return_value=_mk_result(stdout=json.dumps([_bead("a-1"), _bead("b-2")]))
+        )
+        captured = io.StringIO()
+        with (
+            patch("chop_bulk.bd_show.subprocess.run", mock_run),
+            patch("sys.stdout", new=captured),
+            patch("sys.stderr", new=io.StringIO()),
+        ):
+            rc = run_cli(["a-1", "b-2"])
+        self.assertEqual(rc, 0)
+        self.assertEqual(
+            [e["id"] for e in json.loads(captured.getvalue())], ["a-1", "b-2"]
+        )
+        self.assertEqual(mock_run.call_count, 1)
+
+    def test_cache_is_scoped_to_the_cwd(self):
+        mock_run = MagicMock(return_value=_mk_result(stdout=json.dumps([_bead("a-1")])))
+        with tempfile.TemporaryDirectory() as td:
+            cache = ResponseCache(Path(td) / "c.sqlite")
+            with (
+                patch("chop_bulk.bd_show.subprocess.run", mock_run),
+                patch("sys.stdout", new=io.StringIO()),
+                patch("sys.stderr", new=io.StringIO()),
+            ):
+                for cwd in ("/checkout-a", "/checkout-a", "/checkout-b"):
+                    with patch("chop_bulk.bd_show.os.getcwd", return_value=cwd):
+                        self.assertEqual(run_cli(["a-1"], cache=cache), 0)
+        # The repeat in checkout-a is a hit; checkout-b has its own bd DB.
+        self.assertEqual(mock_run.call_count, 2)
+
+    def test_unknown_backend_exits_2(self):
+        with patch("sys.stderr", new=io.StringIO()):
+            self.assertEqual(run_cli(["a-1"], backend="daemon"), 2)
+
+
 if __name__ == "__main__":
     unittest.main()
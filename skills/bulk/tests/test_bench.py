@@ -0,0 +1,93 @@
+"""Unit tests for chop_bulk.bench — the fake-backend benchmark harness.
+
+Covers:
+    - FakeBackend answers every command shape the real fetchers parse.
+    - FakeBackend error / rate-limit rates and per-item latency.
+    - run_bench drives each tool's run_cli end to end (zero latency).
+    - compare flags throughput and p95 regressions past the tolerance.
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+_SKILL_DIR = Path(__file__).resolve().parent.parent
+if str(_SKILL_DIR) not in sys.path:
+    sys.path.insert(0, str(_SKILL_DIR))
+
+from chop_bulk import bd_show, gh_pr_details, gh_prs_open  # noqa: E402
+from chop_bulk.bench import TOOLS, FakeBackend, compare, run_bench  # noqa: E402
+
+
+def _instant(**kwargs) -> FakeBackend:
+    return FakeBackend(latency_ms=0, jitter=0, per_item_ms=0, **kwargs)
+
+
+class TestFakeBackend(unittest.TestCase):
+    def test_real_fetchers_parse_its_output(self):
+        run = _instant()
+        self.assertEqual(gh_pr_details.fetch_pr("o/r#7", run=run)["title"], "PR 7")
+        batch = gh_pr_details.fetch_pr_batch(["o/r#1", "x/y#2"], run=run)["results"]
+        self.assertEqual(
+            [b["url"] for b in batch],
+            [
+                "https://github.com/o/r/pull/1",
+                "https://github.com/x/y/pull/2",
+            ],
+        )
+        self.assertEqual(len(gh_prs_open.fetch_open_prs("o/r", run=run)["open_prs"]), 3)
+        beads = bd_show.fetch_bead_batch(["a-1", "b-2"], run=run)
+        self.assertEqual([b["id"] for b in beads["results"]], ["a-1", "b-2"])
+
+    def test_failure_rates(self):
+        failed = _instant(error_rate=1.0)(["gh", "pr", "list"])
+        self.assertEqual(failed.stderr, "fake backend error")
+        throttled = _instant(rate_limit_rate=1.0)(["gh", "pr", "list"])
+        self.assertIn("HTTP 429", throttled.stderr)
+
+    def test_batched_calls_pay_per_item_latency(self):
+        slept = []
+        run = FakeBackend(latency_ms=10, jitter=0, per_item_ms=1, sleep=slept.append)
+        run(["bd", "show", "a", "b", "c", "--json", "--include-dependents"])
+        self.assertAlmostEqual(slept[0], 0.013)
+
+
+class TestRunBench(unittest.TestCase):
+    def test_every_tool_runs_clean(self):
+        for tool in TOOLS:
+            with self.subTest(tool=tool):
+                row = run_bench(tool, 5, 2, _instant())
+                self.assertEqual((row["rc"], row["items"], row["errors"]), (0, 5, 0))
+                self.assertGreater(row["calls"], 0)
+
+    def test_batched_tools_make_fewer_calls(self):
+        self.assertEqual(run_bench("bd", 20, 4, _instant())["calls"], 1)
+        self.assertEqual(run_bench("bd-single", 20, 4, _instant())["calls"], 20)
+
+    def test_errors_are_counted(self):
+        row = run_bench("gh-pr-view", 4, 2, _instant(error_rate=1.0))
+        self.assertEqual(row["errors"], 4)
+
+
+class TestCompare(unittest.TestCase):
+    def _row(self, ips: float, p95: float) -> dict:
+        return {
+            "tool": "bd",
+            "workers": "8",
+            "items": 10,
+            "items_per_sec": ips,
+            "p95_ms": p95,
+        }
+
+    def test_within_tolerance_passes(self):
+        self.assertEqual(compare([self._row(90, 11)], [self._row(100, 10)], 0.2), [])
+
+    def test_regressions_flagged(self):
+        problems = compare([self._row(50, 20)], [self._row(100, 10)], 0.2)
+        self.assertEqual(len(problems), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,23 +5,49 @@ Covers:
     - read_inputs rejects non-array input.
     - parallel_map preserves input order.
     - parallel_map catches worker exceptions as inline errors.
+    - iter_parallel yields (index, result) in completion order.
+    - emit_ndjson writes one index-tagged object per line.
+    - ResponseCache honours per-read TTLs and evicts least-recently-used rows.
+    - cached_run serves hits without spawning and never caches failures.
+    - parse_max_workers / is_rate_limited input classification.
+    - AdaptiveLimiter grows when healthy, halves and retries on rate limits.
+    - executor="process": chunked, order-preserving, picklable-only
+      workers; ResponseCache / cached_run survive pickling.
+    - BatchStats percentiles/utilisation, per-item recording via
+      iter_parallel (attempts included), and the JSON sidecar.
 """
 
 from __future__ import annotations
 
 import io
 import json
+import pickle
 import sys
 import tempfile
+import threading
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 _SKILL_DIR = Path(__file__).resolve().parent.parent
 if str(_SKILL_DIR) not in sys.path:
     sys.path.insert(0, str(_SKILL_DIR))
 
-from chop_bulk.common import parallel_map, read_inputs  # noqa: E402
+from chop_bulk.common import (  # noqa: E402
+    AUTO_WORKERS,
+    AdaptiveLimiter,
+    BatchStats,
+    ResponseCache,
+    cache_key,
+    cached_run,
+    emit_ndjson,
+    is_rate_limited,
+    parse_executor,
+    iter_parallel,
+    parallel_map,
+    parse_max_workers,
+    read_inputs,
+)
 
 
 class TestReadInputs(unittest.TestCase):
@@ -95,5 +121,360 @@ class TestParallelMap(unittest.TestCase):
         self.assertEqual(out, [])
 
 
+class TestIterParallel(unittest.TestCase):
+    def test_yields_in_completion_order_with_input_index(self):
+        # Item 0 blocks until item 1 has been yielded, so completion order
+        # is deterministic: 1 first, then 0.
+        release = threading.Event()
+
+        def worker(x):
+            if x == "slow":
+                release.wait(timeout=5)
+            return {"item": x}
+
+        seen = []
+        for idx, result in iter_parallel(["slow", "fast"], worker, max_workers=2):
+            seen.append((idx, result["item"]))
+            release.set()
+        self.assertEqual(seen, [(1, "fast"), (0, "slow")])
+
+    def test_worker_exception_becomes_inline_error(self):
+        def worker(x):
+            raise ValueError("nope")
+
+        out = list(iter_parallel(["a"], worker))
+        self.assertEqual(len(out), 1)
+        self.assertEqual(out[0][0], 0)
+        self.assertIn("ValueError", out[0][1]["error"])
+
+    def test_empty_list(self):
+        self.assertEqual(list(iter_parallel([], lambda x: {"x": x})), [])
+
+
+class TestEmitNdjson(unittest.TestCase):
+    def test_one_line_per_record_with_index(self):
+        captured = io.StringIO()
+        with patch("sys.stdout", new=captured):
+            emit_ndjson([(2, {"a": 1}), (0, {"b": 2})])
+        lines = captured.getvalue().splitlines()
+        self.assertEqual(
+            [json.loads(ln) for ln in lines],
+            [{"index": 2, "a": 1}, {"index": 0, "b": 2}],
+        )
+
+
+class _Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.clock = _Clock()
+        self.path = Path(self._tmp.name) / "sub" / "cache.sqlite"
+
+    def test_hit_within_ttl_miss_after(self):
+        cache = ResponseCache(self.path, clock=self.clock)
+        cache.put("k", "payload")
+        self.assertEqual(cache.get("k", ttl=60), "payload")
+        self.clock.now += 61
+        self.assertIsNone(cache.get("k", ttl=60))
+        # A longer-lived reader still accepts the same row.
+        self.assertEqual(cache.get("k", ttl=3600), "payload")
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_shared_across_instances(self):
+        ResponseCache(self.path, clock=self.clock).put("k", "v")
+        self.assertEqual(ResponseCache(self.path, clock=self.clock).get("k", 60), "v")
+
+    def test_lru_eviction_past_max_bytes(self):
+        cache = ResponseCache(self.path, max_bytes=10, clock=self.clock)
+        cache.put("a", "aaaa")
+        self.clock.now += 1
+        cache.put("b", "bbbb")
+        self.clock.now += 1
+        cache.get("a", ttl=60)  # touch `a` so `b` is least recently used
+        self.clock.now += 1
+        cache.put("c", "cccc")  # 12 bytes total > 10 → evict `b`
+        self.assertEqual(cache.get("a", 60), "aaaa")
+        self.assertIsNone(cache.get("b", 60))
+        self.assertEqual(cache.get("c", 60), "cccc")
+
+
+class TestCachedRun(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.cache = ResponseCache(Path(self._tmp.name) / "c.sqlite")
+
+    @staticmethod
+    def _result(stdout: str, returncode: int = 0) -> MagicMock:
+        m = MagicMock()
+        m.stdout, m.stderr, m.returncode = stdout, "", returncode
+        return m
+
+    def test_second_call_served_from_cache(self):
+        inner = MagicMock(return_value=self._result('{"x": 1}'))
+        run = cached_run(self.cache, ttl=60, run=inner)
+        first = run(["gh", "pr", "view", "1"], capture_output=True, text=True)
+        second = run(["gh", "pr", "view", "1"], capture_output=True, text=True)
+        self.assertEqual(inner.call_count, 1)
+        self.assertEqual(first.stdout, second.stdout)
+        self.assertEqual(second.returncode, 0)
+
+    def test_different_args_are_different_keys(self):
+        inner = MagicMock(return_value=self._result("{}"))
+        run = cached_run(self.cache, ttl=60, run=inner)
+        run(["gh", "pr", "view", "1"])
+        run(["gh", "pr", "view", "2"])
+        self.assertEqual(inner.call_count, 2)
+
+    def test_namespaces_are_different_keys(self):
+        inner = MagicMock(return_value=self._result("{}"))
+        cached_run(self.cache, ttl=60, run=inner, namespace="/a")(["bd", "show", "x"])
+        cached_run(self.cache, ttl=60, run=inner, namespace="/b")(["bd", "show", "x"])
+        cached_run(self.cache, ttl=60, run=inner)(["bd", "show", "x"])
+        self.assertEqual(inner.call_count, 3)
+
+    def test_failures_are_not_cached(self):
+        inner = MagicMock(return_value=self._result("", returncode=1))
+        run = cached_run(self.cache, ttl=60, run=inner)
+        run(["bd", "show", "x"])
+        run(["bd", "show", "x"])
+        self.assertEqual(inner.call_count, 2)
+
+    def test_refresh_skips_reads_but_rewarms(self):
+        inner = MagicMock(side_effect=[self._result("old"), self._result("new")])
+        cached_run(self.cache, ttl=60, run=inner)(["gh", "x"])
+        refreshed = cached_run(self.cache, ttl=60, refresh=True, run=inner)(["gh", "x"])
+        self.assertEqual(refreshed.stdout, "new")
+        hit = cached_run(self.cache, ttl=60, run=inner)(["gh", "x"])
+        self.assertEqual(hit.stdout, "new")
+        self.assertEqual(inner.call_count, 2)
+
+
+class TestParseMaxWorkers(unittest.TestCase):
+    def test_int_and_auto(self):
+        self.assertEqual(parse_max_workers("12"), 12)
+        self.assertEqual(parse_max_workers(3), 3)
+        self.assertEqual(parse_max_workers("AUTO"), AUTO_WORKERS)
+
+    def test_rejects_zero_and_garbage(self):
+        for bad in ("0", "-2", "lots"):
+            with self.assertRaises(ValueError):
+                parse_max_workers(bad)
+
+
+class TestIsRateLimited(unittest.TestCase):
+    def test_github_throttle_messages(self):
+        self.assertTrue(is_rate_limited({"error": "HTTP 403: API rate limit exceeded"}))
+        self.assertTrue(
+            is_rate_limited({"error": "You have exceeded a secondary rate limit"})
+        )
+        self.assertTrue(is_rate_limited({"error": "HTTP 429: Too Many Requests"}))
+
+    def test_ordinary_errors_are_not_throttles(self):
+        self.assertFalse(is_rate_limited({"error": "no pull requests found for #403"}))
+        self.assertFalse(is_rate_limited({"title": "ok"}))
+
+
+class TestAdaptiveLimiter(unittest.TestCase):
+    def test_grows_by_one_per_healthy_window(self):
+        lim = AdaptiveLimiter(initial=2, ceiling=4)
+        for _ in range(2):
+            lim.record_success(0.1)
+        self.assertEqual(lim.limit, 3)
+        for _ in range(3):
+            lim.record_success(0.1)
+        self.assertEqual(lim.limit, 4)
+        for _ in range(10):
+            lim.record_success(0.1)
+        self.assertEqual(lim.limit, 4)  # capped at ceiling
+
+    def test_holds_when_latency_degrades(self):
+        lim = AdaptiveLimiter(initial=2, ceiling=8)
+        lim.record_success(0.1)
+        lim.record_success(1.0)  # EWMA 0.28: past 2x best, under 4x
+        self.assertEqual(lim.limit, 2)
+
+    def test_shrinks_when_latency_collapses(self):
+        lim = AdaptiveLimiter(initial=2, ceiling=8)
+        lim.record_success(0.1)
+        lim.record_success(5.0)  # EWMA 1.08: past 4x best
+        self.assertEqual(lim.limit, 1)
+
+    def test_throttle_halves_once_per_backoff_window(self):
+        lim = AdaptiveLimiter(initial=8, base_delay=0.01, rng=lambda: 0.0)
+        lim.record_throttle(attempt=1)
+        lim.record_throttle(attempt=1)  # same window: no second halving
+        self.assertEqual(lim.limit, 4)
+        self.assertEqual(lim.throttles, 2)
+
+    def test_call_retries_rate_limited_item(self):
+        lim = AdaptiveLimiter(initial=2, base_delay=0.001, rng=lambda: 0.0)
+        responses = [{"error": "HTTP 429: slow down"}, {"ok": True}]
+        out = lim.call(lambda _item: responses.pop(0), "x")
+        self.assertEqual(out, {"ok": True})
+        self.assertEqual(lim.throttles, 1)
+
+    def test_call_gives_up_after_max_attempts(self):
+        lim = AdaptiveLimiter(max_attempts=2, base_delay=0.001, rng=lambda: 0.0)
+        out = lim.call(lambda _item: {"error": "API rate limit exceeded"}, "x")
+        self.assertIn("rate limit", out["error"])
+        self.assertEqual(lim.throttles, 2)
+
+    def test_auto_mode_preserves_contract(self):
+        def worker(x):
+            if x == 3:
+                raise RuntimeError("boom")
+            return {"x": x}
+
+        with patch("sys.stderr", new=io.StringIO()):
+            out = parallel_map(
+                range(10), worker, max_workers=AUTO_WORKERS, limiter_key="test-auto"
+            )
+        self.assertEqual([r.get("x") for r in out], [0, 1, 2, None, 4, 5, 6, 7, 8, 9])
+        self.assertIn("RuntimeError", out[3]["error"])
+
+
+def _square_or_raise(x: int) -> dict:
+    # Top-level so the process pool can pickle it.
+    if x == 5:
+        raise ValueError("five")
+    return {"x": x * x}
+
+
+class TestProcessExecutor(unittest.TestCase):
+    def test_preserves_order_and_inlines_errors(self):
+        out = parallel_map(
+            range(12), _square_or_raise, max_workers=3, executor="process", chunksize=4
+        )
+        self.assertEqual(out[4], {"x": 16})
+        self.assertIn("ValueError: five", out[5]["error"])
+        self.assertEqual([r.get("x") for r in out][:3], [0, 1, 4])
+
+    def test_records_stats_per_item(self):
+        stats = BatchStats()
+        parallel_map(
+            range(6), _square_or_raise, max_workers=2, executor="process", stats=stats
+        )
+        s = stats.summary()
+        self.assertEqual((s["items"], s["errors"], s["workers"]), (6, 1, 2))
+
+    def test_rejects_closures(self):
+        with self.assertRaises(TypeError):
+            parallel_map([1], lambda x: {"x": x}, executor="process")
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            parallel_map([1], _square_or_raise, executor="fiber")
+        self.assertEqual(parse_executor(" Process "), "process")
+        with self.assertRaises(ValueError):
+            parse_executor("fiber")
+
+    def test_cache_and_cached_run_pickle(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(Path(tmp) / "c.sqlite")
+            cache.put(cache_key(["gh", "x"]), "cached")
+            run = pickle.loads(pickle.dumps(cached_run(cache, ttl=60)))
+            # A hit never reaches subprocess.run, so this spawns nothing.
+            self.assertEqual(run(["gh", "x"]).stdout, "cached")
+            self.assertEqual(run.cache.hits, 1)
+
+
+class TestBatchStats(unittest.TestCase):
+    def _record(self, stats, item, wall, *, submitted=0.0, wait=0.0, attempts=1):
+        stats.record(
+            item,
+            submitted=submitted,
+            started=submitted + wait,
+            finished=submitted + wait + wall,
+            attempts=attempts,
+            error=False,
+        )
+
+    def test_summary_percentiles_and_utilisation(self):
+        stats = BatchStats()
+        for i in range(1, 11):  # walls 0.1 .. 1.0, all submitted at t=0
+            self._record(stats, f"item{i}", i / 10, wait=0.0)
+        stats.note_workers(10)
+        s = stats.summary()
+        self.assertEqual(s["items"], 10)
+        self.assertAlmostEqual(s["latency"]["p50"], 0.5)
+        self.assertAlmostEqual(s["latency"]["p95"], 1.0)
+        self.assertAlmostEqual(s["elapsed"], 1.0)
+        self.assertAlmostEqual(s["items_per_sec"], 10.0)
+        self.assertAlmostEqual(s["utilisation"], 0.55)  # 5.5s busy / (10 x 1.0s)
+        self.assertEqual([r["item"] for r in s["slowest"][:2]], ["item10", "item9"])
+
+    def test_empty_summary_is_zeroed(self):
+        s = BatchStats().summary()
+        self.assertEqual((s["items"], s["elapsed"], s["utilisation"]), (0, 0.0, 0.0))
+
+    def test_iter_parallel_records_every_item(self):
+        stats = BatchStats()
+
+        def worker(x):
+            if x == 2:
+                raise RuntimeError("boom")
+            return {"x": x}
+
+        out = parallel_map(range(5), worker, max_workers=2, stats=stats)
+        self.assertIn("RuntimeError", out[2]["error"])
+        s = stats.summary()
+        self.assertEqual((s["items"], s["errors"], s["attempts"]), (5, 1, 5))
+        self.assertEqual(s["workers"], 2)
+
+    def test_auto_mode_counts_retries(self):
+        stats = BatchStats()
+        seen: set[str] = set()
+        lock = threading.Lock()
+
+        def worker(x):
+            with lock:
+                first = x not in seen
+                seen.add(x)
+            return {"error": "HTTP 429"} if first and x == "b" else {"x": x}
+
+        limiter = AdaptiveLimiter(base_delay=0.001, rng=lambda: 0.0)
+        with (
+            patch.dict("chop_bulk.common._LIMITERS", {"test-stats": limiter}),
+            patch("sys.stderr", new=io.StringIO()),
+        ):
+            parallel_map(
+                ["a", "b", "c"],
+                worker,
+                max_workers=AUTO_WORKERS,
+                limiter_key="test-stats",
+                stats=stats,
+            )
+        s = stats.summary()
+        self.assertEqual((s["attempts"], s["retried"], s["errors"]), (4, 1, 0))
+
+    def test_chunk_items_get_short_labels(self):
+        stats = BatchStats()
+        self._record(stats, ["o/r#1", "o/r#2", "o/r#3"], 0.1)
+        self.assertEqual(stats.records[0]["item"], "o/r#1 (+2 more)")
+
+    def test_report_writes_sidecar_and_stderr_line(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "stats.json"
+            stats = BatchStats(path)
+            self._record(stats, "a", 0.2, attempts=2)
+            stats.note_workers(1)
+            err = io.StringIO()
+            with patch("sys.stderr", new=err):
+                stats.report()
+            payload = json.loads(path.read_text())
+        self.assertEqual(payload["summary"]["retried"], 1)
+        self.assertEqual(payload["items"][0]["item"], "a")
+        self.assertIn("stats: 1 item(s)", err.getvalue())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,247 @@
+"""Unit tests for bulk-file-read.
+
+Uses real temp files (reads are local, nothing to mock). Covers:
+    - Whole-file reads and the --max-bytes skip.
+    - parse_window: --range / --head / --tail parsing and exclusivity.
+    - Window reads via mmap: byte ranges (incl. negative / open ends),
+      head/tail line windows, empty files.
+    - Byte ranges snap inward to UTF-8 character boundaries.
+    - Windows larger than --max-bytes are clipped and flagged truncated.
+    - run_cli emits window metadata in the {path: {...}} mapping.
+    - run_cli output is identical on the thread and process executors.
+    - Fingerprints: stat-match short-circuit, sha-match after a touch,
+      load_prior accepting a previous run's output, and --dedupe.
+    - run_cli writes the --stats-file sidecar without --stream too.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_SKILL_DIR = Path(__file__).resolve().parent.parent
+if str(_SKILL_DIR) not in sys.path:
+    sys.path.insert(0, str(_SKILL_DIR))
+
+from chop_bulk.common import open_stats  # noqa: E402
+from chop_bulk.file_read import (  # noqa: E402
+    _read_one,
+    load_prior,
+    parse_window,
+    run_cli,
+)
+
+
+class _TmpFiles(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, name: str, data: bytes) -> str:
+        path = self.dir / name
+        path.write_bytes(data)
+        return str(path)
+
+
+class TestWholeFile(_TmpFiles):
+    def test_reads_utf8(self):
+        out = _read_one(self.write("a.txt", "héllo".encode()), 100)
+        self.assertEqual(out["content_utf8_or_null"], "héllo")
+        self.assertNotIn("window", out)
+
+    def test_skips_past_max_bytes(self):
+        out = _read_one(self.write("big.txt", b"x" * 50), 10)
+        self.assertIsNone(out["content_utf8_or_null"])
+        self.assertIn("exceeds max-bytes", out["error_or_null"])
+
+
+class TestParseWindow(unittest.TestCase):
+    def test_forms(self):
+        self.assertIsNone(parse_window())
+        self.assertEqual(parse_window("10:20"), ("range", 10, 20))
+        self.assertEqual(parse_window("-100:"), ("range", -100, None))
+        self.assertEqual(parse_window(head=5), ("head", 5))
+        self.assertEqual(parse_window(tail=0), ("tail", 0))
+
+    def test_rejects_bad_specs(self):
+        bad = (
+            {"byte_range": "10"},
+            {"byte_range": "a:b"},
+            {"head": -1},
+            {"head": 1, "tail": 1},
+        )
+        for kwargs in bad:
+            with self.assertRaises(ValueError):
+                parse_window(**kwargs)
+
+
+class TestWindowReads(_TmpFiles):
+    LINES = b"one\ntwo\nthree\nfour\n"
+
+    def read(self, data: bytes, window, max_bytes: int = 1000) -> dict:
+        return _read_one(self.write("w.txt", data), max_bytes, window)
+
+    def text(self, data: bytes, window) -> str | None:
+        return self.read(data, window)["content_utf8_or_null"]
+
+    def test_byte_range(self):
+        out = self.read(b"0123456789", ("range", 2, 5))
+        self.assertEqual(out["content_utf8_or_null"], "234")
+        self.assertEqual(out["window"], {"start": 2, "end": 5})
+
+    def test_negative_and_open_range(self):
+        self.assertEqual(self.text(b"0123456789", ("range", -3, None)), "789")
+        self.assertEqual(self.text(b"0123456789", ("range", None, 2)), "01")
+
+    def test_window_ignores_whole_file_max_bytes_gate(self):
+        out = self.read(b"x" * 5000, ("range", 0, 4), max_bytes=100)
+        self.assertEqual(out["content_utf8_or_null"], "xxxx")
+        self.assertIsNone(out["error_or_null"])
+
+    def test_head_and_tail_lines(self):
+        self.assertEqual(self.text(self.LINES, ("head", 2)), "one\ntwo\n")
+        self.assertEqual(self.text(self.LINES, ("tail", 2)), "three\nfour\n")
+        self.assertEqual(self.text(b"a\nb", ("tail", 1)), "b")
+        self.assertEqual(self.text(self.LINES, ("head", 99)), self.LINES.decode())
+        self.assertEqual(self.text(self.LINES, ("tail", 0)), "")
+
+    def test_empty_file(self):
+        out = self.read(b"", ("tail", 5))
+        self.assertEqual(out["content_utf8_or_null"], "")
+        self.assertEqual(out["size_bytes"], 0)
+
+    def test_range_snaps_to_utf8_boundaries(self):
+        data = "aé€b".encode()  # a | c3 a9 | e2 82 ac | b
+        # Start inside é, end inside €: both multibyte chars are dropped.
+        out = self.read(data, ("range", 2, 5))
+        self.assertEqual(out["content_utf8_or_null"], "")
+        # End exactly after é keeps it whole.
+        self.assertEqual(self.text(data, ("range", 0, 3)), "aé")
+        # End right after the lead byte of € drops that lead byte.
+        self.assertEqual(self.text(data, ("range", 0, 4)), "aé")
+
+    def test_oversized_window_is_truncated(self):
+        head = self.read(self.LINES, ("head", 4), max_bytes=5)
+        self.assertEqual(head["content_utf8_or_null"], "one\nt")
+        self.assertTrue(head["truncated"])
+        tail = self.read(self.LINES, ("tail", 4), max_bytes=5)
+        self.assertEqual(tail["content_utf8_or_null"], "four\n")
+        self.assertTrue(tail["truncated"])
+
+
+class TestRunCli(_TmpFiles):
+    def test_mapping_carries_window_metadata(self):
+        path = self.write("log.txt", b"a\nb\nc\n")
+        captured = io.StringIO()
+        with patch("sys.stdout", new=captured), patch("sys.stderr", new=io.StringIO()):
+            rc = run_cli([path], window=("tail", 1))
+        self.assertEqual(rc, 0)
+        entry = json.loads(captured.getvalue())[path]
+        self.assertEqual(entry["content_utf8_or_null"], "c\n")
+        self.assertEqual(entry["window"], {"start": 4, "end": 6})
+        self.assertFalse(entry["truncated"])
+
+    def test_process_executor_matches_threads(self):
+        paths = [self.write(f"f{i}.txt", f"line {i}\n".encode()) for i in range(6)]
+        outputs = []
+        for executor in ("thread", "process"):
+            captured = io.StringIO()
+            with (
+                patch("sys.stdout", new=captured),
+                patch("sys.stderr", new=io.StringIO()),
+            ):
+                run_cli(paths, max_workers=2, executor=executor, fingerprint=True)
+            outputs.append(json.loads(captured.getvalue()))
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_stats_file_written_without_stream(self):
+        paths = [self.write(f"f{i}.txt", b"x") for i in range(3)]
+        sidecar = self.dir / "stats.json"
+        with (
+            patch("sys.stdout", new=io.StringIO()),
+            patch("sys.stderr", new=io.StringIO()),
+        ):
+            rc = run_cli(paths, stats=open_stats(False, str(sidecar)))
+        self.assertEqual(rc, 0)
+        report = json.loads(sidecar.read_text())
+        self.assertEqual(report["summary"]["items"], 3)
+        self.assertEqual(sorted(r["item"] for r in report["items"]), sorted(paths))
+
+
+class TestFingerprints(_TmpFiles):
+    def run_cli_json(self, paths, **kwargs) -> dict:
+        captured = io.StringIO()
+        with patch("sys.stdout", new=captured), patch("sys.stderr", new=io.StringIO()):
+            self.assertEqual(run_cli(paths, **kwargs), 0)
+        return json.loads(captured.getvalue())
+
+    def test_fingerprint_fields(self):
+        path = self.write("a.txt", b"hello")
+        out = _read_one(path, 100, fingerprint=True)
+        fp = out["fingerprint"]
+        self.assertEqual(fp["size"], 5)
+        self.assertEqual(fp["mtime_ns"], os.stat(path).st_mtime_ns)
+        self.assertEqual(len(fp["sha256"]), 64)
+        self.assertFalse(out["unchanged"])
+
+    def test_stat_match_skips_the_read(self):
+        path = self.write("a.txt", b"hello")
+        fp = _read_one(path, 100, fingerprint=True)["fingerprint"]
+        with patch("builtins.open", side_effect=AssertionError("read happened")):
+            out = _read_one(path, 100, fingerprint=True, prior={path: fp})
+        self.assertTrue(out["unchanged"])
+        self.assertIsNone(out["content_utf8_or_null"])
+        self.assertEqual(out["fingerprint"], fp)
+
+    def test_touched_but_identical_is_unchanged(self):
+        path = self.write("a.txt", b"hello")
+        fp = _read_one(path, 100, fingerprint=True)["fingerprint"]
+        os.utime(path, ns=(0, fp["mtime_ns"] + 10**9))
+        out = _read_one(path, 100, fingerprint=True, prior={path: fp})
+        self.assertTrue(out["unchanged"])
+        self.assertNotEqual(out["fingerprint"]["mtime_ns"], fp["mtime_ns"])
+
+    def test_edited_file_returns_content(self):
+        path = self.write("a.txt", b"hello")
+        fp = _read_one(path, 100, fingerprint=True)["fingerprint"]
+        self.write("a.txt", b"hello, world")
+        out = _read_one(path, 100, fingerprint=True, prior={path: fp})
+        self.assertFalse(out["unchanged"])
+        self.assertEqual(out["content_utf8_or_null"], "hello, world")
+
+    def test_prior_round_trips_previous_output(self):
+        a, b = self.write("a.txt", b"A"), self.write("b.txt", b"B")
+        first = self.run_cli_json([a, b], fingerprint=True)
+        prior_path = self.write("prior.json", json.dumps(first).encode())
+        prior = load_prior(prior_path)
+        self.assertEqual(set(prior), {a, b})
+        second = self.run_cli_json([a, b], prior=prior)
+        self.assertTrue(all(e["unchanged"] for e in second.values()))
+        self.assertTrue(all(e["content_utf8_or_null"] is None for e in second.values()))
+
+    def test_load_prior_rejects_scalars(self):
+        with self.assertRaises(ValueError):
+            load_prior(self.write("prior.json", b"3"))
+
+    def test_dedupe_keeps_first_in_input_order(self):
+        a = self.write("a.txt", b"same")
+        b = self.write("b.txt", b"same")
+        c = self.write("c.txt", b"other")
+        out = self.run_cli_json([a, b, c], dedupe=True)
+        self.assertEqual(out[a]["content_utf8_or_null"], "same")
+        self.assertIsNone(out[b]["content_utf8_or_null"])
+        self.assertEqual(out[b]["duplicate_of"], a)
+        self.assertNotIn("duplicate_of", out[c])
+
+
+if __name__ == "__main__":
+    unittest.main()
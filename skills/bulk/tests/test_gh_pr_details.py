@@ -6,6 +6,11 @@ Mocks subprocess.run so no real `gh` calls happen. Covers:
     - gh nonzero exit handled as per-item error.
     - Malformed JSON from gh handled as per-item error.
     - Fan-out via run_cli preserves input order.
+    - A warm ResponseCache short-circuits repeat `gh` calls.
+    - GraphQL batching: aliased query shape, one call per chunk, and
+      per-PR fallback only for PRs the batch answered with `null`; a
+      chunk that fails outright is a chunk error, never a fan-out.
+    - --stats counts each GraphQL chunk and each fallback PR as one unit.
 
 Run with:
     python3 -m unittest discover -s skills/bulk/tests -p 'test_*.py'
@@ -16,6 +21,7 @@ from __future__ import annotations
 import io
 import json
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -26,8 +32,12 @@ _SKILL_DIR = Path(__file__).resolve().parent.parent
 if str(_SKILL_DIR) not in sys.path:
     sys.path.insert(0, str(_SKILL_DIR))
 
+from chop_bulk.common import AdaptiveLimiter, BatchStats, ResponseCache  # noqa: E402
 from chop_bulk.gh_pr_details import (  # noqa: E402
+    build_batch_query,
     fetch_pr,
+    fetch_pr_batch,
+    iter_prs_batched,
     parse_spec,
     run_cli,
 )
@@ -44,7 +54,10 @@ def _mk_result(stdout: str = "", stderr: str = "", returncode: int = 0) -> Magic
 
 class TestParseSpec(unittest.TestCase):
     def test_simple(self):
-        self.assertEqual(parse_spec("idvorkin/chop-conventions#169"), ("idvorkin/chop-conventions", 169))
+        self.assertEqual(
+            parse_spec("idvorkin/chop-conventions#169"),
+            ("idvorkin/chop-conventions", 169),
+        )
 
     def test_with_whitespace(self):
         self.assertEqual(parse_spec("  owner/repo#12  "), ("owner/repo", 12))
@@ -124,9 +137,7 @@ class TestFetchPr(unittest.TestCase):
         self.assertIn("gh exited 2", out["error"])
 
     def test_invalid_json_becomes_error(self):
-        mock_run = MagicMock(
-            return_value=_mk_result(stdout="not json", returncode=0)
-        )
+        mock_run = MagicMock(return_value=_mk_result(stdout="not json", returncode=0))
         out = fetch_pr("o/r#1", run=mock_run)
         self.assertIn("error", out)
         self.assertIn("invalid gh JSON", out["error"])
@@ -141,7 +152,10 @@ class TestFetchPr(unittest.TestCase):
 class TestRunCli(unittest.TestCase):
     def test_empty_input_exits_2(self):
         # Capture stdout/stderr to keep the test run clean.
-        with patch("sys.stdout", new=io.StringIO()), patch("sys.stderr", new=io.StringIO()):
+        with (
+            patch("sys.stdout", new=io.StringIO()),
+            patch("sys.stderr", new=io.StringIO()),
+        ):
             rc = run_cli([])
         self.assertEqual(rc, 2)
 
@@ -149,12 +163,27 @@ class TestRunCli(unittest.TestCase):
         # Mock subprocess.run at the module global so the pure-function path
         # is exercised end-to-end (not via the `run=` injection).
         stdout_map = {
-            "1": {"title": "one", "state": "OPEN", "mergeable": "MERGEABLE",
-                  "mergeStateStatus": "CLEAN", "url": "u1"},
-            "2": {"title": "two", "state": "CLOSED", "mergeable": "UNKNOWN",
-                  "mergeStateStatus": "DIRTY", "url": "u2"},
-            "3": {"title": "three", "state": "MERGED", "mergeable": "MERGEABLE",
-                  "mergeStateStatus": "CLEAN", "url": "u3"},
+            "1": {
+                "title": "one",
+                "state": "OPEN",
+                "mergeable": "MERGEABLE",
+                "mergeStateStatus": "CLEAN",
+                "url": "u1",
+            },
+            "2": {
+                "title": "two",
+                "state": "CLOSED",
+                "mergeable": "UNKNOWN",
+                "mergeStateStatus": "DIRTY",
+                "url": "u2",
+            },
+            "3": {
+                "title": "three",
+                "state": "MERGED",
+                "mergeable": "MERGEABLE",
+                "mergeStateStatus": "CLEAN",
+                "url": "u3",
+            },
         }
 
         def fake_run(cmd, **kwargs):
@@ -163,10 +192,12 @@ class TestRunCli(unittest.TestCase):
             return _mk_result(stdout=json.dumps(stdout_map[number]))
 
         captured = io.StringIO()
-        with patch("chop_bulk.gh_pr_details.subprocess.run", side_effect=fake_run), \
-             patch("sys.stdout", new=captured), \
-             patch("sys.stderr", new=io.StringIO()):
-            rc = run_cli(["o/r#1", "o/r#2", "o/r#3"], max_workers=3)
+        with (
+            patch("chop_bulk.gh_pr_details.subprocess.run", side_effect=fake_run),
+            patch("sys.stdout", new=captured),
+            patch("sys.stderr", new=io.StringIO()),
+        ):
+            rc = run_cli(["o/r#1", "o/r#2", "o/r#3"], max_workers=3, backend="view")
         self.assertEqual(rc, 0)
         parsed = json.loads(captured.getvalue())
         self.assertEqual([e["number"] for e in parsed], [1, 2, 3])
@@ -179,16 +210,23 @@ class TestRunCli(unittest.TestCase):
                 return _mk_result(stdout="", stderr="not found", returncode=1)
             return _mk_result(
                 stdout=json.dumps(
-                    {"title": f"t{number}", "state": "OPEN", "mergeable": "MERGEABLE",
-                     "mergeStateStatus": "CLEAN", "url": f"u{number}"}
+                    {
+                        "title": f"t{number}",
+                        "state": "OPEN",
+                        "mergeable": "MERGEABLE",
+                        "mergeStateStatus": "CLEAN",
+                        "url": f"u{number}",
+                    }
                 )
             )
 
         captured = io.StringIO()
-        with patch("chop_bulk.gh_pr_details.subprocess.run", side_effect=fake_run), \
-             patch("sys.stdout", new=captured), \
-             patch("sys.stderr", new=io.StringIO()):
-            rc = run_cli(["o/r#1", "o/r#2", "o/r#3"], max_workers=2)
+        with (
+            patch("chop_bulk.gh_pr_details.subprocess.run", side_effect=fake_run),
+            patch("sys.stdout", new=captured),
+            patch("sys.stderr", new=io.StringIO()),
+        ):
+            rc = run_cli(["o/r#1", "o/r#2", "o/r#3"], max_workers=2, backend="view")
         self.assertEqual(rc, 0)  # batch itself succeeded
         parsed = json.loads(captured.getvalue())
         self.assertEqual(len(parsed), 3)
@@ -196,6 +234,210 @@ class TestRunCli(unittest.TestCase):
         self.assertEqual(parsed[1]["error"], "not found")
         self.assertNotIn("error", parsed[2])
 
+    def test_stream_emits_ndjson_with_index(self):
+        def fake_run(cmd, **kwargs):
+            number = cmd[5]
+            return _mk_result(
+                stdout=json.dumps(
+                    {
+                        "title": f"t{number}",
+                        "state": "OPEN",
+                        "mergeable": "MERGEABLE",
+                        "mergeStateStatus": "CLEAN",
+                        "url": f"u{number}",
+                    }
+                )
+            )
+
+        captured = io.StringIO()
+        with (
+            patch("chop_bulk.gh_pr_details.subprocess.run", side_effect=fake_run),
+            patch("sys.stdout", new=captured),
+            patch("sys.stderr", new=io.StringIO()),
+        ):
+            rc = run_cli(
+                ["o/r#1", "o/r#2", "o/r#3"], max_workers=3, stream=True, backend="view"
+            )
+        self.assertEqual(rc, 0)
+        lines = [json.loads(ln) for ln in captured.getvalue().splitlines()]
+        self.assertEqual(len(lines), 3)
+        by_index = {ln["index"]: ln for ln in lines}
+        self.assertEqual([by_index[i]["number"] for i in range(3)], [1, 2, 3])
+        self.assertEqual(by_index[1]["title"], "t2")
+
+    def test_warm_cache_skips_gh(self):
+        payload = {
+            "title": "t",
+            "state": "OPEN",
+            "mergeable": "MERGEABLE",
+            "mergeStateStatus": "CLEAN",
+            "url": "u",
+        }
+        mock_run = MagicMock(return_value=_mk_result(stdout=json.dumps(payload)))
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(Path(tmp) / "c.sqlite")
+            outputs = []
+            for _ in range(2):
+                captured = io.StringIO()
+                with (
+                    patch("chop_bulk.gh_pr_details.subprocess.run", mock_run),
+                    patch("sys.stdout", new=captured),
+                    patch("sys.stderr", new=io.StringIO()),
+                ):
+                    run_cli(["o/r#1", "o/r#2"], cache=cache, backend="view")
+                outputs.append(json.loads(captured.getvalue()))
+        self.assertEqual(mock_run.call_count, 2)  # first sweep only
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(cache.hits, 2)
+
+
+def _pr_node(number: int, state: str = "OPEN") -> dict:
+    return {
+        "pullRequest": {
+            "title": f"t{number}",
+            "state": state,
+            "mergeable": "MERGEABLE",
+            "mergeStateStatus": "CLEAN",
+            "url": f"https://github.com/o/r/pull/{number}",
+        }
+    }
+
+
+class TestGraphqlBatch(unittest.TestCase):
+    def test_query_aliases_every_pr(self):
+        q = build_batch_query([("o/r", 1), ("x/y", 22)])
+        self.assertIn('pr0: repository(owner: "o", name: "r")', q)
+        self.assertIn("pullRequest(number: 22)", q)
+        self.assertIn("mergeStateStatus", q)
+
+    def test_batch_maps_aliases_and_leaves_gaps_for_fallback(self):
+        # pr1 errored inside GraphQL (null node) — gh exits 1 but still
+        # prints the partial `data`.
+        body = {
+            "data": {"pr0": _pr_node(1), "pr1": None},
+            "errors": [{"message": "Could not resolve"}],
+        }
+        mock_run = MagicMock(
+            return_value=_mk_result(stdout=json.dumps(body), returncode=1)
+        )
+        payload = fetch_pr_batch(["o/r#1", "o/r#2", "bad-spec"], run=mock_run)
+        self.assertNotIn("error", payload)
+        out = payload["results"]
+        self.assertEqual(out[0]["title"], "t1")
+        self.assertEqual(out[0]["repo"], "o/r")
+        self.assertIsNone(out[1])
+        self.assertIn("invalid PR spec", out[2]["error"])
+        cmd = mock_run.call_args.args[0]
+        self.assertEqual(cmd[:3], ["gh", "api", "graphql"])
+
+    def test_unparseable_body_fails_whole_chunk(self):
+        mock_run = MagicMock(
+            return_value=_mk_result(stdout="", stderr="HTTP 502", returncode=1)
+        )
+        payload = fetch_pr_batch(["o/r#1", "o/r#2"], run=mock_run)
+        self.assertEqual(payload["error"], "gh api graphql exited 1: HTTP 502")
+        self.assertEqual(
+            payload["results"],
+            [
+                {"repo": "o/r", "number": 1, "error": payload["error"]},
+                {"repo": "o/r", "number": 2, "error": payload["error"]},
+            ],
+        )
+
+    def test_errors_only_body_surfaces_graphql_messages(self):
+        body = {"data": None, "errors": [{"message": "API rate limit exceeded"}]}
+        mock_run = MagicMock(return_value=_mk_result(stdout=json.dumps(body)))
+        payload = fetch_pr_batch(["o/r#1"], run=mock_run)
+        self.assertEqual(
+            payload["error"], "gh api graphql exited 0: API rate limit exceeded"
+        )
+
+    def test_failed_chunk_makes_no_per_pr_calls(self):
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd[:3])
+            return _mk_result(stderr="HTTP 429: API rate limit exceeded", returncode=1)
+
+        specs = [f"o/r#{n}" for n in range(1, 101)]
+        out = dict(iter_prs_batched(specs, run=fake_run, batch_size=50))
+        self.assertEqual(calls, [["gh", "api", "graphql"]] * 2)
+        self.assertEqual(sorted(out), list(range(100)))
+        self.assertTrue(all("rate limit" in r["error"] for r in out.values()))
+        self.assertEqual(out[7]["number"], 8)
+
+    def test_auto_workers_retry_a_throttled_chunk(self):
+        responses = [
+            _mk_result(stderr="HTTP 429: API rate limit exceeded", returncode=1),
+            _mk_result(stdout=json.dumps({"data": {"pr0": _pr_node(1)}})),
+        ]
+        mock_run = MagicMock(side_effect=responses)
+        limiter = AdaptiveLimiter(base_delay=0.001, rng=lambda: 0.0)
+        with (
+            patch.dict("chop_bulk.common._LIMITERS", {"github": limiter}),
+            patch("sys.stderr", new=io.StringIO()),
+        ):
+            out = dict(iter_prs_batched(["o/r#1"], run=mock_run, max_workers="auto"))
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(limiter.throttles, 1)
+        self.assertEqual(out[0]["title"], "t1")
+
+    def test_run_cli_batches_and_falls_back_per_pr(self):
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd[:3])
+            if cmd[:3] == ["gh", "api", "graphql"]:
+                body = {
+                    "data": {
+                        "pr0": _pr_node(1),
+                        "pr1": None,
+                        "pr2": _pr_node(3, "MERGED"),
+                    }
+                }
+                return _mk_result(stdout=json.dumps(body), returncode=1)
+            # Per-PR fallback for #2.
+            return _mk_result(stdout="", stderr="no pull request #2", returncode=1)
+
+        captured = io.StringIO()
+        stats = BatchStats()
+        with (
+            patch("chop_bulk.gh_pr_details.subprocess.run", side_effect=fake_run),
+            patch("sys.stdout", new=captured),
+            patch("sys.stderr", new=io.StringIO()),
+        ):
+            rc = run_cli(["o/r#1", "o/r#2", "o/r#3"], stats=stats)
+        self.assertEqual(rc, 0)
+        parsed = json.loads(captured.getvalue())
+        self.assertEqual([e["number"] for e in parsed], [1, 2, 3])
+        self.assertEqual(parsed[0]["title"], "t1")
+        self.assertEqual(parsed[1]["error"], "no pull request #2")
+        self.assertEqual(parsed[2]["state"], "MERGED")
+        self.assertEqual(calls, [["gh", "api", "graphql"], ["gh", "pr", "view"]])
+        # Telemetry units: the one GraphQL chunk, then the one fallback PR.
+        self.assertEqual(
+            [r["item"] for r in stats.records], ["o/r#1 (+2 more)", "o/r#2"]
+        )
+
+    def test_specs_split_into_chunks(self):
+        def fake_run(cmd, **kwargs):
+            n = cmd[-1].count("pullRequest(")
+            body = {"data": {f"pr{i}": _pr_node(i) for i in range(n)}}
+            return _mk_result(stdout=json.dumps(body))
+
+        mock_run = MagicMock(side_effect=fake_run)
+        specs = [f"o/r#{n}" for n in range(1, 121)]
+        out = dict(iter_prs_batched(specs, run=mock_run, batch_size=50))
+        self.assertEqual(mock_run.call_count, 3)  # 50 + 50 + 20
+        self.assertEqual(sorted(out), list(range(120)))
+
+    def test_unknown_backend_exits_2(self):
+        with (
+            patch("sys.stdout", new=io.StringIO()),
+            patch("sys.stderr", new=io.StringIO()),
+        ):
+            self.assertEqual(run_cli(["o/r#1"], backend="rest"), 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -8,15 +8,33 @@ prices: https://platform.claude.com/docs/en/about-claude/pricing
 
 import argparse
 import concurrent.futures
+import csv
+import ctypes
+import ctypes.util
 import json
+import os
 import re
+import select
 import socket
+import sqlite3
+import struct
 import subprocess
 import sys
+import time
+from array import array
 from collections import defaultdict
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
+# orjson, when installed, parses session lines several times faster than the
+# stdlib; everything works without it.
+try:
+    import orjson
+
+    _fast_loads = orjson.loads
+except ImportError:  # pragma: no cover - depends on the environment
+    _fast_loads = json.loads
+
 # Pricing per million tokens, at published list rates (current-gen models are
 # flat-priced across the full 1M context window — no >200k premium).
 # Cache rates derive from the input rate: 1h write = 2x, 5m write = 1.25x,
@@ -46,6 +64,27 @@ PRICING = {
 
 MAX_PLAN_MONTHLY = 200.00
 MAX_PR_TITLE_FETCH_WORKERS = 8
+# PR title cache: merged/closed PRs are kept forever (titles are frozen once
+# a PR lands), open ones are re-fetched after PR_TITLE_OPEN_TTL seconds.
+# Lookups that failed (deleted/private repo, typo'd reference) are cached as
+# misses for PR_TITLE_MISS_TTL so every report doesn't re-ask gh for them.
+# Misses go out as one GraphQL query per PR_TITLE_GRAPHQL_BATCH PRs.
+PR_TITLE_OPEN_TTL = 60 * 60
+PR_TITLE_MISS_TTL = PR_TITLE_OPEN_TTL
+PR_TITLE_GRAPHQL_BATCH = 50
+# Process-pool ingest: fewer jobs than this run in-process (pool start-up
+# dominates), and the direct scan cuts files into this many shards per worker
+# so one huge session file doesn't leave the other workers idle.
+PARALLEL_MIN_JOBS = 16
+SHARDS_PER_WORKER = 4
+# Windowed scans bisect files at least this big on their line timestamps to
+# seek past history older than the window. Lines are only roughly in time
+# order (resumed sessions, summaries), so the seek target is pulled back by
+# BISECT_MARGIN and the search stops once the span is BISECT_MIN_SPAN.
+BISECT_MIN_BYTES = 1 << 20
+BISECT_MIN_SPAN = 64 << 10
+BISECT_MARGIN = timedelta(days=1)
+BISECT_PROBE_LINES = 32
 
 # Match `gh pr create` anywhere in a command, including compound commands
 # like `cd ~/gits/foo && gh pr create ...` or `git push && gh pr create ...`.
@@ -53,6 +92,13 @@ MAX_PR_TITLE_FETCH_WORKERS = 8
 PR_CREATE_RE = re.compile(r"\bgh pr create\b")
 TITLE_RE = re.compile(r'--title\s+"([^"]+)"')
 URL_RE = re.compile(r'https?://github\.com/([^/\s]+)/([^/\s)\'"]+)/pull/(\d+)')
+# A line can only matter to the report if it carries usage, a `gh pr create`
+# command, or a GitHub PR URL; anything else is skipped before json.loads.
+# Plain substring tests: `bytes in bytes` is a fast C search, where a regex
+# alternation over multi-KB lines costs more than the decode it avoids.
+LINE_NEEDLES = (b'"usage"', b"gh pr create", b"github.com")
+# Cheap timestamp sniff for bisect probes — avoids a full json.loads per probe.
+TS_BYTES_RE = re.compile(rb'"timestamp"\s*:\s*"([^"]+)"')
 
 
 # ---------- Pure functions (importable, unit-testable) ----------
@@ -103,17 +149,222 @@ def humanize_project(proj):
     return p
 
 
-def empty_stats():
-    return dict(
-        models=defaultdict(lambda: dict(inp=0, out=0, c1h=0, c5m=0, cread=0, turns=0)),
-        first=None,
-        last=None,
-        prs_created=[],
-        prs_referenced=set(),
-        subagent_turns=0,
-        main_turns=0,
+# Per-model counters, in the order ModelTable lays them out in its array.
+TOKEN_FIELDS = ("inp", "out", "c1h", "c5m", "cread", "turns")
+_TOKEN_INDEX = {f: i for i, f in enumerate(TOKEN_FIELDS)}
+_NO_TOKENS = array("q", bytes(8 * len(TOKEN_FIELDS)))
+_PR_KEYS = {}
+
+
+def intern_pr(k):
+    """Canonical `(owner, repo, num)` tuple for `k`.
+
+    The same PR is referenced from many session-days; interning makes them
+    all share one tuple (and one copy of each owner/repo string).
+    """
+    got = _PR_KEYS.get(k)
+    if got is None:
+        got = _PR_KEYS[k] = (sys.intern(k[0]), sys.intern(k[1]), k[2])
+    return got
+
+
+class TokenCounts:
+    """One model's counters: a dict-like view into its ModelTable's array."""
+
+    __slots__ = ("_arr", "_base")
+
+    def __init__(self, arr, base):
+        self._arr = arr
+        self._base = base
+
+    def __getitem__(self, field):
+        return self._arr[self._base + _TOKEN_INDEX[field]]
+
+    def __setitem__(self, field, value):
+        self._arr[self._base + _TOKEN_INDEX[field]] = value
+
+    def keys(self):
+        return TOKEN_FIELDS
+
+    def __iter__(self):
+        return iter(TOKEN_FIELDS)
+
+    def items(self):
+        return zip(TOKEN_FIELDS, self._arr[self._base : self._base + len(TOKEN_FIELDS)])
+
+    def update(self, other):
+        for k, v in other.items():
+            self[k] = v
+
+    def __eq__(self, other):
+        if not hasattr(other, "items"):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"TokenCounts({dict(self.items())})"
+
+
+class ModelTable:
+    """model -> TokenCounts, defaultdict-style, backed by one `array('q')`.
+
+    A session-day touches one to three models, so a list scan beats a dict
+    and the six counters per model cost 48 bytes instead of a 6-key dict.
+    """
+
+    __slots__ = ("_names", "_arr")
+
+    def __init__(self):
+        self._names = []
+        self._arr = array("q")
+
+    def _slot(self, model):
+        try:
+            return self._names.index(model)
+        except ValueError:
+            self._names.append(sys.intern(model))
+            self._arr.extend(_NO_TOKENS)
+            return len(self._names) - 1
+
+    def __getitem__(self, model):
+        return TokenCounts(self._arr, self._slot(model) * len(TOKEN_FIELDS))
+
+    def __setitem__(self, model, counts):
+        base = self._slot(model) * len(TOKEN_FIELDS)
+        self._arr[base : base + len(TOKEN_FIELDS)] = _NO_TOKENS
+        TokenCounts(self._arr, base).update(counts)
+
+    def add(self, model, inp, out, c1h, c5m, cread, turns):
+        """Hot-path increment of all six counters at once."""
+        base = self._slot(model) * len(TOKEN_FIELDS)
+        arr = self._arr
+        arr[base] += inp
+        arr[base + 1] += out
+        arr[base + 2] += c1h
+        arr[base + 3] += c5m
+        arr[base + 4] += cread
+        arr[base + 5] += turns
+
+    def __contains__(self, model):
+        return model in self._names
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def keys(self):
+        return list(self._names)
+
+    def items(self):
+        n = len(TOKEN_FIELDS)
+        return [(m, TokenCounts(self._arr, i * n)) for i, m in enumerate(self._names)]
+
+    def values(self):
+        return [t for _, t in self.items()]
+
+    def __eq__(self, other):
+        if not hasattr(other, "items"):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ModelTable({ {m: dict(t.items()) for m, t in self.items()} })"
+
+
+class SessionDay:
+    """Accumulator for one (project, session, day) bucket.
+
+    Keeps the dict interface of the original `empty_stats()` dict
+    (`s["models"][m]["inp"] += n`, `s["prs_referenced"].add(k)`, ...) but
+    in `__slots__` with a ModelTable, and the PR containers are only
+    allocated when first written through `s[...]` — most session-days
+    never reference a PR. The `prs_created` / `prs_referenced` attributes
+    are read-only views that return an empty tuple / frozenset instead.
+    """
+
+    __slots__ = (
+        "models",
+        "first",
+        "last",
+        "subagent_turns",
+        "main_turns",
+        "_created",
+        "_referenced",
+    )
+    FIELDS = (
+        "models",
+        "first",
+        "last",
+        "prs_created",
+        "prs_referenced",
+        "subagent_turns",
+        "main_turns",
     )
 
+    def __init__(self):
+        self.models = ModelTable()
+        self.first = None
+        self.last = None
+        self.subagent_turns = 0
+        self.main_turns = 0
+        self._created = None
+        self._referenced = None
+
+    @property
+    def prs_created(self):
+        return self._created or ()
+
+    @property
+    def prs_referenced(self):
+        return self._referenced or frozenset()
+
+    def __getitem__(self, key):
+        if key == "prs_created":
+            if self._created is None:
+                self._created = []
+            return self._created
+        if key == "prs_referenced":
+            if self._referenced is None:
+                self._referenced = set()
+            return self._referenced
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key == "prs_created":
+            self._created = value
+        elif key == "prs_referenced":
+            self._referenced = value
+        elif key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            raise KeyError(key)
+
+    def keys(self):
+        return self.FIELDS
+
+    def __eq__(self, other):
+        if not isinstance(other, SessionDay):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"SessionDay({ {k: getattr(self, k) for k in self.FIELDS} })"
+
+
+def empty_stats():
+    """A fresh SessionDay accumulator (the `defaultdict` factory for buckets)."""
+    return SessionDay()
+
 
 def money(tok, price):
     return tok / 1_000_000 * price
@@ -165,6 +416,31 @@ def pct_or_na(num, denom):
     return f"{num / denom * 100:.0f}%"
 
 
+def fmt_change(cur, prev):
+    """Signed period-over-period change, e.g. '+12%', or 'n/a' from zero."""
+    if not prev:
+        return "n/a"
+    return f"{(cur - prev) / prev * 100:+.0f}%"
+
+
+def fmt_windows(rows):
+    """Markdown lines for the multi-window table (see window_summaries())."""
+    L = ["## Windows", ""]
+    L.append(
+        "| Window | Dates | Actual $ | Previous period $ | Change | Sessions "
+        "| Turns | No-cache ref $ |"
+    )
+    L.append("|---|---|---:|---:|---:|---:|---:|---:|")
+    for w in rows:
+        L.append(
+            f"| {w['days']}d | {w['start']} → {w['end']} | ${w['actual']:,.2f} "
+            f"| ${w['prev_actual']:,.2f} | {fmt_change(w['actual'], w['prev_actual'])} "
+            f"| {w['sessions']} | {w['turns']:,} | ${w['naive']:,.2f} |"
+        )
+    L.append("")
+    return L
+
+
 def fmt_pricing_summary(pricing=None):
     """Render the per-model $in/$out rate list from PRICING itself.
 
@@ -212,29 +488,148 @@ def fmt_unknown_detail(u):
 # ---------- Impure helpers ----------
 
 
-def ingest(f, is_sub, root, start_date, today, bucket, unknown_models):
+def loads_line(raw):
+    """Decode one JSONL line (bytes), via orjson when available.
+
+    Invalid UTF-8 falls back to the stdlib on a lossy decode, matching the
+    old text-mode `errors="ignore"` read.
+    """
+    try:
+        return _fast_loads(raw)
+    except ValueError:
+        return json.loads(raw.decode("utf-8", errors="ignore"))
+
+
+def modified_before(st, start_date):
+    """True if a file last written before `start_date` (local) can be skipped.
+
+    Lines are stamped when written, so no line in such a file can fall in
+    the window. mtime rather than ctime: ctime also moves on chmod / rename
+    / restore, which would defeat the skip without making it any safer.
+    """
+    return date.fromtimestamp(st.st_mtime) < start_date
+
+
+def _probe_timestamp(fh, limit):
+    """First parseable line timestamp at or after the current position.
+
+    Returns `(ts, line_start)` or `(None, None)` if none turns up within
+    BISECT_PROBE_LINES lines or before byte `limit`.
+    """
+    for _ in range(BISECT_PROBE_LINES):
+        line_start = fh.tell()
+        if line_start >= limit:
+            break
+        raw = fh.readline()
+        if not raw:
+            break
+        m = TS_BYTES_RE.search(raw)
+        ts = parse_ts(m.group(1).decode("ascii", errors="ignore")) if m else None
+        if ts:
+            return ts, line_start
+    return None, None
+
+
+def window_start_offset(f, start_date, size):
+    """Line-boundary offset a scan for `[start_date, ...]` may start from.
+
+    Bisects on sampled line timestamps: `lo` only ever moves to the start of
+    a line stamped more than BISECT_MARGIN before the window, so every byte
+    skipped belongs to history the window filter would discard anyway. A
+    probe that finds no timestamp shrinks the span from above, never
+    advancing `lo` on a guess.
+    """
+    cutoff = datetime.combine(start_date, datetime.min.time()).astimezone()
+    cutoff -= BISECT_MARGIN
+    lo, hi = 0, size
+    with f.open("rb") as fh:
+        while hi - lo > BISECT_MIN_SPAN:
+            mid = (lo + hi) // 2
+            fh.seek(mid)
+            fh.readline()  # realign to the next line boundary
+            ts, line_start = _probe_timestamp(fh, hi)
+            if ts is not None and ts < cutoff:
+                lo = line_start
+            else:
+                hi = mid
+    return lo
+
+
+def scan_start(f, start_date):
+    """Offset a windowed scan of `f` starts from, or None to skip the file."""
+    try:
+        st = f.stat()
+    except OSError:
+        return None
+    if modified_before(st, start_date):
+        return None
+    if st.st_size < BISECT_MIN_BYTES:
+        return 0
+    try:
+        return window_start_offset(f, start_date, st.st_size)
+    except OSError:
+        return 0
+
+
+def ingest(
+    f,
+    is_sub,
+    root,
+    start_date,
+    today,
+    bucket,
+    unknown_models,
+    offset=0,
+    pending=None,
+    unknown_by_day=None,
+):
     """Stream a JSONL session/subagent file into `bucket` and `unknown_models`.
 
     Streams line-by-line instead of loading the whole file into memory (session
     logs can exceed tens of MB when a long-running session gets unrolled).
+    Lines without usage, a `gh pr create` or a PR URL are dropped by a byte
+    substring test before decoding (LINE_NEEDLES) — most of a session log.
+
+    Reading starts at byte `offset` and the return value is the offset just
+    past the last line consumed, so a caller can resume once more bytes are
+    appended. A trailing line without a newline is only consumed if it parses
+    — otherwise it is a write in progress and is left for the next resume.
+    `pending` carries unmatched `gh pr create` tool_use ids across resumes.
+    `start_date`/`today` of None disable the window filter; `unknown_by_day`
+    (day -> mapping) replaces `unknown_models` when unknowns must stay
+    attributable to a day.
     """
     proj, puuid, _ = parent_key(f, root)
-    pending = {}
+    if pending is None:
+        pending = {}
     try:
-        fh = f.open("r", encoding="utf-8", errors="ignore")
+        fh = f.open("rb")
     except Exception:
-        return
+        return offset
     with fh:
-        for line in fh:
+        fh.seek(offset)
+        for raw in fh:
+            # Unterminated lines skip the prefilter: the needle may be in the
+            # part not yet written.
+            if raw.endswith(b"\n") and not any(n in raw for n in LINE_NEEDLES):
+                offset += len(raw)
+                continue
             try:
-                d = json.loads(line)
+                d = loads_line(raw)
             except Exception:
+                if raw.endswith(b"\n"):
+                    offset += len(raw)
+                continue
+            offset += len(raw)
+            if not isinstance(d, dict):
                 continue
             ts = parse_ts(d.get("timestamp"))
             if not ts:
                 continue
             day_local = ts.astimezone().date()
-            if day_local < start_date or day_local > today:
+            if start_date is not None and day_local < start_date:
+                continue
+            if today is not None and day_local > today:
                 continue
 
             key = (proj, puuid, day_local)
@@ -246,14 +641,16 @@ def ingest(f, is_sub, root, start_date, today, bucket, unknown_models):
             model = normalize_model(model_raw)
 
             if usage and model:
-                mstats = s["models"][model]
-                mstats["inp"] += usage.get("input_tokens", 0) or 0
-                mstats["out"] += usage.get("output_tokens", 0) or 0
-                mstats["cread"] += usage.get("cache_read_input_tokens", 0) or 0
                 cc = usage.get("cache_creation", {}) or {}
-                mstats["c1h"] += cc.get("ephemeral_1h_input_tokens", 0) or 0
-                mstats["c5m"] += cc.get("ephemeral_5m_input_tokens", 0) or 0
-                mstats["turns"] += 1
+                s["models"].add(
+                    model,
+                    usage.get("input_tokens", 0) or 0,
+                    usage.get("output_tokens", 0) or 0,
+                    cc.get("ephemeral_1h_input_tokens", 0) or 0,
+                    cc.get("ephemeral_5m_input_tokens", 0) or 0,
+                    usage.get("cache_read_input_tokens", 0) or 0,
+                    1,
+                )
                 if is_sub:
                     s["subagent_turns"] += 1
                 else:
@@ -269,7 +666,10 @@ def ingest(f, is_sub, root, start_date, today, bucket, unknown_models):
                 # PRICING is updated, these turns are the dominant spend and
                 # the dollar totals silently under-report. `<synthetic>` is
                 # Claude Code's placeholder for unbillable internal turns.
-                record_unknown(unknown_models, model_raw, usage)
+                if unknown_by_day is not None:
+                    record_unknown(unknown_by_day[day_local], model_raw, usage)
+                else:
+                    record_unknown(unknown_models, model_raw, usage)
 
             content = msg.get("content")
             if isinstance(content, list):
@@ -298,15 +698,548 @@ def ingest(f, is_sub, root, start_date, today, bucket, unknown_models):
                             m = URL_RE.search(out)
                             pkey = (proj, puuid, tu_day)
                             if m and pkey in bucket:
-                                k = (m.group(1), m.group(2), int(m.group(3)))
+                                k = intern_pr((m.group(1), m.group(2), int(m.group(3))))
                                 bucket[pkey]["prs_created"].append((k, tu_title))
                         for m in URL_RE.finditer(out):
-                            k = (m.group(1), m.group(2), int(m.group(3)))
+                            k = intern_pr((m.group(1), m.group(2), int(m.group(3))))
                             s["prs_referenced"].add(k)
                     elif btype == "text":
                         for m in URL_RE.finditer(block.get("text", "")):
-                            k = (m.group(1), m.group(2), int(m.group(3)))
+                            k = intern_pr((m.group(1), m.group(2), int(m.group(3))))
                             s["prs_referenced"].add(k)
+    return offset
+
+
+# ---------- Incremental ingest index ----------
+#
+# Session JSONLs are append-only, so a file's per-day buckets only ever grow
+# by what was appended since the last run. The index remembers, per file, the
+# inode, size and byte offset already consumed plus the per-day buckets that
+# came out of those bytes; a re-run parses only the new tail of each file.
+
+INDEX_SCHEMA_VERSION = 2
+
+# `files` / `days` are the per-file ingest checkpoint. `rollup` (one row per
+# session-day) and `rollup_models` (one row per session-day-model, token
+# components as columns) merge a session's main and subagent files into the
+# durable daily store reports are served from — plain columns, so they can
+# also be queried directly with sqlite3.
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    proj TEXT NOT NULL,
+    puuid TEXT NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    pending TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_by_session ON files (proj, puuid);
+CREATE TABLE IF NOT EXISTS days (
+    path TEXT NOT NULL,
+    day TEXT NOT NULL,
+    stats TEXT NOT NULL,
+    PRIMARY KEY (path, day)
+);
+CREATE TABLE IF NOT EXISTS rollup (
+    proj TEXT NOT NULL,
+    puuid TEXT NOT NULL,
+    day TEXT NOT NULL,
+    first TEXT,
+    last TEXT,
+    main_turns INTEGER NOT NULL,
+    subagent_turns INTEGER NOT NULL,
+    prs_created TEXT NOT NULL,
+    prs_referenced TEXT NOT NULL,
+    unknown TEXT NOT NULL,
+    PRIMARY KEY (proj, puuid, day)
+);
+CREATE INDEX IF NOT EXISTS rollup_by_day ON rollup (day);
+CREATE TABLE IF NOT EXISTS rollup_models (
+    proj TEXT NOT NULL,
+    puuid TEXT NOT NULL,
+    day TEXT NOT NULL,
+    model TEXT NOT NULL,
+    inp INTEGER NOT NULL,
+    out INTEGER NOT NULL,
+    c1h INTEGER NOT NULL,
+    c5m INTEGER NOT NULL,
+    cread INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    PRIMARY KEY (proj, puuid, day, model)
+);
+CREATE INDEX IF NOT EXISTS rollup_models_by_day ON rollup_models (day);
+"""
+INDEX_TABLES = ("files", "days", "rollup", "rollup_models")
+
+
+def default_index_path():
+    """`$XDG_CACHE_HOME/chop-cost-impact/index.sqlite` (XDG default `~/.cache`)."""
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "chop-cost-impact" / "index.sqlite"
+
+
+def index_signature():
+    """Everything besides file bytes that the stored buckets depend on.
+
+    Days are bucketed in local time and model ids are only priced if they
+    are in PRICING, so a TZ change or a new PRICING row invalidates the
+    whole index rather than serving stale day splits / unknown-model rows.
+    """
+    tz = [list(time.tzname), time.timezone, time.altzone]
+    return json.dumps([INDEX_SCHEMA_VERSION, tz, sorted(PRICING)])
+
+
+def merge_stats(dst, src):
+    """Fold session-day stats `src` into `dst` (both empty_stats() accumulators)."""
+    for model, t in src["models"].items():
+        dst["models"].add(model, *(v for _, v in t.items()))
+    first, last = src["first"], src["last"]
+    if first is not None and (dst["first"] is None or first < dst["first"]):
+        dst["first"] = first
+    if last is not None and (dst["last"] is None or last > dst["last"]):
+        dst["last"] = last
+    if src.prs_created:
+        dst["prs_created"].extend(src.prs_created)
+    if src.prs_referenced:
+        dst["prs_referenced"].update(src.prs_referenced)
+    dst["subagent_turns"] += src["subagent_turns"]
+    dst["main_turns"] += src["main_turns"]
+
+
+def merge_unknown(dst, src):
+    """Fold an unknown-model mapping (model -> empty_unknown()) into `dst`."""
+    for model, u in src.items():
+        d = dst.setdefault(model, empty_unknown())
+        for k, v in u.items():
+            d[k] += v
+
+
+def stats_to_json(s, unknown):
+    def iso(ts):
+        return ts.isoformat() if ts else None
+
+    return json.dumps(
+        dict(
+            models={m: dict(t) for m, t in s["models"].items()},
+            first=iso(s["first"]),
+            last=iso(s["last"]),
+            prs_created=[[*k, title] for k, title in s.prs_created],
+            prs_referenced=sorted(s.prs_referenced),
+            subagent_turns=s["subagent_turns"],
+            main_turns=s["main_turns"],
+            unknown=unknown,
+        )
+    )
+
+
+def stats_from_json(blob):
+    """Inverse of stats_to_json(): returns (stats, unknown_models)."""
+    d = json.loads(blob)
+    s = empty_stats()
+    for m, t in d["models"].items():
+        s["models"][m].update(t)
+    s["first"] = parse_ts(d["first"])
+    s["last"] = parse_ts(d["last"])
+    if d["prs_created"]:
+        s["prs_created"] = [
+            (intern_pr((o, r, n)), title) for o, r, n, title in d["prs_created"]
+        ]
+    if d["prs_referenced"]:
+        s["prs_referenced"] = {intern_pr((o, r, n)) for o, r, n in d["prs_referenced"]}
+    s["subagent_turns"] = d["subagent_turns"]
+    s["main_turns"] = d["main_turns"]
+    return s, d["unknown"]
+
+
+def open_index(path):
+    """Open (creating if needed) the ingest index; wipe it on signature mismatch.
+
+    A mismatch drops the tables rather than emptying them, so a schema
+    version bump recreates them with the new layout.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+    )
+    sig = index_signature()
+    row = conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+    if row is None or row[0] != sig:
+        with conn:
+            for table in INDEX_TABLES:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('signature', ?)",
+                (sig,),
+            )
+    conn.executescript(INDEX_SCHEMA)
+    return conn
+
+
+def index_plan(conn, f, start_date=None):
+    """Return `(stat, offset, pending_json, day_rows)` to resume `f` from.
+
+    None means the stored rows are current (same inode and size), or that
+    `f` is not indexed yet and was last written before `start_date` — it
+    can't contribute to this window, and a later, wider window will find it
+    unindexed and parse it then. A file whose inode changed (rotated /
+    replaced) or that shrank below the stored offset (truncated /
+    rewritten) resumes from byte 0 with no rows.
+    """
+    try:
+        st = f.stat()
+    except OSError:
+        return None
+    path = str(f)
+    row = conn.execute(
+        "SELECT inode, size, offset, pending FROM files WHERE path = ?", (path,)
+    ).fetchone()
+    if row is not None and row[0] == st.st_ino and row[1] == st.st_size:
+        return None
+    if row is None and start_date is not None and modified_before(st, start_date):
+        return None
+    if row is None or row[0] != st.st_ino or st.st_size < row[2]:
+        return st, 0, "{}", []
+    day_rows = conn.execute(
+        "SELECT day, stats FROM days WHERE path = ?", (path,)
+    ).fetchall()
+    return st, row[2], row[3], day_rows
+
+
+def parse_tail(f, is_sub, root, offset, pending_json, day_rows):
+    """Parse `f` from `offset` on top of its stored day rows.
+
+    Returns `(offset, pending_json, day_rows)` ready for index_store(). Takes
+    and returns only plain strings / tuples so it can run in a worker
+    process.
+    """
+    bucket = defaultdict(empty_stats)
+    unknown_by_day = defaultdict(dict)
+    pending = {
+        tid: (date.fromisoformat(day), title)
+        for tid, (day, title) in json.loads(pending_json).items()
+    }
+    proj, puuid, _ = parent_key(f, root)
+    for day, blob in day_rows:
+        day = date.fromisoformat(day)
+        bucket[(proj, puuid, day)], unknown_by_day[day] = stats_from_json(blob)
+
+    offset = ingest(
+        f,
+        is_sub,
+        root,
+        None,
+        None,
+        bucket,
+        None,
+        offset=offset,
+        pending=pending,
+        unknown_by_day=unknown_by_day,
+    )
+
+    pending_json = json.dumps(
+        {tid: [day.isoformat(), title] for tid, (day, title) in pending.items()}
+    )
+    day_rows = [
+        (day.isoformat(), stats_to_json(s, unknown_by_day.get(day, {})))
+        for (_, _, day), s in bucket.items()
+    ]
+    return offset, pending_json, day_rows
+
+
+def index_store(conn, f, root, st, offset, pending_json, day_rows):
+    """Replace `f`'s rows with a parse_tail() result, atomically.
+
+    Returns the `(proj, puuid)` session whose rollup is now stale.
+    """
+    path = str(f)
+    proj, puuid, _ = parent_key(f, root)
+    with conn:
+        conn.execute("DELETE FROM days WHERE path = ?", (path,))
+        conn.executemany(
+            "INSERT INTO days (path, day, stats) VALUES (?, ?, ?)",
+            [(path, day, blob) for day, blob in day_rows],
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO files "
+            "(path, proj, puuid, inode, size, offset, pending) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, proj, puuid, st.st_ino, st.st_size, offset, pending_json),
+        )
+    return proj, puuid
+
+
+def rollup_refresh(conn, sessions):
+    """Recompute the rollup rows of each `(proj, puuid)` in `sessions`.
+
+    Merges the session's file-level day rows in path order, so a main
+    session's contribution to a session-day lands before its subagents' —
+    the same order a direct scan of the sorted main files followed by the
+    sorted subagent files produces.
+    """
+    for proj, puuid in sorted(sessions):
+        bucket = defaultdict(empty_stats)
+        unknown_by_day = defaultdict(dict)
+        rows = conn.execute(
+            "SELECT d.day, d.stats FROM days d JOIN files f ON d.path = f.path "
+            "WHERE f.proj = ? AND f.puuid = ? ORDER BY d.path, d.day",
+            (proj, puuid),
+        )
+        for day, blob in rows:
+            s, unknown = stats_from_json(blob)
+            merge_stats(bucket[day], s)
+            merge_unknown(unknown_by_day[day], unknown)
+        with conn:
+            for table in ("rollup", "rollup_models"):
+                conn.execute(
+                    f"DELETE FROM {table} WHERE proj = ? AND puuid = ?", (proj, puuid)
+                )
+            conn.executemany(
+                "INSERT INTO rollup (proj, puuid, day, first, last, main_turns, "
+                "subagent_turns, prs_created, prs_referenced, unknown) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        proj,
+                        puuid,
+                        day,
+                        s["first"].isoformat() if s["first"] else None,
+                        s["last"].isoformat() if s["last"] else None,
+                        s["main_turns"],
+                        s["subagent_turns"],
+                        json.dumps([[*k, title] for k, title in s.prs_created]),
+                        json.dumps(sorted(s.prs_referenced)),
+                        json.dumps(unknown_by_day[day]),
+                    )
+                    for day, s in bucket.items()
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO rollup_models (proj, puuid, day, model, inp, out, c1h, "
+                "c5m, cread, turns) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (proj, puuid, day, model, t["inp"], t["out"], t["c1h"], t["c5m"])
+                    + (t["cread"], t["turns"])
+                    for day, s in bucket.items()
+                    for model, t in s["models"].items()
+                ],
+            )
+
+
+def index_refresh(conn, f, is_sub, root):
+    """Bring one file's index rows up to date, parsing only appended bytes."""
+    plan = index_plan(conn, f)
+    if plan is None:
+        return
+    st, *state = plan
+    session = index_store(conn, f, root, st, *parse_tail(f, is_sub, root, *state))
+    rollup_refresh(conn, {session})
+
+
+def index_prune(conn, files):
+    """Drop rows for files that no longer exist under the projects root."""
+    live = {str(f) for f in files}
+    gone = [
+        (p, proj, puuid)
+        for p, proj, puuid in conn.execute("SELECT path, proj, puuid FROM files")
+        if p not in live
+    ]
+    if gone:
+        with conn:
+            conn.executemany("DELETE FROM days WHERE path = ?", [g[:1] for g in gone])
+            conn.executemany("DELETE FROM files WHERE path = ?", [g[:1] for g in gone])
+        rollup_refresh(conn, {g[1:] for g in gone})
+
+
+def index_load(conn, start_date, today, bucket, unknown_by_day):
+    """Fill `bucket` / `unknown_by_day` from the rollup rows in the window."""
+    span = (start_date.isoformat(), today.isoformat())
+    rows = conn.execute(
+        "SELECT proj, puuid, day, first, last, main_turns, subagent_turns, "
+        "prs_created, prs_referenced, unknown FROM rollup "
+        "WHERE day BETWEEN ? AND ?",
+        span,
+    )
+    for proj, puuid, day, first, last, main, sub, created, referenced, unk in rows:
+        day = date.fromisoformat(day)
+        s = bucket[(proj, puuid, day)]
+        s["first"], s["last"] = parse_ts(first), parse_ts(last)
+        s["main_turns"], s["subagent_turns"] = main, sub
+        created, referenced = json.loads(created), json.loads(referenced)
+        if created:
+            s["prs_created"] = [(intern_pr((o, r, n)), t) for o, r, n, t in created]
+        if referenced:
+            s["prs_referenced"] = {intern_pr((o, r, n)) for o, r, n in referenced}
+        unknown = json.loads(unk)
+        if unknown:
+            merge_unknown(unknown_by_day[day], unknown)
+    rows = conn.execute(
+        "SELECT proj, puuid, day, model, inp, out, c1h, c5m, cread, turns "
+        "FROM rollup_models WHERE day BETWEEN ? AND ?",
+        span,
+    )
+    for proj, puuid, day, model, inp, out, c1h, c5m, cread, turns in rows:
+        s = bucket[(proj, puuid, date.fromisoformat(day))]
+        s["models"][model] = dict(
+            inp=inp, out=out, c1h=c1h, c5m=c5m, cread=cread, turns=turns
+        )
+
+
+def plain_bucket(bucket):
+    """`bucket` as a plain dict for returning across the process boundary."""
+    return dict(bucket)
+
+
+def ingest_shard(files, root, start_date, today):
+    """Ingest a shard of `(path, is_subagent)` pairs into a fresh bucket.
+
+    Worker-process entry point for the parallel direct scan; returns
+    `(plain_bucket, unknown_by_day)` for the parent to merge. Files last
+    written before the window are skipped unopened and big files start
+    from their bisected window offset (see scan_start()).
+    """
+    bucket = defaultdict(empty_stats)
+    unknown_by_day = defaultdict(dict)
+    for f, is_sub in files:
+        offset = scan_start(f, start_date)
+        if offset is None:
+            continue
+        ingest(
+            f,
+            is_sub,
+            root,
+            start_date,
+            today,
+            bucket,
+            None,
+            offset,
+            unknown_by_day=unknown_by_day,
+        )
+    return plain_bucket(bucket), dict(unknown_by_day)
+
+
+def run_jobs(fn, jobs, workers):
+    """`[fn(*job) for job in jobs]`, spread over a process pool when it pays.
+
+    Results come back in job order either way. Below PARALLEL_MIN_JOBS the
+    pool's start-up cost outweighs the parse time it saves, so small jobs
+    lists (e.g. an incremental run with a handful of appended files) stay
+    in-process.
+    """
+    if workers <= 1 or len(jobs) < PARALLEL_MIN_JOBS:
+        return [fn(*job) for job in jobs]
+    workers = min(workers, len(jobs))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fn, *job) for job in jobs]
+        return [fut.result() for fut in futures]
+
+
+def shard(items, n):
+    """Split `items` into at most `n` contiguous, order-preserving chunks."""
+    size = max(1, -(-len(items) // max(1, n)))
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def ingest_all(
+    files, root, start_date, today, bucket, unknown_by_day, index_path=None, workers=1
+):
+    """Ingest `(path, is_subagent)` pairs, through the index when one is given.
+
+    Fills `bucket` with session-days in `[start_date, today]` and
+    `unknown_by_day` (day -> unknown-model mapping) so callers can slice
+    any sub-window out of the result (see window_slice()). With an index
+    the data is served from its rollup tables.
+
+    With `workers > 1` the parsing fans out over a process pool: per changed
+    file when indexing, per contiguous shard of files otherwise. The parent
+    merges results in file order, so PR lists come out exactly as a
+    sequential scan orders them.
+
+    An index that cannot be opened or written (read-only cache dir, locked
+    or corrupt database) degrades to a full direct scan with a warning —
+    the index is an accelerator, never a reason for the report to fail.
+    """
+    if index_path is not None:
+        try:
+            conn = open_index(index_path)
+            try:
+                plans = [
+                    (f, is_sub, index_plan(conn, f, start_date)) for f, is_sub in files
+                ]
+                plans = [(f, is_sub, plan) for f, is_sub, plan in plans if plan]
+                jobs = [(f, is_sub, root, *plan[1:]) for f, is_sub, plan in plans]
+                results = run_jobs(parse_tail, jobs, workers)
+                stale = {
+                    index_store(conn, f, root, plan[0], *result)
+                    for (f, _, plan), result in zip(plans, results)
+                }
+                rollup_refresh(conn, stale)
+                index_prune(conn, [f for f, _ in files])
+                index_load(conn, start_date, today, bucket, unknown_by_day)
+            finally:
+                conn.close()
+            return
+        except (OSError, sqlite3.Error) as exc:
+            print(
+                f"warning: ingest index {index_path} unusable ({exc}); "
+                f"falling back to a full scan",
+                file=sys.stderr,
+            )
+            bucket.clear()
+            unknown_by_day.clear()
+    jobs = [
+        (chunk, root, start_date, today)
+        for chunk in shard(files, workers * SHARDS_PER_WORKER)
+    ]
+    for shard_bucket, shard_unknown in run_jobs(ingest_shard, jobs, workers):
+        for key, s in shard_bucket.items():
+            merge_stats(bucket[key], s)
+        for day, unknown in shard_unknown.items():
+            merge_unknown(unknown_by_day[day], unknown)
+
+
+def window_slice(bucket, unknown_by_day, start_date, end_date):
+    """`(bucket, unknown_models)` restricted to `[start_date, end_date]`."""
+    sliced = defaultdict(empty_stats)
+    for key, s in bucket.items():
+        if start_date <= key[2] <= end_date:
+            sliced[key] = s
+    unknown_models = {}
+    for day, unknown in sorted(unknown_by_day.items()):
+        if start_date <= day <= end_date:
+            merge_unknown(unknown_models, unknown)
+    return sliced, unknown_models
+
+
+def window_summaries(bucket, unknown_by_day, today, windows):
+    """Headline numbers for each N-day window ending `today`.
+
+    Each row also carries the totals of the N days before it (`prev_*`) so
+    the report can show period-over-period change — `7` is week-over-week.
+    `bucket` must cover `2 * max(windows)` days for those to be complete.
+    """
+    rows = []
+    for n in windows:
+        start = today - timedelta(days=n - 1)
+        prev_start = start - timedelta(days=n)
+        cur = aggregate(window_slice(bucket, unknown_by_day, start, today)[0])
+        prev_end = start - timedelta(days=1)
+        prev = aggregate(window_slice(bucket, unknown_by_day, prev_start, prev_end)[0])
+        rows.append(
+            dict(
+                days=n,
+                start=start,
+                end=today,
+                actual=cur["tot_actual"],
+                naive=cur["tot_naive"],
+                sessions=len(cur["entries"]),
+                turns=cur["tot_main_turns"] + cur["tot_sub_turns"],
+                prev_actual=prev["tot_actual"],
+            )
+        )
+    return rows
 
 
 def _fetch_one_pr_title(pr_key):
@@ -344,6 +1277,198 @@ def fetch_pr_titles(all_prs):
         return dict(pool.map(_fetch_one_pr_title, prs))
 
 
+def pr_titles_query(prs):
+    """One GraphQL query resolving every `(owner, repo, num)` in `prs`.
+
+    Aliases are positional (`r<i>` per repo, `p<num>` per PR) so the response
+    maps back without echoing inputs; names go in as JSON string literals,
+    which GraphQL accepts verbatim.
+    """
+    by_repo = defaultdict(list)
+    for owner, repo, num in prs:
+        by_repo[(owner, repo)].append(num)
+    parts = []
+    for i, ((owner, repo), nums) in enumerate(sorted(by_repo.items())):
+        fields = " ".join(
+            f"p{n}: pullRequest(number: {n}) {{ title state }}" for n in sorted(nums)
+        )
+        parts.append(
+            f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)})"
+            f" {{ {fields} }}"
+        )
+    return "query { " + " ".join(parts) + " }", sorted(by_repo)
+
+
+def _fetch_pr_titles_batch(prs):
+    query, repos = pr_titles_query(prs)
+    try:
+        r = subprocess.run(
+            ["gh", "api", "graphql", "-f", f"query={query}"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        # gh exits non-zero when *any* alias errored (e.g. one deleted PR),
+        # but still prints the data for the rest — so read stdout regardless.
+        data = json.loads(r.stdout).get("data")
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    got = {}
+    for i, (owner, repo) in enumerate(repos):
+        if f"r{i}" not in data:
+            continue
+        # A null repository (deleted, renamed, no access) or a null PR alias
+        # is GitHub answering "no such PR" — unlike a failed call.
+        nodes = data[f"r{i}"] or {}
+        for num in (n for o, rp, n in prs if (o, rp) == (owner, repo)):
+            node = nodes.get(f"p{num}")
+            if node:
+                got[(owner, repo, num)] = (node.get("title", ""), node.get("state", ""))
+            elif data[f"r{i}"] is None or f"p{num}" in nodes:
+                got[(owner, repo, num)] = (None, None)
+    return got
+
+
+def fetch_pr_titles_graphql(prs):
+    """Batched GraphQL lookup.
+
+    PRs GitHub answered as unresolvable map to `(None, None)`; PRs with no
+    answer at all (the call failed, no `data`) are absent.
+    """
+    prs = sorted(prs)
+    batches = [
+        prs[i : i + PR_TITLE_GRAPHQL_BATCH]
+        for i in range(0, len(prs), PR_TITLE_GRAPHQL_BATCH)
+    ]
+    if not batches:
+        return {}
+    max_workers = min(MAX_PR_TITLE_FETCH_WORKERS, len(batches))
+    got = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for part in pool.map(_fetch_pr_titles_batch, batches):
+            got.update(part)
+    return got
+
+
+def default_pr_cache_path():
+    """`$XDG_CACHE_HOME/chop-cost-impact/pr-titles.sqlite` (XDG default `~/.cache`)."""
+    return default_index_path().with_name("pr-titles.sqlite")
+
+
+def open_pr_cache(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS pr_titles ("
+        "owner TEXT NOT NULL, repo TEXT NOT NULL, num INTEGER NOT NULL, "
+        "title TEXT NOT NULL, state TEXT NOT NULL, fetched_at REAL NOT NULL, "
+        "PRIMARY KEY (owner, repo, num))"
+    )
+    return conn
+
+
+def pr_cache_get(conn, prs, now, ttl=None, miss_ttl=None):
+    """Cached `(title, state)` for `prs` that are still fresh at `now`.
+
+    A cached unresolvable PR (stored with an empty state) comes back as
+    `(None, None)` while younger than `miss_ttl`.
+    """
+    if ttl is None:
+        ttl = PR_TITLE_OPEN_TTL
+    if miss_ttl is None:
+        miss_ttl = PR_TITLE_MISS_TTL
+    hits = {}
+    for key in prs:
+        row = conn.execute(
+            "SELECT title, state, fetched_at FROM pr_titles "
+            "WHERE owner = ? AND repo = ? AND num = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            continue
+        title, state, fetched_at = row
+        if not state:
+            if now - fetched_at < miss_ttl:
+                hits[key] = (None, None)
+        elif state in ("MERGED", "CLOSED") or now - fetched_at < ttl:
+            hits[key] = (title, state)
+    return hits
+
+
+def pr_cache_put(conn, titles, now, unresolvable=()):
+    """Store successful lookups, plus miss rows for `unresolvable` PRs.
+
+    `(None, None)` entries in `titles` are never stored: a failed `gh`
+    call says nothing about the PR. Only PRs GitHub itself reported as
+    unresolvable become miss rows (empty title and state — GitHub PRs
+    always have a state, so the NOT NULL schema stays as it was), and a
+    miss never replaces a row that holds a real title.
+    """
+    rows = [
+        (*key, title, state, now)
+        for key, (title, state) in titles.items()
+        if title is not None
+    ]
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO pr_titles "
+            "(owner, repo, num, title, state, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.executemany(
+            "INSERT INTO pr_titles (owner, repo, num, title, state, fetched_at) "
+            "VALUES (?, ?, ?, '', '', ?) "
+            "ON CONFLICT (owner, repo, num) DO UPDATE SET fetched_at = excluded.fetched_at "
+            "WHERE pr_titles.state = ''",
+            [(*key, now) for key in unresolvable],
+        )
+
+
+def resolve_pr_titles(all_prs, cache_path=None, now=None):
+    """`fetch_pr_titles()` with a persistent cache and batched GraphQL misses.
+
+    Cache hits cost no network at all; misses go out as batched GraphQL
+    queries, and whatever GraphQL couldn't answer (auth scope, outage)
+    falls back to the per-PR `gh pr view` fan-out. PRs GraphQL reported
+    as unresolvable and `gh pr view` couldn't fetch either are cached as
+    misses for PR_TITLE_MISS_TTL. When a lookup fails outright, an expired
+    cached title is served instead of nothing. A cache that can't be
+    opened just means every PR is a miss.
+    """
+    prs = sorted(all_prs)
+    if now is None:
+        now = time.time()
+    conn = None
+    hits = {}
+    if cache_path is not None and prs:
+        try:
+            conn = open_pr_cache(cache_path)
+            hits = pr_cache_get(conn, prs, now)
+        except (OSError, sqlite3.Error) as exc:
+            print(f"warning: PR title cache unusable ({exc})", file=sys.stderr)
+            conn = None
+    misses = [k for k in prs if k not in hits]
+    fetched = fetch_pr_titles_graphql(misses)
+    not_found = {k for k, (title, _) in fetched.items() if title is None}
+    fetched.update(
+        fetch_pr_titles([k for k in misses if k not in fetched or k in not_found])
+    )
+    unresolvable = sorted(k for k in not_found if fetched[k][0] is None)
+    if conn is not None:
+        try:
+            pr_cache_put(conn, fetched, now, unresolvable)
+            # Stale beats nothing; miss rows are excluded by miss_ttl=0.
+            failed = [k for k, (title, _) in fetched.items() if title is None]
+            fetched.update(pr_cache_get(conn, failed, now, float("inf"), miss_ttl=0))
+        except sqlite3.Error as exc:
+            print(f"warning: PR title cache not updated ({exc})", file=sys.stderr)
+        finally:
+            conn.close()
+    return {**hits, **fetched}
+
+
 # ---------- Report builder ----------
 
 
@@ -353,6 +1478,8 @@ def build_report(entries, bucket_meta, days_back, start_date, today, titles):
     `bucket_meta` carries precomputed totals so we don't recompute twice:
       tot_actual, tot_naive, tot_comps, tot_by_model, tot_dur_min,
       tot_main_turns, tot_sub_turns, per_day, by_repo, repo_totals, unknown_models
+    and optionally `windows` (window_summaries() rows) for the multi-window
+    table.
     """
     hostname = socket.gethostname()
     L = []
@@ -375,6 +1502,7 @@ def build_report(entries, bucket_meta, days_back, start_date, today, titles):
     per_day = bucket_meta["per_day"]
     repo_totals = bucket_meta["repo_totals"]
     unknown_models = bucket_meta["unknown_models"]
+    windows = bucket_meta.get("windows")
 
     if not entries:
         L.append("## Summary")
@@ -394,6 +1522,9 @@ def build_report(entries, bucket_meta, days_back, start_date, today, titles):
                     for k, u in sorted(unknown_models.items())
                 )
             )
+        if windows:
+            L.append("")
+            L.extend(fmt_windows(windows))
         return "\n".join(L)
 
     L.append("## Summary")
@@ -426,6 +1557,9 @@ def build_report(entries, bucket_meta, days_back, start_date, today, titles):
         L.append(f"| {m} | ${v:,.2f} | {pct_or_na(v, tot_actual)} |")
     L.append("")
 
+    if windows:
+        L.extend(fmt_windows(windows))
+
     L.append("## Per day")
     L.append("")
     L.append("| Day | Actual $ | Sessions | Main turns | Sub turns | No-cache ref $ |")
@@ -590,9 +1724,12 @@ def build_report(entries, bucket_meta, days_back, start_date, today, titles):
     return "\n".join(L)
 
 
-def aggregate(bucket):
-    """Collapse the session-day bucket into entries + rolled-up totals."""
-    entries = []
+def iter_entries(bucket):
+    """Yield one entry per billable session-day, in bucket order.
+
+    Entries are built lazily so exporters can stream them without holding
+    the whole list; aggregate() materialises it for the markdown report.
+    """
     for key, s in bucket.items():
         total, comps, by_model, naive = cost_breakdown(s)
         if total == 0:
@@ -600,7 +1737,7 @@ def aggregate(bucket):
         dur_min = 0
         if s["first"] and s["last"]:
             dur_min = (s["last"] - s["first"]).total_seconds() / 60
-        entries.append(
+        yield (
             dict(
                 key=key,
                 proj=key[0],
@@ -613,14 +1750,19 @@ def aggregate(bucket):
                 dur=dur_min,
                 main_turns=s["main_turns"],
                 sub_turns=s["subagent_turns"],
-                prs_created=s["prs_created"],
-                prs_referenced=s["prs_referenced"],
+                prs_created=s.prs_created,
+                prs_referenced=s.prs_referenced,
                 # Keep raw per-model token counts for downstream footnotes
                 # (TTL-bug c5m measurement).
                 raw_models={m: dict(t) for m, t in s["models"].items()},
             )
         )
 
+
+def aggregate(bucket):
+    """Collapse the session-day bucket into entries + rolled-up totals."""
+    entries = list(iter_entries(bucket))
+
     tot_actual = sum(e["total"] for e in entries)
     tot_naive = sum(e["naive"] for e in entries)
     tot_comps = dict(inp=0, out=0, c1h=0, c5m=0, cread=0)
@@ -689,6 +1831,401 @@ def aggregate(bucket):
     )
 
 
+# ---------- Machine-readable export ----------
+
+EXPORT_FORMATS = ("md", "json", "ndjson", "csv")
+EXPORT_FIELDS = (
+    "day",
+    "repo",
+    "project",
+    "session",
+    "duration_min",
+    "main_turns",
+    "sub_turns",
+    "actual",
+    "no_cache_ref",
+    "input",
+    "output",
+    "cache_write_1h",
+    "cache_write_5m",
+    "cache_read",
+    "by_model",
+    "prs_created",
+    "prs_referenced",
+)
+
+
+def pr_url(k):
+    return f"https://github.com/{k[0]}/{k[1]}/pull/{k[2]}"
+
+
+def export_record(e):
+    """Flatten an entry into JSON-safe fields (dollars, not tokens)."""
+    c = e["comps"]
+    return dict(
+        day=e["day"].isoformat(),
+        repo=humanize_project(e["proj"]),
+        project=e["proj"],
+        session=e["puuid"],
+        duration_min=round(e["dur"], 1),
+        main_turns=e["main_turns"],
+        sub_turns=e["sub_turns"],
+        actual=round(e["total"], 6),
+        no_cache_ref=round(e["naive"], 6),
+        input=round(c["inp"], 6),
+        output=round(c["out"], 6),
+        cache_write_1h=round(c["c1h"], 6),
+        cache_write_5m=round(c["c5m"], 6),
+        cache_read=round(c["cread"], 6),
+        by_model={m: round(v, 6) for m, v in sorted(e["by_model"].items())},
+        prs_created=[pr_url(k) for k, _ in e["prs_created"]],
+        prs_referenced=[pr_url(k) for k in sorted(e["prs_referenced"])],
+    )
+
+
+def _csv_row(rec):
+    """CSV can't nest: by_model becomes `model=$;...`, PR lists space-joined."""
+    row = dict(rec)
+    row["by_model"] = ";".join(f"{m}={v}" for m, v in rec["by_model"].items())
+    row["prs_created"] = " ".join(rec["prs_created"])
+    row["prs_referenced"] = " ".join(rec["prs_referenced"])
+    return row
+
+
+def write_export(fmt, entries, out, meta):
+    """Stream `entries` to the text stream `out` as json / ndjson / csv.
+
+    Rows are written as the iterator yields them, so nothing beyond the
+    current entry is held in memory. json is a single object whose
+    `entries` array is emitted element by element; `meta` (window,
+    generated-at, host) goes in its header. Returns the row count.
+    """
+    n = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        for e in entries:
+            writer.writerow(_csv_row(export_record(e)))
+            n += 1
+    elif fmt == "ndjson":
+        for e in entries:
+            out.write(json.dumps(export_record(e)) + "\n")
+            n += 1
+    elif fmt == "json":
+        out.write(json.dumps(meta)[:-1] + ', "entries": [')
+        for e in entries:
+            out.write(("\n  " if n == 0 else ",\n  ") + json.dumps(export_record(e)))
+            n += 1
+        out.write("\n]}\n" if n else "]}\n")
+    else:
+        raise ValueError(f"unknown export format {fmt!r}")
+    return n
+
+
+# ---------- Live follow mode ----------
+#
+# `--follow` keeps the window's bucket in memory and feeds it only the bytes
+# appended to session files since the last look, printing running spend per
+# repo/model every interval. On Linux, inotify says which files changed; on
+# other platforms (or when watches run out) every tick re-stats the tree.
+
+FOLLOW_DEFAULT_INTERVAL = 30
+FOLLOW_TOP_ROWS = 10
+
+
+class Inotify:
+    """Minimal ctypes binding of inotify(7) for directory watches.
+
+    Raises OSError from the constructor when inotify is unavailable (not
+    Linux, no libc symbol) and from add_watch() when the per-user watch
+    limit is hit; callers fall back to polling in both cases.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_Q_OVERFLOW = 0x00004000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            init1 = libc.inotify_init1
+        except (OSError, AttributeError, TypeError) as exc:
+            raise OSError(f"inotify unavailable: {exc}") from exc
+        fd = init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._libc = libc
+        self.fd = fd
+        self.dirs = {}
+
+    def add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_add_watch({path}): {os.strerror(err)}")
+        self.dirs[wd] = Path(path)
+
+    def read(self, timeout):
+        """`[(path, mask), ...]` for events within `timeout` seconds.
+
+        A queue overflow comes back as `(None, IN_Q_OVERFLOW)`: events were
+        lost and the caller must rescan.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        i = 0
+        while i + self._EVENT.size <= len(buf):
+            wd, mask, _cookie, length = self._EVENT.unpack_from(buf, i)
+            name = buf[i + self._EVENT.size : i + self._EVENT.size + length]
+            i += self._EVENT.size + length
+            if mask & self.IN_Q_OVERFLOW:
+                events.append((None, mask))
+                continue
+            d = self.dirs.get(wd)
+            name = os.fsdecode(name.rstrip(b"\0"))
+            if d is not None:
+                events.append((d / name if name else d, mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def session_file_kind(f, root):
+    """False for a main session file, True for a subagent file, else None.
+
+    Mirrors main()'s globs: `<proj>/<uuid>.jsonl` and
+    `<proj>/<uuid>/subagents/agent-*.jsonl`.
+    """
+    try:
+        parts = f.relative_to(root).parts
+    except ValueError:
+        return None
+    if not parts[-1].endswith(".jsonl"):
+        return None
+    if len(parts) == 2:
+        return False
+    if len(parts) == 4 and parts[2] == "subagents" and parts[3].startswith("agent-"):
+        return True
+    return None
+
+
+def _watchable_dir(d, root):
+    """Directories whose entries can be (or lead to) session files."""
+    try:
+        parts = d.relative_to(root).parts
+    except ValueError:
+        return False
+    return len(parts) <= 2 or (len(parts) == 3 and parts[2] == "subagents")
+
+
+def open_watcher(root):
+    """An Inotify watching every session directory under `root`, or None."""
+    try:
+        watcher = Inotify()
+    except OSError as exc:
+        print(f"warning: {exc}; polling instead", file=sys.stderr)
+        return None
+    try:
+        watcher.add_watch(root)
+        for d in sorted(root.glob("*")) + sorted(root.glob("*/*")):
+            if d.is_dir():
+                watcher.add_watch(d)
+        for d in sorted(root.glob("*/*/subagents")):
+            watcher.add_watch(d)
+    except OSError as exc:
+        print(f"warning: {exc}; polling instead", file=sys.stderr)
+        watcher.close()
+        return None
+    return watcher
+
+
+def session_files(root):
+    main_files = sorted(root.glob("*/*.jsonl"))
+    sub_files = sorted(root.glob("*/*/subagents/agent-*.jsonl"))
+    return [(f, False) for f in main_files] + [(f, True) for f in sub_files]
+
+
+def follow_init(root, start_date):
+    """Ingest the window once and remember where each file was read up to."""
+    state = dict(
+        root=root,
+        start_date=start_date,
+        bucket=defaultdict(empty_stats),
+        unknown_models={},
+        files={},
+    )
+    for f, is_sub in session_files(root):
+        offset = scan_start(f, start_date)
+        if offset is None:
+            # Nothing in the window yet; only bytes appended from now count.
+            try:
+                state["files"][f] = [f.stat().st_size, {}]
+            except OSError:
+                pass
+            continue
+        state["files"][f] = [offset, {}]
+        follow_update(state, f)
+    return state
+
+
+def follow_update(state, f):
+    """Feed the bytes appended to `f` since the last look into the bucket."""
+    is_sub = session_file_kind(f, state["root"])
+    if is_sub is None:
+        return
+    try:
+        size = f.stat().st_size
+    except OSError:
+        return
+    entry = state["files"].setdefault(f, [0, {}])
+    if size < entry[0]:
+        # Rewritten in place: its old bytes are already counted and can't
+        # be subtracted, so carry on from the new end.
+        print(f"warning: {f} shrank; following from its new end", file=sys.stderr)
+        entry[0] = size
+        return
+    if size == entry[0]:
+        return
+    entry[0] = ingest(
+        f,
+        is_sub,
+        state["root"],
+        state["start_date"],
+        None,  # no upper bound: the window keeps growing past midnight
+        state["bucket"],
+        state["unknown_models"],
+        offset=entry[0],
+        pending=entry[1],
+    )
+
+
+def follow_rescan(state):
+    """Polling / overflow path: pick up every file that grew or appeared."""
+    for f, _ in session_files(state["root"]):
+        follow_update(state, f)
+
+
+def follow_events(state, watcher, events):
+    """Apply a batch of Inotify events; new directories get watched too."""
+    root = state["root"]
+    for path, mask in events:
+        if path is None:
+            follow_rescan(state)
+            continue
+        if mask & Inotify.IN_ISDIR:
+            if not _watchable_dir(path, root):
+                continue
+            try:
+                watcher.add_watch(path)
+            except OSError as exc:
+                print(f"warning: {exc}", file=sys.stderr)
+            # Files may have landed before the watch did.
+            for f in sorted(path.rglob("*.jsonl")):
+                follow_update(state, f)
+            continue
+        follow_update(state, path)
+
+
+def follow_snapshot(bucket):
+    """`{(repo, model): (cost, cache_write_cost)}` over the whole bucket."""
+    snap = defaultdict(lambda: [0.0, 0.0])
+    for (proj, _, _), s in bucket.items():
+        for model, t in s["models"].items():
+            p = PRICING[model]
+            cache_write = money(t["c1h"], p["c1h"]) + money(t["c5m"], p["c5m"])
+            cost = (
+                money(t["inp"], p["inp"])
+                + money(t["out"], p["out"])
+                + money(t["cread"], p["cread"])
+                + cache_write
+            )
+            row = snap[(humanize_project(proj), model)]
+            row[0] += cost
+            row[1] += cache_write
+    return {k: tuple(v) for k, v in snap.items()}
+
+
+def fmt_follow(prev, cur, now, top=FOLLOW_TOP_ROWS):
+    """Lines for one tick: the window total, then the fastest-growing rows.
+
+    Rows are ordered by spend since the previous tick, then total, so a
+    runaway session (typically a subagent loop re-writing cache) is the
+    first thing on screen.
+    """
+    total = sum(c for c, _ in cur.values())
+    prev_total = sum(c for c, _ in prev.values())
+    lines = [
+        f"[{now:%H:%M:%S}] window total ${total:,.2f} "
+        f"(+${total - prev_total:,.2f} since last tick)"
+    ]
+
+    def delta(k):
+        return cur[k][0] - prev.get(k, (0.0, 0.0))[0]
+
+    for k in sorted(cur, key=lambda k: (-delta(k), -cur[k][0]))[:top]:
+        (repo, model), (cost, cache_write) = k, cur[k]
+        dcw = cache_write - prev.get(k, (0.0, 0.0))[1]
+        amount = f"${cost:,.2f}"
+        lines.append(
+            f"  {repo:<30} {model:<20} {amount:>11} (+${delta(k):,.2f})  "
+            f"cache writes ${cache_write:,.2f} (+${dcw:,.2f})"
+        )
+    return lines
+
+
+def follow(root, start_date, interval, out=None, watcher=None, max_ticks=None):
+    """Run the live view until interrupted (or for `max_ticks` ticks).
+
+    `watcher` defaults to an Inotify over `root` (None -> polling); tests
+    pass their own object with the same `read(timeout)` / `add_watch(path)`
+    / `close()` surface.
+    """
+    if out is None:
+        out = sys.stdout
+    state = follow_init(root, start_date)
+    if watcher is None:
+        watcher = open_watcher(root)
+    prev = follow_snapshot(state["bucket"])
+    for line in fmt_follow({}, prev, datetime.now()):
+        print(line, file=out, flush=True)
+    ticks = 0
+    deadline = time.monotonic() + interval
+    try:
+        while max_ticks is None or ticks < max_ticks:
+            timeout = max(0.0, deadline - time.monotonic())
+            if watcher is not None:
+                follow_events(state, watcher, watcher.read(timeout))
+            else:
+                time.sleep(timeout)
+                follow_rescan(state)
+            if time.monotonic() < deadline:
+                continue
+            cur = follow_snapshot(state["bucket"])
+            for line in fmt_follow(prev, cur, datetime.now()):
+                print(line, file=out, flush=True)
+            prev = cur
+            deadline += interval
+            ticks += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if watcher is not None:
+            watcher.close()
+    return 0
+
+
 def parse_args(argv=None):
     p = argparse.ArgumentParser(
         description="Compute Claude Code cost-impact report for a recent time window."
@@ -700,6 +2237,60 @@ def parse_args(argv=None):
         default=7,
         help="Number of days back to scan (integer >= 1, default 7)",
     )
+    p.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Re-parse every session file instead of using the incremental "
+        "ingest index",
+    )
+    p.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Discard the ingest index and rebuild it from scratch",
+    )
+    p.add_argument(
+        "--workers",
+        type=positive_int,
+        default=os.cpu_count() or 1,
+        help="Processes to parse session files with (default: CPU count; "
+        "1 = in-process)",
+    )
+    p.add_argument(
+        "--windows",
+        type=window_list,
+        default=(),
+        help="Comma-separated extra windows in days (e.g. 1,7,30,90), each "
+        "compared with the period before it; reported alongside the main window",
+    )
+    p.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="md",
+        help="md (default): the markdown report. json / ndjson / csv: one "
+        "record per session-day, streamed, for dashboards (no PR title lookups)",
+    )
+    p.add_argument(
+        "--output",
+        "-o",
+        help="Where to write (default /tmp/cost-impact.<format>; '-' = stdout)",
+    )
+    p.add_argument(
+        "--follow",
+        action="store_true",
+        help="Stay running and print spend per repo/model as session logs grow "
+        "(Ctrl-C to stop)",
+    )
+    p.add_argument(
+        "--interval",
+        type=positive_int,
+        default=FOLLOW_DEFAULT_INTERVAL,
+        help=f"Seconds between --follow updates (default {FOLLOW_DEFAULT_INTERVAL})",
+    )
+    p.add_argument(
+        "--no-pr-cache",
+        action="store_true",
+        help="Look up every PR title afresh instead of using the on-disk cache",
+    )
     return p.parse_args(argv)
 
 
@@ -709,10 +2300,15 @@ def positive_int(s):
     except ValueError:
         raise argparse.ArgumentTypeError(f"expected integer, got {s!r}")
     if v < 1:
-        raise argparse.ArgumentTypeError(f"days must be >= 1, got {v}")
+        raise argparse.ArgumentTypeError(f"expected integer >= 1, got {v}")
     return v
 
 
+def window_list(s):
+    """Parse `--windows`: '1,7,30' -> (1, 7, 30), each a positive_int."""
+    return tuple(sorted({positive_int(part) for part in s.split(",") if part.strip()}))
+
+
 def main(argv=None):
     args = parse_args(argv)
     days_back = args.days
@@ -721,16 +2317,31 @@ def main(argv=None):
     start_date = today - timedelta(days=days_back - 1)
 
     root = Path.home() / ".claude" / "projects"
-    main_files = sorted(root.glob("*/*.jsonl"))
-    sub_files = sorted(root.glob("*/*/subagents/agent-*.jsonl"))
+    if args.follow:
+        return follow(root, start_date, args.interval)
+    files = session_files(root)
 
+    # One load covers the main window plus every --windows window and the
+    # equal-length period before it.
+    span = max([days_back, *(2 * n for n in args.windows)])
     bucket = defaultdict(empty_stats)
-    unknown_models = {}
-
-    for f in main_files:
-        ingest(f, False, root, start_date, today, bucket, unknown_models)
-    for f in sub_files:
-        ingest(f, True, root, start_date, today, bucket, unknown_models)
+    unknown_by_day = defaultdict(dict)
+
+    index_path = None if args.no_index else default_index_path()
+    if index_path is not None and args.rebuild_index:
+        index_path.unlink(missing_ok=True)
+    ingest_all(
+        files,
+        root,
+        today - timedelta(days=span - 1),
+        today,
+        bucket,
+        unknown_by_day,
+        index_path,
+        workers=args.workers,
+    )
+    windows = window_summaries(bucket, unknown_by_day, today, args.windows)
+    bucket, unknown_models = window_slice(bucket, unknown_by_day, start_date, today)
 
     if unknown_models:
         for m, u in sorted(unknown_models.items()):
@@ -740,36 +2351,77 @@ def main(argv=None):
                 file=sys.stderr,
             )
 
+    out = Path(args.output or f"/tmp/cost-impact.{args.format}")
+    # With the output on stdout, the status lines move to stderr.
+    status = sys.stderr if args.output == "-" else sys.stdout
+    dest = "stdout" if args.output == "-" else out
+
+    if args.format != "md":
+        meta = dict(
+            start=start_date.isoformat(),
+            end=today.isoformat(),
+            days=days_back,
+            generated_at=datetime.now().astimezone().isoformat(timespec="seconds"),
+            host=socket.gethostname(),
+            unknown_models=unknown_models,
+            windows=[
+                dict(w, start=w["start"].isoformat(), end=w["end"].isoformat())
+                for w in windows
+            ],
+        )
+        ordered = sorted(bucket.items(), key=lambda kv: (kv[0][2], kv[0][0], kv[0][1]))
+        entries = iter_entries(dict(ordered))
+        if args.output == "-":
+            n = write_export(args.format, entries, sys.stdout, meta)
+        else:
+            with out.open("w", newline="") as fh:
+                n = write_export(args.format, entries, fh, meta)
+        print(f"Wrote {dest} ({n} session-days)", file=status)
+        return
+
     agg = aggregate(bucket)
 
     all_prs = set()
     for s in bucket.values():
-        for k, _ in s["prs_created"]:
+        for k, _ in s.prs_created:
             all_prs.add(k)
-        all_prs.update(s["prs_referenced"])
+        all_prs.update(s.prs_referenced)
     all_prs = {k for k in all_prs if not (k[0] == "a" and k[1] == "b")}
-    titles = fetch_pr_titles(all_prs)
+    pr_cache_path = None if args.no_pr_cache else default_pr_cache_path()
+    titles = resolve_pr_titles(all_prs, pr_cache_path)
 
-    bucket_meta = dict(agg, unknown_models=unknown_models)
+    bucket_meta = dict(agg, unknown_models=unknown_models, windows=windows)
     report = build_report(
         agg["entries"], bucket_meta, days_back, start_date, today, titles
     )
 
-    out = Path("/tmp/cost-impact.md")
-    out.write_text(report)
+    if args.output == "-":
+        sys.stdout.write(report)
+    else:
+        out.write_text(report)
     n_entries = len(agg["entries"])
     tot_actual = agg["tot_actual"]
     tot_naive = agg["tot_naive"]
-    print(f"Wrote {out} ({len(report):,} bytes, {n_entries} session-days)")
+    print(
+        f"Wrote {dest} ({len(report):,} bytes, {n_entries} session-days)", file=status
+    )
     print(
         f"Actual: ${tot_actual:,.2f} | "
         f"no-cache ref: ${tot_naive:,.2f} | "
-        f"savings: {pct_or_na(tot_naive - tot_actual, tot_naive)}"
+        f"savings: {pct_or_na(tot_naive - tot_actual, tot_naive)}",
+        file=status,
     )
     repo_totals = agg["repo_totals"]
     print(
-        f"Repos: {len(agg['by_repo'])}, top 3: {', '.join(r for r, _ in repo_totals[:3])}"
+        f"Repos: {len(agg['by_repo'])}, top 3: {', '.join(r for r, _ in repo_totals[:3])}",
+        file=status,
     )
+    for w in windows:
+        print(
+            f"{w['days']}d: ${w['actual']:,.2f} "
+            f"({fmt_change(w['actual'], w['prev_actual'])} vs previous {w['days']}d)",
+            file=status,
+        )
 
 
 if __name__ == "__main__":
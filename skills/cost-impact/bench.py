@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""cost-impact bench — measurement harness for `_impl.py`.
+
+    python3 bench.py generate /tmp/corpus --sessions 200 --turns 150
+    python3 bench.py ingest /tmp/corpus --workers 1,4 --index
+    python3 bench.py ingest --sessions 50 --json > base.json   # throwaway corpus
+    python3 bench.py memory --days 20000 --models 2 --prs 0.1
+
+`generate` writes a synthetic `~/.claude/projects` tree: main session
+files and subagent files full of assistant turns with usage blocks, Read
+/ Bash tool_use + tool_result pairs, `gh pr create` calls answered with
+a PR URL, and file-history snapshots. Output is deterministic for a given
+seed and `--end` date, so a corpus can be kept and re-measured.
+
+`ingest` times `ingest_all` over a corpus (lines/sec, MB/sec) and then
+`aggregate` + `build_report`, and records the peak RSS after each phase
+(`ru_maxrss` is a high-water mark, so the report figure includes ingest;
+pool workers are counted via RUSAGE_CHILDREN). `--index` adds a cold and
+a warm run against a scratch ingest index.
+
+`memory` builds the same synthetic bucket twice — once with the original
+dict-of-defaultdicts accumulator (`legacy_stats`, kept here verbatim as
+the baseline) and once with `_impl.empty_stats()` — and reports the
+tracemalloc peak for each, plus bytes per session-day and the reduction.
+
+Stdlib-only, like `_impl.py`.
+"""
+
+import argparse
+import json
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import _impl  # noqa: E402
+
+MODELS = ("claude-opus-4-6", "claude-sonnet-4-6", "claude-haiku-4-5")
+REPOS = ("idvorkin/chop-conventions", "idvorkin/blog", "idvorkin/nlp", "acme/api")
+
+
+WORDS = (
+    "index refresh window bucket session model cache token report parse "
+    "worker shard rollup export follow commit branch review title merge"
+).split()
+TOOL_RESULT_BYTES = 2048
+SNAPSHOT_EVERY = 10
+PR_EVERY = 60
+SUBAGENT_TURN_SHARE = 4
+# The ingest bench's window: wide enough to take every line of any corpus.
+ALL_TIME = (date(1970, 1, 2), date(9999, 12, 30))
+
+
+def _text(rng, n):
+    """About `n` bytes of filler prose."""
+    out, size = [], 0
+    while size < n:
+        w = rng.choice(WORDS)
+        out.append(w)
+        size += len(w) + 1
+    return " ".join(out)
+
+
+class SessionWriter:
+    """Emits one session's JSONL lines in Claude Code's shape."""
+
+    def __init__(self, rng, session_id, cwd, ts):
+        self.rng = rng
+        self.session_id = session_id
+        self.cwd = cwd
+        self.ts = ts
+        self.n = 0
+
+    def _line(self, **fields):
+        self.n += 1
+        self.ts += timedelta(seconds=self.rng.randrange(2, 40))
+        d = dict(
+            parentUuid=f"{self.session_id}-{self.n - 1}" if self.n > 1 else None,
+            isSidechain=False,
+            userType="external",
+            cwd=self.cwd,
+            sessionId=self.session_id,
+            version="2.1.0",
+            gitBranch="main",
+            uuid=f"{self.session_id}-{self.n}",
+            timestamp=self.ts.isoformat().replace("+00:00", "Z"),
+            **fields,
+        )
+        return json.dumps(d, separators=(",", ":")) + "\n"
+
+    def _assistant(self, model, content):
+        rng = self.rng
+        c1h = rng.randrange(0, 4000) if rng.random() < 0.3 else 0
+        c5m = rng.randrange(0, 2000) if rng.random() < 0.2 else 0
+        usage = dict(
+            input_tokens=rng.randrange(1, 50),
+            cache_creation_input_tokens=c1h + c5m,
+            cache_read_input_tokens=rng.randrange(10_000, 150_000),
+            cache_creation=dict(
+                ephemeral_5m_input_tokens=c5m, ephemeral_1h_input_tokens=c1h
+            ),
+            output_tokens=rng.randrange(20, 1500),
+            service_tier="standard",
+        )
+        msg = dict(
+            id=f"msg_{self.session_id[:8]}{self.n}",
+            type="message",
+            role="assistant",
+            model=model,
+            content=content,
+            stop_reason="tool_use",
+            usage=usage,
+        )
+        return self._line(type="assistant", message=msg, requestId=f"req_{self.n}")
+
+    def _result(self, tool_id, text):
+        block = dict(type="tool_result", tool_use_id=tool_id, content=text)
+        return self._line(type="user", message=dict(role="user", content=[block]))
+
+    def prompt(self):
+        """The user message that opens the session."""
+        msg = dict(role="user", content=_text(self.rng, 200))
+        return self._line(type="user", message=msg)
+
+    def turn(self, model, repo, pr_number):
+        """One assistant tool call plus its result (2-3 lines)."""
+        rng = self.rng
+        tool_id = f"toolu_{self.session_id[:8]}{self.n}"
+        if pr_number is not None:
+            title = _text(rng, 30).capitalize()
+            cmd = f'gh pr create --title "{title}" --body "{_text(rng, 200)}"'
+            use = dict(
+                type="tool_use", id=tool_id, name="Bash", input=dict(command=cmd)
+            )
+            result = f"https://github.com/{repo}/pull/{pr_number}\n"
+        elif rng.random() < 0.5:
+            path = f"{self.cwd}/src/{rng.choice(WORDS)}.py"
+            use = dict(
+                type="tool_use", id=tool_id, name="Read", input=dict(file_path=path)
+            )
+            result = _text(
+                rng, rng.randrange(TOOL_RESULT_BYTES // 4, TOOL_RESULT_BYTES * 2)
+            )
+        else:
+            cmd = f"git log --oneline -n {rng.randrange(5, 30)}"
+            use = dict(
+                type="tool_use", id=tool_id, name="Bash", input=dict(command=cmd)
+            )
+            result = _text(rng, rng.randrange(100, TOOL_RESULT_BYTES))
+        lines = [
+            self._assistant(model, [dict(type="text", text=_text(rng, 120)), use]),
+            self._result(tool_id, result),
+        ]
+        if self.n % SNAPSHOT_EVERY < 2:
+            snapshot = dict(
+                messageId=f"{self.session_id}-{self.n}",
+                trackedFileBackups={
+                    f"src/{w}.py": dict(version=self.n, backupTime=self.ts.isoformat())
+                    for w in WORDS[: rng.randrange(2, 8)]
+                },
+            )
+            lines.append(self._line(type="file-history-snapshot", snapshot=snapshot))
+        return lines
+
+
+def generate(out, sessions=100, turns=100, subagents=2, days=30, end=None, seed=0):
+    """Write a synthetic session corpus under `out`; return (files, lines, bytes).
+
+    `sessions` main sessions are spread over `days` days ending at `end`
+    (default 2026-01-31, so corpora are reproducible), across a handful of
+    projects. Each has `turns` tool-call turns; `subagents` subagent files
+    per session get a quarter as many each. Roughly one turn in PR_EVERY
+    is a `gh pr create`.
+    """
+    rng = random.Random(seed)
+    out = Path(out)
+    end = end or date(2026, 1, 31)
+    files = lines = size = 0
+    pr_number = 1000
+    for i in range(sessions):
+        repo = REPOS[i % len(REPOS)]
+        cwd = f"/home/developer/gits/{repo.split('/')[1]}"
+        proj = out / cwd.replace("/", "-")
+        session_id = f"{rng.getrandbits(128):032x}"
+        day = end - timedelta(days=rng.randrange(days))
+        start = datetime(day.year, day.month, day.day, 9, tzinfo=timezone.utc)
+        model = MODELS[0] if rng.random() < 0.7 else MODELS[1]
+        targets = [(proj / f"{session_id}.jsonl", turns)]
+        for j in range(subagents):
+            sub = proj / session_id / "subagents" / f"agent-{j:04x}.jsonl"
+            targets.append((sub, max(1, turns // SUBAGENT_TURN_SHARE)))
+        for path, n_turns in targets:
+            w = SessionWriter(rng, session_id, cwd, start)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("w") as fh:
+                chunk = [w.prompt()]
+                for _ in range(n_turns):
+                    pr = None
+                    if rng.randrange(PR_EVERY) == 0:
+                        pr_number += 1
+                        pr = pr_number
+                    chunk.extend(w.turn(model, repo, pr))
+                data = "".join(chunk)
+                fh.write(data)
+            files += 1
+            lines += len(chunk)
+            size += len(data.encode())
+    return files, lines, size
+
+
+def corpus_stats(root):
+    """(files, lines, bytes) of the session files `_impl` would read."""
+    files = _impl.session_files(Path(root))
+    lines = size = 0
+    for f, _ in files:
+        data = f.read_bytes()
+        lines += data.count(b"\n")
+        size += len(data)
+    return len(files), lines, size
+
+
+def peak_rss_mb():
+    """High-water RSS of this process and of any reaped pool workers, in MB."""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    kids = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1 if sys.platform == "darwin" else 1024  # bytes on macOS, KiB elsewhere
+    return max(own, kids) * scale / (1 << 20)
+
+
+def bench_ingest(root, workers=1, index_path=None):
+    """Time one ingest + report build over all of `root` (window ALL_TIME)."""
+    root = Path(root)
+    files = _impl.session_files(root)
+    bucket = defaultdict(_impl.empty_stats)
+    unknown_by_day = defaultdict(dict)
+    t0 = time.perf_counter()
+    _impl.ingest_all(
+        files, root, *ALL_TIME, bucket, unknown_by_day, index_path, workers=workers
+    )
+    ingest_s = time.perf_counter() - t0
+    ingest_rss = peak_rss_mb()
+
+    t0 = time.perf_counter()
+    days = sorted(k[2] for k in bucket)
+    start, end = (days[0], days[-1]) if days else (date.today(), date.today())
+    agg = _impl.aggregate(bucket)
+    meta = dict(agg, unknown_models={})
+    report = _impl.build_report(
+        agg["entries"], meta, (end - start).days + 1, start, end, {}
+    )
+    report_s = time.perf_counter() - t0
+    return dict(
+        ingest_s=ingest_s,
+        ingest_rss_mb=ingest_rss,
+        report_s=report_s,
+        report_rss_mb=peak_rss_mb(),
+        session_days=len(agg["entries"]),
+        report_bytes=len(report),
+    )
+
+
+def run_ingest_bench(root, workers_list, index=False):
+    """One result row per (mode, workers): direct scan, plus cold/warm index."""
+    n_files, lines, size = corpus_stats(root)
+    rows = []
+    for workers in workers_list:
+        modes = [("direct", None)]
+        scratch = None
+        if index:
+            scratch = tempfile.TemporaryDirectory()
+            path = Path(scratch.name) / "index.sqlite"
+            modes += [("index-cold", path), ("index-warm", path)]
+        try:
+            for mode, index_path in modes:
+                r = bench_ingest(root, workers, index_path)
+                rows.append(
+                    dict(
+                        r,
+                        mode=mode,
+                        workers=workers,
+                        files=n_files,
+                        lines=lines,
+                        bytes=size,
+                        lines_per_s=lines / r["ingest_s"],
+                        mb_per_s=size / (1 << 20) / r["ingest_s"],
+                    )
+                )
+        finally:
+            if scratch is not None:
+                scratch.cleanup()
+    return rows
+
+
+def fmt_ingest(rows):
+    if not rows:
+        return "(no runs)"
+    r0 = rows[0]
+    out = [
+        f"corpus: {r0['files']} files, {r0['lines']:,} lines, "
+        f"{r0['bytes'] / (1 << 20):.1f} MB, {r0['session_days']} session-days",
+        f"{'mode':<11} {'workers':>7} {'ingest s':>9} {'lines/s':>10} "
+        f"{'MB/s':>7} {'report s':>9} {'peak RSS MB':>12}",
+    ]
+    for r in rows:
+        out.append(
+            f"{r['mode']:<11} {r['workers']:>7} {r['ingest_s']:>9.3f} "
+            f"{r['lines_per_s']:>10,.0f} {r['mb_per_s']:>7.1f} "
+            f"{r['report_s']:>9.3f} {r['report_rss_mb']:>12.1f}"
+        )
+    return "\n".join(out)
+
+
+def legacy_stats():
+    """The accumulator `_impl.empty_stats()` returned before SessionDay."""
+    return dict(
+        models=defaultdict(lambda: dict(inp=0, out=0, c1h=0, c5m=0, cread=0, turns=0)),
+        first=None,
+        last=None,
+        prs_created=[],
+        prs_referenced=set(),
+        subagent_turns=0,
+        main_turns=0,
+    )
+
+
+def fill_bucket(factory, days, models, pr_rate, seed=0):
+    """Populate `days` session-days the way ingest does, with `factory` stats.
+
+    Each session-day gets `models` models of token counts; a `pr_rate`
+    fraction also reference a PR (drawn from a small pool, as real logs
+    re-mention the same PRs).
+    """
+    rng = random.Random(seed)
+    bucket = defaultdict(factory)
+    for i in range(days):
+        s = bucket[(f"proj-{i % 40}", f"{i:08x}-session", f"2026-{i % 12 + 1:02d}-01")]
+        s["first"] = s["last"] = f"2026-01-01T00:{i % 60:02d}:00Z"
+        s["main_turns"] = rng.randrange(1, 200)
+        for model in MODELS[:models]:
+            t = s["models"][model]
+            t["inp"] += rng.randrange(10**6)
+            t["out"] += rng.randrange(10**5)
+            t["cread"] += rng.randrange(10**8)
+            t["turns"] += 1
+        if rng.random() < pr_rate:
+            owner, repo = rng.choice(REPOS).split("/")
+            k = _impl.intern_pr((owner, repo, rng.randrange(1, 50)))
+            s["prs_referenced"].add(k)
+    return bucket
+
+
+def peak_bytes(factory, days, models, pr_rate):
+    tracemalloc.start()
+    try:
+        bucket = fill_bucket(factory, days, models, pr_rate)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del bucket
+    return peak
+
+
+def measure_memory(days, models, pr_rate):
+    legacy = peak_bytes(legacy_stats, days, models, pr_rate)
+    compact = peak_bytes(_impl.empty_stats, days, models, pr_rate)
+    return dict(
+        days=days,
+        models=models,
+        pr_rate=pr_rate,
+        legacy_bytes=legacy,
+        compact_bytes=compact,
+        legacy_per_day=legacy / days,
+        compact_per_day=compact / days,
+        reduction=1 - compact / legacy,
+    )
+
+
+def fmt_memory(r):
+    mb = 1 << 20
+    return "\n".join(
+        [
+            f"{r['days']} session-days x {r['models']} models, "
+            f"{r['pr_rate']:.0%} referencing a PR",
+            f"  legacy dicts : {r['legacy_bytes'] / mb:8.1f} MB"
+            f"  ({r['legacy_per_day']:.0f} B/session-day)",
+            f"  SessionDay   : {r['compact_bytes'] / mb:8.1f} MB"
+            f"  ({r['compact_per_day']:.0f} B/session-day)",
+            f"  reduction    : {r['reduction']:8.1%}",
+        ]
+    )
+
+
+def worker_list(s):
+    try:
+        return [_impl.positive_int(w) for w in s.split(",")]
+    except argparse.ArgumentTypeError as exc:
+        raise argparse.ArgumentTypeError(f"bad --workers {s!r}: {exc}") from exc
+
+
+def _add_corpus_args(p):
+    p.add_argument("--sessions", type=_impl.positive_int, default=100)
+    p.add_argument("--turns", type=_impl.positive_int, default=100)
+    p.add_argument("--subagents", type=int, default=2)
+    p.add_argument("--days", type=_impl.positive_int, default=30)
+    p.add_argument("--end", type=date.fromisoformat, default=None, help="YYYY-MM-DD")
+    p.add_argument("--seed", type=int, default=0)
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    gen = sub.add_parser("generate", help="write a synthetic session corpus")
+    gen.add_argument("out", type=Path)
+    _add_corpus_args(gen)
+    ing = sub.add_parser("ingest", help="ingest + report throughput and peak RSS")
+    ing.add_argument(
+        "corpus", type=Path, nargs="?", help="corpus dir (default: generate a temp one)"
+    )
+    _add_corpus_args(ing)
+    ing.add_argument("--workers", type=worker_list, default=[1], help="e.g. 1,4")
+    ing.add_argument("--index", action="store_true", help="also time cold/warm index")
+    ing.add_argument("--json", action="store_true")
+    mem = sub.add_parser(
+        "memory", help="accumulator memory: legacy dicts vs SessionDay"
+    )
+    mem.add_argument("--days", type=_impl.positive_int, default=20000)
+    mem.add_argument("--models", type=int, choices=range(1, len(MODELS) + 1), default=2)
+    mem.add_argument("--prs", type=float, default=0.1, help="fraction referencing a PR")
+    mem.add_argument("--json", action="store_true")
+    return ap.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    corpus = dict(
+        sessions=getattr(args, "sessions", None),
+        turns=getattr(args, "turns", None),
+        subagents=getattr(args, "subagents", None),
+        days=getattr(args, "days", None),
+        end=getattr(args, "end", None),
+        seed=getattr(args, "seed", None),
+    )
+    if args.cmd == "generate":
+        files, lines, size = generate(args.out, **corpus)
+        print(f"{args.out}: {files} files, {lines:,} lines, {size / (1 << 20):.1f} MB")
+    elif args.cmd == "ingest":
+        with tempfile.TemporaryDirectory() as tmp:
+            root = args.corpus
+            if root is None:
+                root = Path(tmp) / "projects"
+                generate(root, **corpus)
+            rows = run_ingest_bench(root, args.workers, args.index)
+        print(json.dumps(rows, indent=2) if args.json else fmt_ingest(rows))
+    elif args.cmd == "memory":
+        r = measure_memory(args.days, args.models, args.prs)
+        print(json.dumps(r, indent=2) if args.json else fmt_memory(r))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,20 +4,30 @@
 Run with: python3 -m unittest test_impl.py
 """
 
+import csv
+import io
 import json
+import os
+import pickle
 import sys
 import tempfile
 import unittest
 from unittest import mock
 from collections import defaultdict
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
 # Make sibling _impl.py importable
 sys.path.insert(0, str(Path(__file__).parent))
 
+import _impl  # noqa: E402
+
 from _impl import (  # noqa: E402
+    EXPORT_FIELDS,
+    Inotify,
     PR_CREATE_RE,
+    PR_TITLE_MISS_TTL,
+    PR_TITLE_OPEN_TTL,
     PRICING,
     TITLE_RE,
     URL_RE,
@@ -27,19 +37,48 @@ from _impl import (  # noqa: E402
     empty_stats,
     empty_unknown,
     fetch_pr_titles,
+    fmt_change,
     fmt_duration,
+    fmt_follow,
+    follow,
+    follow_events,
+    follow_init,
+    follow_update,
     fmt_pricing_summary,
     fmt_unknown_detail,
     humanize_project,
+    index_load,
+    index_plan,
+    index_prune,
+    index_refresh,
     ingest,
+    ingest_all,
+    intern_pr,
+    iter_entries,
+    merge_stats,
     money,
     normalize_model,
+    open_index,
+    open_watcher,
+    open_pr_cache,
     parent_key,
     parse_args,
     parse_ts,
     pct_or_na,
     positive_int,
+    pr_cache_get,
+    pr_cache_put,
+    pr_titles_query,
     record_unknown,
+    resolve_pr_titles,
+    scan_start,
+    session_file_kind,
+    session_files,
+    shard,
+    window_list,
+    window_slice,
+    window_summaries,
+    write_export,
 )
 
 
@@ -340,6 +379,136 @@ class TestFetchPrTitles(unittest.TestCase):
         self.assertEqual(got[("o", "r", 2)], (None, None))
 
 
+class TestResolvePrTitles(unittest.TestCase):
+    """Cached + batched PR title lookup layered over fetch_pr_titles()."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = Path(self._tmp.name) / "pr-titles.sqlite"
+        self.calls = []
+        self.prs = {
+            ("o", "r", 1): {"title": "One", "state": "OPEN"},
+            ("o", "r", 2): {"title": "Two", "state": "MERGED"},
+            ("o", "s", 3): {"title": "Three", "state": "CLOSED"},
+        }
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def fake_graphql(self, args, capture_output, text, timeout):
+        self.assertEqual(args[:3], ["gh", "api", "graphql"])
+        self.calls.append(args)
+        query = args[4]
+        data = {}
+        for i, (owner, repo) in enumerate(sorted({k[:2] for k in self.prs})):
+            if f'owner: "{owner}", name: "{repo}"' not in query:
+                continue
+            data[f"r{i}"] = {
+                f"p{num}": node
+                for (o, rp, num), node in self.prs.items()
+                if (o, rp) == (owner, repo) and f"p{num}:" in query
+            }
+        return mock.Mock(returncode=0, stdout=json.dumps({"data": data}))
+
+    def resolve(self, prs, now):
+        with mock.patch("_impl.subprocess.run", side_effect=self.fake_graphql):
+            return resolve_pr_titles(prs, self.cache, now=now)
+
+    def test_one_graphql_call_for_all_misses(self):
+        got = self.resolve(set(self.prs), now=1000.0)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(got[("o", "r", 1)], ("One", "OPEN"))
+        self.assertEqual(got[("o", "s", 3)], ("Three", "CLOSED"))
+
+    def test_repeat_run_is_served_from_cache(self):
+        self.resolve(set(self.prs), now=1000.0)
+        self.calls.clear()
+        got = self.resolve(set(self.prs), now=1001.0)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(got[("o", "r", 2)], ("Two", "MERGED"))
+
+    def test_open_prs_expire_closed_ones_do_not(self):
+        self.resolve(set(self.prs), now=1000.0)
+        self.calls.clear()
+        self.prs[("o", "r", 1)] = {"title": "One (renamed)", "state": "MERGED"}
+        got = self.resolve(set(self.prs), now=1000.0 + PR_TITLE_OPEN_TTL + 1)
+        self.assertEqual(len(self.calls), 1)
+        self.assertNotIn("p2:", self.calls[0][4])  # merged: still cached
+        self.assertEqual(got[("o", "r", 1)], ("One (renamed)", "MERGED"))
+
+    def fake_gaps(self, args, capture_output, text, timeout):
+        """GraphQL nulls PR 1 and skips PR 2; `gh pr view` only knows PR 2."""
+        self.calls.append(args[:3])
+        if args[:3] == ["gh", "api", "graphql"]:
+            data = {"r0": {"p1": None}}
+            return mock.Mock(returncode=1, stdout=json.dumps({"data": data}))
+        self.assertEqual(args[:3], ["gh", "pr", "view"])
+        if args[3] == "1":
+            return mock.Mock(returncode=1, stdout="")
+        return mock.Mock(returncode=0, stdout=json.dumps(self.prs[("o", "r", 2)]))
+
+    def resolve_gaps(self, now):
+        prs = {("o", "r", 1), ("o", "r", 2)}
+        with mock.patch("_impl.subprocess.run", side_effect=self.fake_gaps):
+            return resolve_pr_titles(prs, self.cache, now=now)
+
+    def test_graphql_gaps_fall_back_and_not_found_is_cached_as_miss(self):
+        got = self.resolve_gaps(now=5.0)
+        self.assertEqual(got[("o", "r", 1)], (None, None))
+        self.assertEqual(got[("o", "r", 2)], ("Two", "MERGED"))
+        conn = open_pr_cache(self.cache)
+        self.assertEqual(
+            pr_cache_get(conn, [("o", "r", 1)], now=5.0), {("o", "r", 1): (None, None)}
+        )
+        conn.close()
+
+    def test_failed_pr_is_not_looked_up_again_until_miss_ttl(self):
+        self.resolve_gaps(now=5.0)
+        self.calls.clear()
+        got = self.resolve_gaps(now=6.0)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(got[("o", "r", 1)], (None, None))
+        got = self.resolve_gaps(now=5.0 + PR_TITLE_MISS_TTL + 1)
+        self.assertEqual(
+            self.calls,
+            [["gh", "api", "graphql"], ["gh", "pr", "view"]],
+        )
+        self.assertEqual(got[("o", "r", 1)], (None, None))
+
+    def fake_outage(self, args, capture_output, text, timeout):
+        """Every `gh` call fails: offline, unauthed, timed out."""
+        self.calls.append(args[:3])
+        return mock.Mock(returncode=1, stdout="")
+
+    def test_outage_keeps_cached_title_and_is_not_cached(self):
+        key = ("o", "r", 1)
+        self.resolve({key}, now=0.0)
+        self.calls.clear()
+        with mock.patch("_impl.subprocess.run", side_effect=self.fake_outage):
+            got = resolve_pr_titles({key}, self.cache, now=7200.0)
+            self.assertEqual(got[key], ("One", "OPEN"))  # stale beats nothing
+            self.calls.clear()
+            resolve_pr_titles({key}, self.cache, now=7201.0)
+        self.assertEqual(self.calls[0], ["gh", "api", "graphql"])  # retried
+        conn = open_pr_cache(self.cache)
+        row = conn.execute("SELECT title, state, fetched_at FROM pr_titles").fetchall()
+        conn.close()
+        self.assertEqual(row, [("One", "OPEN", 0.0)])
+
+    def test_miss_never_overwrites_a_cached_title(self):
+        key = ("o", "r", 1)
+        conn = open_pr_cache(self.cache)
+        pr_cache_put(conn, {key: ("One", "OPEN")}, now=0.0)
+        pr_cache_put(conn, {key: (None, None)}, now=7200.0, unresolvable=[key])
+        self.assertEqual(pr_cache_get(conn, [key], now=1.0), {key: ("One", "OPEN")})
+        conn.close()
+
+    def test_query_escapes_names(self):
+        query, repos = pr_titles_query([('we"ird', "r", 7)])
+        self.assertIn('owner: "we\\"ird"', query)
+        self.assertEqual(repos, [('we"ird', "r")])
+
+
 class TestAggregateEmpty(unittest.TestCase):
     """Empty bucket must yield empty aggregation without crashing."""
 
@@ -367,6 +536,97 @@ class TestAggregateEmpty(unittest.TestCase):
         self.assertEqual(agg["entries"], [])
 
 
+class TestSessionDay(unittest.TestCase):
+    """The compact accumulator keeps the dict interface ingest/aggregate use."""
+
+    def test_dict_interface(self):
+        s = empty_stats()
+        s["models"]["claude-opus-4-6"]["inp"] += 5
+        s["models"]["claude-opus-4-6"]["turns"] += 1
+        s["main_turns"] = 3
+        self.assertEqual(
+            s["models"]["claude-opus-4-6"],
+            dict(inp=5, out=0, c1h=0, c5m=0, cread=0, turns=1),
+        )
+        self.assertEqual(list(s["models"]), ["claude-opus-4-6"])
+        self.assertEqual(s["main_turns"], 3)
+        with self.assertRaises(KeyError):
+            s["nope"]
+
+    def test_setitem_replaces_counts(self):
+        s = empty_stats()
+        s["models"]["m"]["out"] = 9
+        s["models"]["m"] = dict(inp=1, out=2, c1h=3, c5m=4, cread=5, turns=6)
+        self.assertEqual(dict(s["models"]["m"].items())["out"], 2)
+        s["models"].add("m", 1, 1, 1, 1, 1, 1)
+        self.assertEqual(s["models"]["m"]["turns"], 7)
+
+    def test_pr_containers_are_lazy(self):
+        s = empty_stats()
+        self.assertEqual(s.prs_referenced, frozenset())
+        self.assertEqual(s.prs_created, ())
+        self.assertIsNone(s._referenced)
+        s["prs_referenced"].add(("o", "r", 1))
+        self.assertEqual(s.prs_referenced, {("o", "r", 1)})
+
+    def test_intern_pr_shares_keys(self):
+        a = intern_pr(("own" + "er", "repo", 7))
+        b = intern_pr(("owner", "re" + "po", 7))
+        self.assertIs(a, b)
+
+    def test_merge_and_pickle_round_trip(self):
+        a, b = empty_stats(), empty_stats()
+        a["models"]["m"]["inp"] = 2
+        b["models"]["m"]["inp"] = 3
+        b["models"]["n"]["out"] = 4
+        b["prs_created"].append((("o", "r", 1), "t"))
+        merge_stats(a, b)
+        self.assertEqual(a["models"]["m"]["inp"], 5)
+        self.assertEqual(a["models"]["n"]["out"], 4)
+        self.assertEqual(a.prs_created, [(("o", "r", 1), "t")])
+        self.assertEqual(pickle.loads(pickle.dumps(a)), a)
+        self.assertNotEqual(a, b)
+
+
+class TestBench(unittest.TestCase):
+    """bench.py's synthetic corpus must exercise every ingest path."""
+
+    def test_compact_beats_legacy(self):
+        import bench
+
+        r = bench.measure_memory(days=500, models=2, pr_rate=0.2)
+        self.assertLess(r["compact_bytes"], r["legacy_bytes"])
+
+    def test_generated_corpus_ingests(self):
+        import bench
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "projects"
+            files, lines, size = bench.generate(root, sessions=6, turns=120, seed=1)
+            again = bench.generate(Path(tmp) / "again", sessions=6, turns=120, seed=1)
+            self.assertEqual((files, lines, size), again)
+            self.assertEqual(bench.corpus_stats(root), (files, lines, size))
+            self.assertEqual(files, 6 * 3)
+
+            bucket = defaultdict(empty_stats)
+            ingest_all(
+                session_files(root), root, *bench.ALL_TIME, bucket, defaultdict(dict)
+            )
+            self.assertEqual(len(bucket), 6)
+            self.assertTrue(all(s["main_turns"] == 120 for s in bucket.values()))
+            self.assertTrue(all(s["subagent_turns"] == 60 for s in bucket.values()))
+            created = [pr for s in bucket.values() for pr in s.prs_created]
+            self.assertTrue(created)
+            self.assertTrue(all(title for _, title in created))
+
+            rows = bench.run_ingest_bench(root, [1], index=True)
+        self.assertEqual(
+            [r["mode"] for r in rows], ["direct", "index-cold", "index-warm"]
+        )
+        self.assertEqual({r["session_days"] for r in rows}, {6})
+        self.assertTrue(all(r["lines_per_s"] > 0 for r in rows))
+
+
 class TestBuildReportEmptyWindow(unittest.TestCase):
     """Empty window must produce a minimal report, NOT crash with ZeroDivisionError."""
 
@@ -571,6 +831,544 @@ class TestIngestStreaming(unittest.TestCase):
                 self.assertEqual(sum(t["turns"] for t in s["models"].values()), 0)
 
 
+def _turn(ts, model="claude-opus-4-6", inp=100, out=10, content=None):
+    msg = dict(model=model, usage=dict(input_tokens=inp, output_tokens=out))
+    if content is not None:
+        msg["content"] = content
+    return json.dumps(dict(timestamp=ts, message=msg)) + "\n"
+
+
+class TestIngestIndex(unittest.TestCase):
+    """The SQLite ingest index must reproduce a direct scan exactly while
+    only parsing bytes appended since the previous refresh."""
+
+    START = date(2026, 4, 7)
+    TODAY = date(2026, 4, 13)
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name) / "projects"
+        self.index_path = Path(self._tmp.name) / "cache" / "index.sqlite"
+        self.main = self.root / "-proj" / "uuid1.jsonl"
+        self.sub = self.root / "-proj" / "uuid1" / "subagents" / "agent-a.jsonl"
+        self.sub.parent.mkdir(parents=True)
+        pr_use = dict(
+            type="tool_use",
+            id="tu1",
+            name="Bash",
+            input=dict(command='gh pr create --title "Add thing"'),
+        )
+        pr_result = dict(
+            type="tool_result",
+            tool_use_id="tu1",
+            content="https://github.com/o/r/pull/7",
+        )
+        self.main.write_text(
+            _turn("2026-04-10T10:00:00Z", content=[pr_use])
+            + _turn("2026-04-10T10:05:00Z", content=[pr_result])
+            + _turn("2026-04-12T09:00:00Z", model="claude-opus-9-9", inp=5)
+            + _turn("2026-03-01T09:00:00Z", inp=999)  # outside the window
+        )
+        self.sub.write_text(_turn("2026-04-10T11:00:00Z", inp=50))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def files(self):
+        # What main()'s globs find.
+        main_files = sorted(self.root.glob("*/*.jsonl"))
+        sub_files = sorted(self.root.glob("*/*/subagents/agent-*.jsonl"))
+        return [(f, False) for f in main_files] + [(f, True) for f in sub_files]
+
+    def direct(self, workers=1):
+        bucket, unknown = defaultdict(empty_stats), defaultdict(dict)
+        ingest_all(
+            self.files(),
+            self.root,
+            self.START,
+            self.TODAY,
+            bucket,
+            unknown,
+            workers=workers,
+        )
+        return bucket, unknown
+
+    def indexed(self, workers=1):
+        bucket, unknown = defaultdict(empty_stats), defaultdict(dict)
+        ingest_all(
+            self.files(),
+            self.root,
+            self.START,
+            self.TODAY,
+            bucket,
+            unknown,
+            self.index_path,
+            workers=workers,
+        )
+        return bucket, unknown
+
+    def assertSameResult(self, a, b):
+        self.assertEqual(dict(a[0]), dict(b[0]))
+        self.assertEqual(dict(a[1]), dict(b[1]))
+
+    def test_matches_direct_scan(self):
+        self.assertSameResult(self.indexed(), self.direct())
+        # Second run is served entirely from the index.
+        self.assertSameResult(self.indexed(), self.direct())
+        bucket, unknown = self.indexed()
+        s = bucket[("-proj", "uuid1", date(2026, 4, 10))]
+        self.assertEqual(s["prs_created"], [(("o", "r", 7), "Add thing")])
+        self.assertEqual(s["main_turns"], 2)
+        self.assertEqual(s["subagent_turns"], 1)
+        self.assertEqual(unknown[date(2026, 4, 12)]["claude-opus-9-9"]["inp"], 5)
+
+    def test_unchanged_files_are_not_reopened(self):
+        self.indexed()
+        with mock.patch("_impl.ingest", side_effect=AssertionError("re-parsed")):
+            self.indexed()
+
+    def test_only_appended_bytes_are_parsed(self):
+        self.indexed()
+        size = self.main.stat().st_size
+        with self.main.open("a") as fh:
+            fh.write(_turn("2026-04-13T08:00:00Z", inp=7))
+        with mock.patch("_impl.ingest", wraps=_impl.ingest) as spy:
+            self.indexed()
+        # Only the appended-to main file is parsed, resuming at its old size.
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual(spy.call_args.args[0], self.main)
+        self.assertEqual(spy.call_args.kwargs["offset"], size)
+        self.assertSameResult(self.indexed(), self.direct())
+
+    def test_partial_trailing_line_waits_for_completion(self):
+        line = _turn("2026-04-13T08:00:00Z", inp=7)
+        with self.main.open("a") as fh:
+            fh.write(line[:20])
+        bucket, _ = self.indexed()
+        self.assertNotIn(("-proj", "uuid1", self.TODAY), bucket)
+        with self.main.open("a") as fh:
+            fh.write(line[20:])
+        bucket, _ = self.indexed()
+        self.assertEqual(bucket[("-proj", "uuid1", self.TODAY)]["main_turns"], 1)
+
+    def test_truncated_file_is_reparsed(self):
+        self.indexed()
+        self.main.write_text(_turn("2026-04-11T10:00:00Z", inp=1))
+        self.assertSameResult(self.indexed(), self.direct())
+
+    def test_deleted_files_are_pruned(self):
+        self.indexed()
+        self.sub.unlink()
+        bucket, _ = self.indexed()
+        s = bucket[("-proj", "uuid1", date(2026, 4, 10))]
+        self.assertEqual(s["subagent_turns"], 0)
+
+    def test_signature_change_wipes_index(self):
+        conn = open_index(self.index_path)
+        index_refresh(conn, self.main, False, self.root)
+        index_prune(conn, [self.main])
+        conn.close()
+        new_row = {"claude-opus-9-9": PRICING["claude-opus-4-6"]}
+        with mock.patch.dict("_impl.PRICING", new_row):
+            conn = open_index(self.index_path)
+            count = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            self.assertEqual(count, 0)
+            index_refresh(conn, self.main, False, self.root)
+            bucket, unknown = defaultdict(empty_stats), defaultdict(dict)
+            index_load(conn, self.START, self.TODAY, bucket, unknown)
+            conn.close()
+        self.assertEqual(unknown, {})
+        s = bucket[("-proj", "uuid1", date(2026, 4, 12))]
+        self.assertEqual(s["models"]["claude-opus-9-9"]["inp"], 5)
+
+    def test_process_pool_matches_sequential(self):
+        sub2 = self.sub.with_name("agent-b.jsonl")
+        sub2.write_text(_turn("2026-04-10T12:00:00Z", inp=3))
+        expected = self.direct()
+        with mock.patch("_impl.PARALLEL_MIN_JOBS", 1):
+            self.assertSameResult(self.direct(workers=2), expected)
+            self.assertSameResult(self.indexed(workers=2), expected)
+            with self.main.open("a") as fh:
+                fh.write(_turn("2026-04-13T08:00:00Z", inp=7))
+            sub2.write_text("")  # shrink -> re-parse from byte 0
+            self.assertSameResult(self.indexed(workers=2), self.direct())
+
+    def test_shard_is_contiguous_and_bounded(self):
+        items = list(range(10))
+        chunks = shard(items, 4)
+        self.assertLessEqual(len(chunks), 4)
+        self.assertEqual([x for c in chunks for x in c], items)
+        self.assertEqual(shard([], 4), [])
+
+    def test_unusable_index_falls_back_to_direct_scan(self):
+        self.index_path.parent.mkdir(parents=True)
+        self.index_path.write_bytes(b"not a database" * 100)
+        with mock.patch("sys.stderr"):
+            result = self.indexed()
+        self.assertSameResult(result, self.direct())
+
+
+class TestRollupWindows(unittest.TestCase):
+    """Durable rollup tables and multi-window summaries."""
+
+    TODAY = date(2026, 4, 14)
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name) / "projects"
+        self.index_path = Path(self._tmp.name) / "index.sqlite"
+        main = self.root / "-proj" / "uuid1.jsonl"
+        sub = self.root / "-proj" / "uuid1" / "subagents" / "agent-a.jsonl"
+        sub.parent.mkdir(parents=True)
+        # 1M input tokens on opus 4.6 = $5. Two days last week, three this week.
+        main.write_text(
+            _turn("2026-04-02T10:00:00Z", inp=1_000_000, out=0)
+            + _turn("2026-04-10T10:00:00Z", inp=1_000_000, out=0)
+            + _turn("2026-04-12T10:00:00Z", model="claude-opus-9-9", inp=9, out=0)
+            + _turn("2026-04-14T10:00:00Z", inp=1_000_000, out=0)
+        )
+        sub.write_text(
+            _turn("2026-04-03T10:00:00Z", inp=1_000_000, out=0)
+            + _turn("2026-04-10T11:00:00Z", inp=1_000_000, out=0)
+        )
+        self.files = [(main, False), (sub, True)]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def load(self, days, index_path=None):
+        bucket, unknown_by_day = defaultdict(empty_stats), defaultdict(dict)
+        start = self.TODAY - timedelta(days=days - 1)
+        ingest_all(
+            self.files, self.root, start, self.TODAY, bucket, unknown_by_day, index_path
+        )
+        return bucket, unknown_by_day
+
+    def test_rollup_merges_main_and_subagent_per_model_rows(self):
+        self.load(14, self.index_path)
+        conn = open_index(self.index_path)
+        rows = conn.execute(
+            "SELECT day, model, inp, turns FROM rollup_models "
+            "WHERE proj = '-proj' AND puuid = 'uuid1' ORDER BY day"
+        ).fetchall()
+        conn.close()
+        self.assertIn(("2026-04-10", "claude-opus-4-6", 2_000_000, 2), rows)
+        self.assertEqual(len(rows), 4)
+
+    def test_window_summaries_week_over_week(self):
+        for index_path in (None, self.index_path):
+            bucket, unknown_by_day = self.load(14, index_path)
+            (w,) = window_summaries(bucket, unknown_by_day, self.TODAY, (7,))
+            self.assertEqual(w["start"], date(2026, 4, 8))
+            self.assertAlmostEqual(w["actual"], 15.0)
+            self.assertAlmostEqual(w["prev_actual"], 10.0)
+            self.assertEqual(fmt_change(w["actual"], w["prev_actual"]), "+50%")
+
+    def test_window_slice_scopes_unknown_models(self):
+        bucket, unknown_by_day = self.load(14, self.index_path)
+        day = self.TODAY - timedelta(days=1)
+        sliced, unknown = window_slice(bucket, unknown_by_day, day, self.TODAY)
+        self.assertEqual({k[2] for k in sliced}, {self.TODAY})
+        self.assertEqual(unknown, {})
+        _, unknown = window_slice(bucket, unknown_by_day, date(2026, 4, 12), self.TODAY)
+        self.assertEqual(unknown["claude-opus-9-9"]["inp"], 9)
+
+    def test_report_includes_windows_table(self):
+        bucket, unknown_by_day = self.load(14)
+        windows = window_summaries(bucket, unknown_by_day, self.TODAY, (1, 7))
+        agg = aggregate(bucket)
+        report = build_report(
+            agg["entries"],
+            dict(agg, unknown_models={}, windows=windows),
+            14,
+            self.TODAY - timedelta(days=13),
+            self.TODAY,
+            {},
+        )
+        self.assertIn("## Windows", report)
+        self.assertIn(
+            "| 7d | 2026-04-08 → 2026-04-14 | $15.00 | $10.00 | +50% |", report
+        )
+
+    def test_window_list(self):
+        self.assertEqual(window_list("30,7,1,7"), (1, 7, 30))
+        self.assertEqual(parse_args(["--windows", "1,7"]).windows, (1, 7))
+        self.assertEqual(parse_args([]).windows, ())
+        import argparse as _ap
+
+        with self.assertRaises(_ap.ArgumentTypeError):
+            window_list("7,0")
+
+
+class TestExport(unittest.TestCase):
+    """--format json / ndjson / csv stream one record per session-day."""
+
+    def setUp(self):
+        self.bucket = defaultdict(empty_stats)
+        for day, puuid in ((date(2026, 4, 10), "u1"), (date(2026, 4, 11), "u2")):
+            s = self.bucket[("-home-developer-gits-repo", puuid, day)]
+            s["models"]["claude-opus-4-6"]["inp"] = 1_000_000
+            s["main_turns"] = 1
+            s["prs_created"] = [(("o", "r", 5), "Title")]
+        self.bucket[("-p", "empty", date(2026, 4, 10))]  # zero cost: skipped
+
+    def export(self, fmt, entries=None):
+        out = io.StringIO()
+        if entries is None:
+            entries = iter_entries(self.bucket)
+        n = write_export(fmt, entries, out, dict(start="2026-04-10"))
+        return n, out.getvalue()
+
+    def test_ndjson(self):
+        n, text = self.export("ndjson")
+        self.assertEqual(n, 2)
+        recs = [json.loads(line) for line in text.splitlines()]
+        self.assertEqual([r["session"] for r in recs], ["u1", "u2"])
+        self.assertEqual(recs[0]["repo"], "repo")
+        self.assertEqual(recs[0]["actual"], 5.0)
+        self.assertEqual(recs[0]["prs_created"], ["https://github.com/o/r/pull/5"])
+        self.assertEqual(list(recs[0]), list(EXPORT_FIELDS))
+
+    def test_json_document(self):
+        _, text = self.export("json")
+        doc = json.loads(text)
+        self.assertEqual(doc["start"], "2026-04-10")
+        self.assertEqual(len(doc["entries"]), 2)
+        _, text = self.export("json", entries=iter(()))
+        self.assertEqual(json.loads(text)["entries"], [])
+
+    def test_csv_flattens_nested_fields(self):
+        _, text = self.export("csv")
+        rows = list(csv.DictReader(io.StringIO(text)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["by_model"], "claude-opus-4-6=5.0")
+        self.assertEqual(rows[0]["prs_created"], "https://github.com/o/r/pull/5")
+
+    def test_rows_are_written_as_they_are_produced(self):
+        out = io.StringIO()
+        seen = []
+
+        def entries():
+            for e in iter_entries(self.bucket):
+                seen.append(out.getvalue().count("\n"))
+                yield e
+
+        write_export("ndjson", entries(), out, {})
+        self.assertEqual(seen, [0, 1])
+
+    def test_parse_args(self):
+        args = parse_args(["--format", "csv", "-o", "-"])
+        self.assertEqual((args.format, args.output), ("csv", "-"))
+        self.assertEqual(parse_args([]).format, "md")
+
+
+class TestFollow(unittest.TestCase):
+    """--follow: incremental bucket updates, watcher events, tick output."""
+
+    START = date(2026, 4, 10)
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.main = self.root / "-proj" / "uuid1.jsonl"
+        self.main.parent.mkdir(parents=True)
+        self.main.write_text(_turn("2026-04-10T10:00:00Z", inp=1_000_000, out=0))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def append(self, f, line):
+        with f.open("a") as fh:
+            fh.write(line)
+
+    def test_session_file_kind(self):
+        r = self.root
+        self.assertIs(session_file_kind(r / "p" / "u.jsonl", r), False)
+        sub = r / "p" / "u" / "subagents" / "agent-1.jsonl"
+        self.assertIs(session_file_kind(sub, r), True)
+        self.assertIsNone(session_file_kind(r / "p" / "u" / "notes.jsonl", r))
+        self.assertIsNone(session_file_kind(r / "p" / "u.txt", r))
+
+    def test_update_reads_only_appended_bytes(self):
+        state = follow_init(self.root, self.START)
+        key = ("-proj", "uuid1", date(2026, 4, 10))
+        self.assertEqual(state["bucket"][key]["main_turns"], 1)
+        follow_update(state, self.main)  # nothing new: no double count
+        self.assertEqual(state["bucket"][key]["main_turns"], 1)
+        self.append(self.main, _turn("2026-04-10T11:00:00Z"))
+        follow_update(state, self.main)
+        self.assertEqual(state["bucket"][key]["main_turns"], 2)
+
+    def test_new_subagent_directory_is_watched_and_read(self):
+        state = follow_init(self.root, self.START)
+        sub_dir = self.root / "-proj" / "uuid1" / "subagents"
+        sub_dir.mkdir(parents=True)
+        (sub_dir / "agent-a.jsonl").write_text(_turn("2026-04-10T12:00:00Z"))
+        watcher = mock.Mock()
+        events = [(sub_dir.parent, Inotify.IN_CREATE | Inotify.IN_ISDIR)]
+        follow_events(state, watcher, events)
+        watcher.add_watch.assert_called_once_with(sub_dir.parent)
+        s = state["bucket"][("-proj", "uuid1", date(2026, 4, 10))]
+        self.assertEqual(s["subagent_turns"], 1)
+
+    def test_fmt_follow_puts_fastest_growing_first(self):
+        prev = {("a", "m1"): (10.0, 0.0), ("b", "m1"): (1.0, 0.0)}
+        cur = {("a", "m1"): (10.5, 0.0), ("b", "m1"): (6.0, 4.0)}
+        lines = fmt_follow(prev, cur, datetime(2026, 4, 10, 12, 0, 5))
+        self.assertEqual(
+            lines[0], "[12:00:05] window total $16.50 (+$5.50 since last tick)"
+        )
+        self.assertTrue(lines[1].lstrip().startswith("b "))
+        self.assertIn("cache writes $4.00 (+$4.00)", lines[1])
+
+    def test_follow_loop_reports_appended_spend(self):
+        test = self
+
+        class FakeWatcher:
+            closed = False
+
+            def read(self, timeout):
+                line = _turn("2026-04-10T11:00:00Z", inp=1_000_000, out=0)
+                test.append(test.main, line)
+                return [(test.main, Inotify.IN_MODIFY)]
+
+            def add_watch(self, path):
+                pass
+
+            def close(self):
+                self.closed = True
+
+        watcher = FakeWatcher()
+        out = io.StringIO()
+        follow(self.root, self.START, 0, out=out, watcher=watcher, max_ticks=1)
+        lines = out.getvalue().splitlines()
+        self.assertIn("window total $5.00", lines[0])
+        self.assertIn("window total $10.00 (+$5.00 since last tick)", lines[2])
+        self.assertTrue(watcher.closed)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_reports_appends(self):
+        watcher = open_watcher(self.root)
+        self.assertIsNotNone(watcher)
+        try:
+            self.append(self.main, _turn("2026-04-10T11:00:00Z"))
+            events = watcher.read(2.0)
+        finally:
+            watcher.close()
+        self.assertIn(self.main, [path for path, _ in events])
+
+
+class TestWindowPrefilter(unittest.TestCase):
+    """Windowed scans skip files written before the window and seek past
+    old history in big files, without changing the result."""
+
+    START = date(2026, 4, 10)
+    TODAY = date(2026, 4, 13)
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.f = self.root / "-proj" / "uuid1.jsonl"
+        self.f.parent.mkdir(parents=True)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def scan(self, offset):
+        bucket, unknown = defaultdict(empty_stats), {}
+        ingest(
+            self.f, False, self.root, self.START, self.TODAY, bucket, unknown, offset
+        )
+        return dict(bucket)
+
+    def test_file_written_before_window_is_skipped(self):
+        self.f.write_text(_turn("2026-04-01T10:00:00Z"))
+        old = datetime(2026, 4, 2, tzinfo=timezone.utc).timestamp()
+        os.utime(self.f, (old, old))
+        self.assertIsNone(scan_start(self.f, self.START))
+        self.assertEqual(scan_start(self.f, date(2026, 4, 1)), 0)
+
+    def test_unindexed_old_file_is_not_indexed(self):
+        self.f.write_text(_turn("2026-04-01T10:00:00Z"))
+        old = datetime(2026, 4, 2, tzinfo=timezone.utc).timestamp()
+        os.utime(self.f, (old, old))
+        conn = open_index(self.root / "index.sqlite")
+        self.assertIsNone(index_plan(conn, self.f, self.START))
+        self.assertIsNotNone(index_plan(conn, self.f, date(2026, 4, 1)))
+        conn.close()
+
+    def test_bisect_skips_only_pre_window_lines(self):
+        pad = "x" * 300
+        lines = []
+        for day in range(1, 14):
+            for hour in range(24):
+                ts = f"2026-04-{day:02d}T{hour:02d}:30:00Z"
+                lines.append(_turn(ts, content=[dict(type="text", text=pad)]))
+        self.f.write_text("".join(lines))
+        size = self.f.stat().st_size
+        with (
+            mock.patch("_impl.BISECT_MIN_BYTES", 0),
+            mock.patch("_impl.BISECT_MIN_SPAN", 2048),
+        ):
+            offset = scan_start(self.f, self.START)
+        self.assertGreater(offset, size // 3)
+        data = self.f.read_bytes()
+        self.assertTrue(offset == 0 or data[offset - 1 : offset] == b"\n")
+        cutoff = datetime.combine(self.START, datetime.min.time()).astimezone()
+        for raw in data[:offset].splitlines():
+            ts = parse_ts(json.loads(raw)["timestamp"])
+            self.assertLess(ts, cutoff - timedelta(days=1))
+        self.assertEqual(self.scan(offset), self.scan(0))
+
+
+class TestLinePrefilter(unittest.TestCase):
+    """Boring lines are skipped before decoding; the result is unchanged."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.f = self.root / "-proj" / "uuid1.jsonl"
+        self.f.parent.mkdir(parents=True)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def scan(self):
+        bucket, unknown = defaultdict(empty_stats), {}
+        ingest(self.f, False, self.root, None, None, bucket, unknown)
+        return bucket
+
+    def test_only_interesting_lines_are_decoded(self):
+        boring = json.dumps(dict(timestamp="2026-04-10T10:00:00Z", type="progress"))
+        ref = dict(type="text", text="see https://github.com/o/r/pull/3")
+        self.f.write_text(
+            (boring + "\n") * 5
+            + _turn("2026-04-10T10:01:00Z")
+            + json.dumps(
+                dict(timestamp="2026-04-10T10:02:00Z", message=dict(content=[ref]))
+            )
+            + "\n"
+        )
+        with mock.patch("_impl._fast_loads", wraps=_impl._fast_loads) as spy:
+            bucket = self.scan()
+        self.assertEqual(spy.call_count, 2)
+        s = bucket[("-proj", "uuid1", date(2026, 4, 10))]
+        self.assertEqual(s["main_turns"], 1)
+        self.assertEqual(s["prs_referenced"], {("o", "r", 3)})
+
+    def test_invalid_utf8_falls_back_to_lossy_decode(self):
+        line = _turn("2026-04-10T10:01:00Z").encode()
+        self.f.write_bytes(line.replace(b'"message"', b'"\xff": 1, "message"'))
+        s = self.scan()[("-proj", "uuid1", date(2026, 4, 10))]
+        self.assertEqual(s["main_turns"], 1)
+
+    def test_stdlib_and_fast_parser_agree(self):
+        self.f.write_text(_turn("2026-04-10T10:01:00Z") + _turn("2026-04-11T10:01:00Z"))
+        fast = self.scan()
+        with mock.patch("_impl._fast_loads", json.loads):
+            self.assertEqual(self.scan(), fast)
+
+
 class TestRecordUnknown(unittest.TestCase):
     def test_accumulates_all_token_classes(self):
         unknown = {}
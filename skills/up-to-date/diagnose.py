@@ -14,6 +14,10 @@ does NOT mutate anything.
 Usage:
     ./diagnose.py           # prints JSON to stdout
     ./diagnose.py --pretty  # pretty-printed JSON
+    ./diagnose.py --sections worktree,post_up_to_date_path
+                            # only those keys (+ errors); no fetch, no gh
+    ./diagnose.py --repos ~/gits/a ~/gits/a/.worktrees/x ~/gits/b
+                            # fleet mode: [{repo, diagnose_json, error?}, ...]
 
 Tested as a library via test_diagnose.py (pure functions importable).
 """
@@ -21,6 +25,8 @@ Tested as a library via test_diagnose.py (pure functions importable).
 from __future__ import annotations
 
 import argparse
+import contextlib
+import contextvars
 import json
 import os
 import platform
@@ -29,6 +35,7 @@ import shutil
 import socket
 import subprocess
 import sys
+import time
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
@@ -36,6 +43,58 @@ from typing import Any
 
 FORK_ORGS = ["idvorkin-ai-tools"]
 
+FETCH_CMD = ["git", "fetch", "--all", "--prune"]
+FETCH_MODES = ("auto", "always", "never")
+# `--fetch=auto` skips the fetch when the repo was fetched this recently.
+FETCH_MAX_AGE_SECONDS = 120.0
+# Freshness stamp + lock, kept in the git *common* dir so every worktree
+# of a repo shares them (FETCH_HEAD itself is per-worktree).
+FETCH_STATE_NAME = "up-to-date-fetch.json"
+FETCH_LOCK_NAME = "up-to-date-fetch.lock"
+
+# Merged-PR head cache (see `cached_merged_heads`): first-run horizon,
+# incremental page size, and a cap on cached branch names.
+MERGED_HEADS_CACHE_VERSION = 1
+MERGED_HEADS_COLD_LIMIT = 1000
+MERGED_HEADS_PAGE_LIMIT = 200
+MERGED_HEADS_CACHE_MAX = 20000
+
+# `--sections`: the top-level JSON keys a caller can ask for (`errors` is
+# always emitted) and the work each one needs. run_diagnose does only the
+# union of that work, so e.g. a hook asking for `worktree` never waits on
+# fetch, gh or tailscale. `head_cherry` is `git cherry` for HEAD alone;
+# `cherry` is the per-branch batch behind the absorption audit.
+_ABSORPTION_NEEDS = frozenset(
+    {"remotes", "fetch", "git_state", "cherry", "merged_heads"}
+)
+SECTION_NEEDS: dict[str, frozenset[str]] = {
+    "remotes": frozenset({"remotes"}),
+    "fetch": frozenset({"remotes", "fetch"}),
+    "branch": frozenset({"remotes", "fetch", "git_state", "head_cherry"}),
+    "worktree": frozenset({"remotes", "git_state"}),
+    "worktrees": _ABSORPTION_NEEDS,
+    "absorbable_branches": _ABSORPTION_NEEDS,
+    "squash_merged_branches": _ABSORPTION_NEEDS,
+    "squash_merged_diverged_branches": _ABSORPTION_NEEDS,
+    "pr": frozenset({"remotes", "git_state", "pr"}),
+    "shared_claude_md": frozenset({"machine"}),
+    "post_up_to_date_path": frozenset({"toplevel"}),
+}
+SECTIONS = tuple(SECTION_NEEDS)
+
+# Fleet mode (`--repos`): bound on concurrent fetches / gh lookups /
+# per-repo diagnoses.
+FLEET_MAX_WORKERS = 8
+
+_GITHUB_URL_RE = re.compile(r"github\.com[:/]([^/\s]+)/([^/\s]+?)(?:\.git)?/?$")
+
+# Working directory for every git/gh subprocess. Unset means the process
+# cwd; fleet mode sets it per repo so one process can diagnose many
+# checkouts concurrently (os.chdir is process-wide).
+_REPO_DIR: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "repo_dir", default=None
+)
+
 # Hostname pattern for the dev-VM class (`c-5004`, `C-5004`, etc.).
 _DEV_HOSTNAME_RE = re.compile(r"^c-\d+$", re.IGNORECASE)
 
@@ -104,6 +163,36 @@ class WorktreeRef:
     branch: str
 
 
+@dataclass(frozen=True)
+class RefSnapshot:
+    """Local branch tips plus the source's default branch, from one
+    `git for-each-ref` over `refs/heads/` and `refs/remotes/<src>/`."""
+
+    local_branch_shas: dict[str, str]
+    default_branch: str
+
+
+@dataclass
+class GitState:
+    """Post-fetch facts about the checkout, as gathered by a git backend.
+
+    Both backends (`collect_git_state_porcelain` and
+    `collect_git_state_plumbing`) fill the same fields, so the rest of
+    `run_diagnose` is backend-agnostic.
+    """
+
+    default_branch: str
+    branch_name: str
+    behind: int
+    ahead: int
+    behind_commits: list[str]
+    uncommitted: list[str]
+    stashes: list[str]
+    local_branch_shas: dict[str, str]
+    worktree_entries: list[WorktreeRef]
+    repo_toplevel: Path | None
+
+
 # ---------- Pure functions (tested) ----------
 
 
@@ -289,6 +378,153 @@ def parse_symbolic_ref_output(raw: str, src: str) -> str | None:
     return None
 
 
+def parse_ref_snapshot(raw: str, src: str) -> RefSnapshot:
+    """Parse `git for-each-ref --format=%(refname)%09%(objectname)%09%(symref)`.
+
+    Expects the refs under `refs/heads/` and `refs/remotes/<src>/`. The
+    default branch is resolved the way `detect_default_branch` does it —
+    the `refs/remotes/<src>/HEAD` symref, else `main` / `master` if that
+    remote-tracking ref exists, else `main` — but from this one listing
+    instead of up to three more git calls.
+    """
+    shas: dict[str, str] = {}
+    remote_branches: set[str] = set()
+    head_target: str | None = None
+    remote_prefix = f"refs/remotes/{src}/"
+    for line in raw.splitlines():
+        refname, _, rest = line.partition("\t")
+        sha, _, symref = rest.partition("\t")
+        if refname.startswith("refs/heads/") and sha:
+            shas[refname[len("refs/heads/") :]] = sha
+        elif refname == f"{remote_prefix}HEAD":
+            head_target = parse_symbolic_ref_output(symref, src)
+        elif refname.startswith(remote_prefix):
+            remote_branches.add(refname[len(remote_prefix) :])
+    default_branch = head_target
+    if default_branch is None:
+        default_branch = next(
+            (b for b in ("main", "master") if b in remote_branches), "main"
+        )
+    return RefSnapshot(local_branch_shas=shas, default_branch=default_branch)
+
+
+def parse_status_branch(raw: str) -> tuple[str, list[str]]:
+    """Parse `git status --porcelain --branch` into `(branch, entries)`.
+
+    The `## ` header carries what `git branch --show-current` would print
+    (empty for a detached HEAD); the remaining lines are exactly the
+    `git status --porcelain` entries.
+
+        ## main...origin/main [ahead 1]
+        ## No commits yet on main
+        ## HEAD (no branch)
+    """
+    branch = ""
+    entries: list[str] = []
+    for line in raw.splitlines():
+        if not line.startswith("## "):
+            if line:
+                entries.append(line)
+            continue
+        header = line[len("## ") :]
+        for prefix in ("No commits yet on ", "Initial commit on "):
+            if header.startswith(prefix):
+                branch = header[len(prefix) :]
+                break
+        else:
+            if not header.startswith("HEAD (no branch)"):
+                # Branch names cannot contain spaces or "..".
+                branch = header.split(" ", 1)[0].split("...", 1)[0]
+    return branch, entries
+
+
+def github_slug(url: str) -> str | None:
+    """`owner/repo` for a GitHub remote URL (SSH or HTTPS), else None."""
+    m = _GITHUB_URL_RE.search(url)
+    return f"{m.group(1)}/{m.group(2)}" if m else None
+
+
+def source_slug(analysis: RemoteAnalysis) -> str | None:
+    """GitHub `owner/name` of the source-of-truth remote, if it is one."""
+    url = next((r.url for r in analysis.entries if r.name == analysis.source), "")
+    return github_slug(url)
+
+
+def merge_merged_prs(
+    heads: dict[str, list[str]], prs: list[tuple[str, str, str]]
+) -> dict[str, list[str]]:
+    """Fold `(name, oid, merged_at)` entries into a `{name: [oid, merged_at]}`
+    cache. Per branch name the most recent merge wins (ISO-8601 UTC
+    timestamps order as strings); on a tie the entry already held wins,
+    keeping gh's newest-first first-occurrence rule. Trimmed to the
+    newest MERGED_HEADS_CACHE_MAX names."""
+    out = dict(heads)
+    for name, oid, merged_at in prs:
+        held = out.get(name)
+        if held is None or merged_at > held[1]:
+            out[name] = [oid, merged_at]
+    if len(out) > MERGED_HEADS_CACHE_MAX:
+        newest = sorted(out.items(), key=lambda kv: kv[1][1], reverse=True)
+        out = dict(newest[:MERGED_HEADS_CACHE_MAX])
+    return out
+
+
+def remotes_key(remotes: list[Remote]) -> list[str]:
+    """Stable identity of a remote set, stored with the fetch stamp so a
+    renamed or re-pointed remote invalidates it."""
+    return sorted(f"{r.name} {r.url}" for r in remotes)
+
+
+def parse_sections(raw: str) -> frozenset[str]:
+    """Parse a `--sections` value (`branch,worktree`) into SECTIONS names.
+
+    Blank items are ignored; unknown names raise ValueError listing them.
+    """
+    names = {item.strip() for item in raw.split(",") if item.strip()}
+    unknown = sorted(names - set(SECTIONS))
+    if unknown:
+        raise ValueError(
+            f"unknown section(s): {', '.join(unknown)} "
+            f"(choose from {', '.join(SECTIONS)})"
+        )
+    return frozenset(names)
+
+
+def section_needs(sections: frozenset[str] | set[str]) -> frozenset[str]:
+    """Union of SECTION_NEEDS over `sections`."""
+    return frozenset().union(*(SECTION_NEEDS[s] for s in sections))
+
+
+def fetch_age(
+    state: dict[str, Any] | None,
+    fetch_head_mtime: float | None,
+    remotes: list[Remote],
+    now: float,
+) -> float | None:
+    """Seconds since this repo's remotes were last all fetched, or None.
+
+    Evidence, freshest wins:
+    - the stamp written after a successful `git fetch --all --prune`,
+      only if it was written for the same remote set;
+    - FETCH_HEAD's mtime, only when there is a single remote. Any
+      `git fetch` / `git pull` touches FETCH_HEAD, which only proves the
+      whole remote set is current when there is just one.
+    """
+    stamps: list[float] = []
+    if (
+        isinstance(state, dict)
+        and state.get("remotes") == remotes_key(remotes)
+        and isinstance(state.get("fetched_at"), (int, float))
+    ):
+        stamps.append(float(state["fetched_at"]))
+    if fetch_head_mtime is not None and len(remotes) == 1:
+        stamps.append(fetch_head_mtime)
+    if not stamps:
+        return None
+    # A stamp from the future (clock skew) counts as just-fetched.
+    return max(0.0, now - max(stamps))
+
+
 # ---------- Machine detection (pure) ----------
 
 
@@ -644,9 +880,28 @@ def check_post_up_to_date(
 # ---------- Subprocess helpers ----------
 
 
+class _Pool(ThreadPoolExecutor):
+    """ThreadPoolExecutor whose tasks run in the submitter's context, so
+    the per-repo `_REPO_DIR` follows work onto pool threads."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def _in_repo(path: str, fn, *args, **kwargs):
+    """Call `fn` with git/gh subprocesses running in `path`."""
+    token = _REPO_DIR.set(path)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _REPO_DIR.reset(token)
+
+
 def _run(cmd: list[str], check: bool = True) -> subprocess.CompletedProcess:
     """Thin wrapper around subprocess.run capturing text output."""
-    return subprocess.run(cmd, capture_output=True, text=True, check=check)
+    return subprocess.run(
+        cmd, capture_output=True, text=True, check=check, cwd=_REPO_DIR.get()
+    )
 
 
 def git(*args: str, check: bool = True) -> str:
@@ -660,6 +915,100 @@ def git_proc(*args: str, check: bool = True) -> subprocess.CompletedProcess:
     return _run(["git", *args], check=check)
 
 
+def git_dirs() -> tuple[Path, Path] | None:
+    """`(git_dir, common_dir)` for the current checkout, or None."""
+    proc = git_proc("rev-parse", "--git-dir", "--git-common-dir", check=False)
+    lines = proc.stdout.splitlines()
+    if proc.returncode != 0 or len(lines) != 2:
+        return None
+    # Relative answers are relative to where git ran.
+    base = Path(_REPO_DIR.get() or ".")
+    return (base / lines[0]).resolve(), (base / lines[1]).resolve()
+
+
+@contextlib.contextmanager
+def _fetch_lock(common_dir: Path):
+    """Serialize fetch decisions across concurrent diagnose runs.
+
+    Whoever takes the lock first fetches and stamps; the others wait, then
+    see a fresh stamp and skip. Best-effort: without fcntl (Windows) or a
+    writable git dir, runs unlocked.
+    """
+    try:
+        import fcntl
+
+        fh = open(common_dir / FETCH_LOCK_NAME, "a")  # noqa: SIM115
+    except (ImportError, OSError):
+        yield
+        return
+    with fh:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        except OSError:
+            pass
+        yield
+
+
+def _read_fetch_state(path: Path) -> dict[str, Any] | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _mtime(path: Path) -> float | None:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def run_fetch(
+    mode: str, max_age: float, remotes: list[Remote]
+) -> tuple[subprocess.CompletedProcess | None, dict[str, Any]]:
+    """Run `git fetch --all --prune` unless `mode` says it can be skipped.
+
+    Returns `(proc_or_none, fetch_block)`; `proc` is None when no fetch
+    ran. `auto` skips when `fetch_age` is within `max_age`, `never`
+    always skips, `always` always fetches. A successful fetch stamps the
+    state file so other worktrees of the repo can skip theirs.
+    """
+    block: dict[str, Any] = {
+        "mode": mode,
+        "performed": False,
+        "age_seconds": None,
+        "max_age_seconds": max_age,
+    }
+    if mode == "never":
+        return None, block
+    dirs = git_dirs()
+    if dirs is None:
+        block["performed"] = True
+        return _run(FETCH_CMD, check=False), block
+    git_dir, common_dir = dirs
+    state_path = common_dir / FETCH_STATE_NAME
+    with _fetch_lock(common_dir):
+        if mode == "auto":
+            age = fetch_age(
+                _read_fetch_state(state_path),
+                _mtime(git_dir / "FETCH_HEAD"),
+                remotes,
+                time.time(),
+            )
+            block["age_seconds"] = age
+            if age is not None and age <= max_age:
+                return None, block
+        block["performed"] = True
+        proc = _run(FETCH_CMD, check=False)
+        if proc.returncode == 0:
+            stamp = {"fetched_at": time.time(), "remotes": remotes_key(remotes)}
+            try:
+                state_path.write_text(json.dumps(stamp), encoding="utf-8")
+            except OSError:
+                pass
+        return proc, block
+
+
 def gh_pr_view_json(fields: str) -> dict[str, Any] | None:
     """Run `gh pr view --json <fields>` and return parsed dict, or None if no PR."""
     proc = _run(["gh", "pr", "view", "--json", fields], check=False)
@@ -671,23 +1020,13 @@ def gh_pr_view_json(fields: str) -> dict[str, Any] | None:
         return None
 
 
-def gh_pr_list_merged_heads(limit: int = 200) -> dict[str, str]:
-    """Return {headRefName: headRefOid} for MERGED PRs in the current repo.
-
-    Closes the squash-merge blind spot in patch-id absorption: a squash
-    merge rewrites the diff into one commit whose patch-id differs from
-    any individual branch commit, so `git cherry` labels the branch as
-    unique work even though the PR landed. Querying `gh pr list` for
-    MERGED PRs is the authoritative fallback.
-
-    Returning the OID (not just the name) lets callers verify that the
-    local branch tip still matches the SHA that was merged — protecting
-    the case where the user added post-merge commits to a branch whose
-    PR already landed. Newest-first ordering from `gh pr list`; first
-    occurrence wins when multiple PRs share a headRefName.
+def _gh_merged_prs(
+    limit: int, repo: str | None, search: str | None = None
+) -> list[tuple[str, str, str]] | None:
+    """`(headRefName, headRefOid, mergedAt)` for merged PRs, newest-first.
 
-    Returns `{}` on any failure (no gh auth, network error, not a GitHub
-    repo) — callers should treat empty as "no extra absorption signal".
+    None on any failure (no gh auth, network error, not a GitHub repo,
+    unexpected JSON); entries missing a name or OID are skipped.
     """
     proc = _run(
         [
@@ -699,29 +1038,131 @@ def gh_pr_list_merged_heads(limit: int = 200) -> dict[str, str]:
             "--limit",
             str(limit),
             "--json",
-            "headRefName,headRefOid",
+            "headRefName,headRefOid,mergedAt",
+            *(["--repo", repo] if repo else []),
+            *(["--search", search] if search else []),
         ],
         check=False,
     )
     if proc.returncode != 0:
-        return {}
+        return None
     try:
         entries = json.loads(proc.stdout)
     except json.JSONDecodeError:
-        return {}
+        return None
     if not isinstance(entries, list):
-        return {}
-    result: dict[str, str] = {}
+        return None
+    prs: list[tuple[str, str, str]] = []
     for e in entries:
         if not isinstance(e, dict):
             continue
         name = e.get("headRefName")
         oid = e.get("headRefOid")
+        merged_at = e.get("mergedAt")
         if isinstance(name, str) and isinstance(oid, str):
-            result.setdefault(name, oid)
+            prs.append((name, oid, merged_at if isinstance(merged_at, str) else ""))
+    return prs
+
+
+def gh_pr_list_merged_heads(
+    limit: int = 200, repo: str | None = None, cache: bool = False
+) -> dict[str, str]:
+    """Return {headRefName: headRefOid} for MERGED PRs in the current repo.
+
+    `repo` (`owner/name`) targets that repo instead of the one gh infers
+    from the working directory — fleet mode looks each slug up once.
+    With `cache` and a `repo`, the map is served from the incremental
+    on-disk cache instead (see `cached_merged_heads`) and `limit` does
+    not apply.
+
+    Closes the squash-merge blind spot in patch-id absorption: a squash
+    merge rewrites the diff into one commit whose patch-id differs from
+    any individual branch commit, so `git cherry` labels the branch as
+    unique work even though the PR landed. Querying `gh pr list` for
+    MERGED PRs is the authoritative fallback.
+
+    Returning the OID (not just the name) lets callers verify that the
+    local branch tip still matches the SHA that was merged — protecting
+    the case where the user added post-merge commits to a branch whose
+    PR already landed. Newest-first ordering from `gh pr list`; first
+    occurrence wins when multiple PRs share a headRefName.
+
+    Returns `{}` on any failure (no gh auth, network error, not a GitHub
+    repo) — callers should treat empty as "no extra absorption signal".
+    """
+    if cache and repo:
+        return cached_merged_heads(repo)
+    prs = _gh_merged_prs(limit, repo)
+    result: dict[str, str] = {}
+    for name, oid, _merged_at in prs or []:
+        result.setdefault(name, oid)
     return result
 
 
+def merged_heads_cache_path(repo: str) -> Path:
+    """`$XDG_CACHE_HOME/chop-up-to-date/merged-heads/<owner>__<name>.json`."""
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    name = repo.replace("/", "__") + ".json"
+    return Path(base) / "chop-up-to-date" / "merged-heads" / name
+
+
+def _load_merged_cache(path: Path) -> dict[str, list[str]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MERGED_HEADS_CACHE_VERSION:
+        return {}
+    heads = data.get("heads")
+    if not isinstance(heads, dict):
+        return {}
+    return {
+        name: [v[0], v[1]]
+        for name, v in heads.items()
+        if isinstance(v, list) and len(v) == 2 and all(isinstance(x, str) for x in v)
+    }
+
+
+def _save_merged_cache(path: Path, heads: dict[str, list[str]]) -> None:
+    """Atomic replace, so a concurrent reader never sees a torn file."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        payload = {"version": MERGED_HEADS_CACHE_VERSION, "heads": heads}
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def cached_merged_heads(repo: str, path: Path | None = None) -> dict[str, str]:
+    """`gh_pr_list_merged_heads` for `repo`, backed by an on-disk cache.
+
+    Merged PRs are immutable, so the cache only ever grows. The first run
+    pulls the last MERGED_HEADS_COLD_LIMIT merged PRs; later runs ask
+    only for PRs merged since the newest cached one (`merged:>=<ts>`,
+    usually an empty answer). A full incremental page means more landed
+    than one page holds, so the cold query runs again to close the gap.
+    If gh fails, the cached map is served as-is.
+    """
+    if path is None:
+        path = merged_heads_cache_path(repo)
+    heads = _load_merged_cache(path)
+    newest = max((merged_at for _oid, merged_at in heads.values()), default="")
+    if newest:
+        prs = _gh_merged_prs(MERGED_HEADS_PAGE_LIMIT, repo, search=f"merged:>={newest}")
+        if prs is not None and len(prs) >= MERGED_HEADS_PAGE_LIMIT:
+            prs += _gh_merged_prs(MERGED_HEADS_COLD_LIMIT, repo) or []
+    else:
+        prs = _gh_merged_prs(MERGED_HEADS_COLD_LIMIT, repo)
+    if prs:
+        merged = merge_merged_prs(heads, prs)
+        if merged != heads:
+            _save_merged_cache(path, merged)
+            heads = merged
+    return {name: oid for name, (oid, _merged_at) in heads.items()}
+
+
 def detect_default_branch(src: str) -> str:
     """Detect the default branch of a remote. Returns 'main' as last-resort fallback.
 
@@ -749,43 +1190,67 @@ def detect_default_branch(src: str) -> str:
     return "main"
 
 
-# ---------- Orchestrator ----------
+# ---------- Git backends ----------
+#
+# Each backend gathers the same post-fetch GitState. `porcelain` runs one
+# user-facing git command per fact; `plumbing` folds the branch name,
+# local branch tips, default-branch detection and `git status` into one
+# `for-each-ref` and one `status --porcelain --branch`, and takes the
+# serial default-branch probes off the critical path — fewer process
+# spawns, which is what dominates on slow NFS-mounted and WSL checkouts.
 
+BACKENDS = ("plumbing", "porcelain")
 
-def run_diagnose() -> dict[str, Any]:
-    """Collect full diagnosis as a JSON-serializable dict.
 
-    Top-level `errors` is a heterogeneous list: legacy git/gh failures
-    are plain strings; shared-CLAUDE.md and post-up-to-date errors are
-    dicts with `{subsystem, code, message, ...}` so the skill can
-    filter by subsystem.
+def _divergence(
+    proc: subprocess.CompletedProcess, errors: list[Any]
+) -> tuple[int, int]:
+    """`(behind, ahead)` from a `rev-list --left-right --count` result."""
+    if proc.returncode != 0:
+        errors.append(
+            f"git rev-list --left-right --count failed: {proc.stderr.strip()}"
+        )
+        return 0, 0
+    divergence = parse_left_right_count(proc.stdout.strip())
+    if divergence is None:
+        errors.append(
+            "git rev-list --left-right --count returned unexpected output: "
+            f"{proc.stdout.strip()!r}"
+        )
+        return 0, 0
+    return divergence
+
+
+def _lines(
+    proc: subprocess.CompletedProcess, what: str, errors: list[Any]
+) -> list[str]:
+    """Non-empty stdout lines, recording `<what> failed` on a non-zero exit.
+
+    Lines keep their leading whitespace: a `status --porcelain` entry
+    starts with a two-column XY code, so ` M` (unstaged) is not `M `.
     """
-    errors: list[Any] = []
+    if proc.returncode != 0:
+        errors.append(f"{what} failed: {proc.stderr.strip()}")
+    return [ln for ln in proc.stdout.splitlines() if ln]
 
-    # Remote hygiene — needs to happen before fetch so we know the source name.
-    remotes_raw = git("remote", "-v", check=False)
-    remotes = parse_remotes(remotes_raw)
-    analysis = classify_remotes(remotes, FORK_ORGS)
-    src = analysis.source
 
-    # Run fetch, current-branch PR lookup, and merged-PR-heads lookup in
-    # parallel — all three hit different endpoints and don't depend on each
-    # other. gh pr view/list read local branch state or remote API, not the
-    # remote fetch result.
-    with ThreadPoolExecutor(max_workers=3) as pool:
-        fetch_fut = pool.submit(_run, ["git", "fetch", "--all", "--prune"], False)
-        pr_fut = pool.submit(
-            gh_pr_view_json,
-            "state,number,title,mergeable,reviewDecision,reviews,comments",
-        )
-        merged_heads_fut = pool.submit(gh_pr_list_merged_heads)
-        fetch_proc = fetch_fut.result()
-        pr_data = pr_fut.result()
-        merged_pr_heads = merged_heads_fut.result()
+def _worktrees(
+    proc: subprocess.CompletedProcess, errors: list[Any]
+) -> list[WorktreeRef]:
+    """Parse worktree porcelain output. Primary is the first entry."""
+    if proc.returncode != 0:
+        errors.append(f"git worktree list failed: {proc.stderr.strip()}")
+        return []
+    return parse_worktree_list(proc.stdout)
 
-    if fetch_proc.returncode != 0:
-        errors.append(f"git fetch failed: {fetch_proc.stderr.strip()}")
 
+def _toplevel(proc: subprocess.CompletedProcess) -> Path | None:
+    # `git rev-parse --show-toplevel` is the canonical way — NOT cwd.
+    return Path(proc.stdout.strip()) if proc.returncode == 0 else None
+
+
+def collect_git_state_porcelain(src: str, errors: list[Any]) -> GitState:
+    """Gather GitState with one git command per fact."""
     # Detect the source's default branch (main, master, or other) AFTER fetch,
     # so remote refs are up-to-date. Done serially before the parallel block
     # because every subsequent query depends on it.
@@ -793,7 +1258,7 @@ def run_diagnose() -> dict[str, Any]:
     src_default = f"{src}/{default_branch}"
 
     # Post-fetch git queries are independent; run them in parallel.
-    with ThreadPoolExecutor(max_workers=7) as pool:
+    with _Pool(max_workers=8) as pool:
         branch_name_fut = pool.submit(git_proc, "branch", "--show-current", check=False)
         divergence_fut = pool.submit(
             git_proc,
@@ -818,6 +1283,9 @@ def run_diagnose() -> dict[str, Any]:
             "--format=%(refname:short)\t%(objectname)",
             check=False,
         )
+        toplevel_fut = pool.submit(
+            git_proc, "rev-parse", "--show-toplevel", check=False
+        )
         branch_name_proc = branch_name_fut.result()
         divergence_proc = divergence_fut.result()
         behind_commits_proc = behind_commits_fut.result()
@@ -825,78 +1293,282 @@ def run_diagnose() -> dict[str, Any]:
         stash_proc = stashes_fut.result()
         worktree_proc = worktree_fut.result()
         local_branches_proc = local_branches_fut.result()
+        toplevel_proc = toplevel_fut.result()
 
     if branch_name_proc.returncode != 0:
         errors.append(
             f"git branch --show-current failed: {branch_name_proc.stderr.strip()}"
         )
-    branch_name = branch_name_proc.stdout.strip()
+    behind, ahead = _divergence(divergence_proc, errors)
+    behind_commits = _lines(behind_commits_proc, f"git log HEAD..{src_default}", errors)
+    uncommitted = _lines(uncommitted_proc, "git status --porcelain", errors)
+    stashes = _lines(stash_proc, "git stash list", errors)
 
-    behind = 0
-    ahead = 0
-    if divergence_proc.returncode != 0:
+    # Each line is `<name>\t<sha>`.
+    local_branch_shas: dict[str, str] = {}
+    if local_branches_proc.returncode != 0:
         errors.append(
-            "git rev-list --left-right --count failed: "
-            f"{divergence_proc.stderr.strip()}"
+            f"git for-each-ref refs/heads/ failed: {local_branches_proc.stderr.strip()}"
         )
     else:
-        divergence = parse_left_right_count(divergence_proc.stdout.strip())
-        if divergence is None:
-            errors.append(
-                "git rev-list --left-right --count returned unexpected output: "
-                f"{divergence_proc.stdout.strip()!r}"
-            )
-        else:
-            behind, ahead = divergence
+        for ln in local_branches_proc.stdout.splitlines():
+            if not ln:
+                continue
+            name, _, sha = ln.partition("\t")
+            if name and sha:
+                local_branch_shas[name] = sha
 
-    if behind_commits_proc.returncode != 0:
-        errors.append(
-            f"git log HEAD..{src_default} failed: {behind_commits_proc.stderr.strip()}"
+    return GitState(
+        default_branch=default_branch,
+        branch_name=branch_name_proc.stdout.strip(),
+        behind=behind,
+        ahead=ahead,
+        behind_commits=behind_commits[:10],
+        uncommitted=uncommitted,
+        stashes=stashes,
+        local_branch_shas=local_branch_shas,
+        worktree_entries=_worktrees(worktree_proc, errors),
+        repo_toplevel=_toplevel(toplevel_proc),
+    )
+
+
+def collect_git_state_plumbing(src: str, errors: list[Any]) -> GitState:
+    """Gather GitState from one `for-each-ref` plus one parallel batch.
+
+    `for-each-ref` over `refs/heads/` and `refs/remotes/<src>/` yields the
+    local branch tips and the default branch (see `parse_ref_snapshot`);
+    `git status --porcelain --branch` yields the current branch and the
+    uncommitted entries. Divergence, the behind log, stashes, worktrees
+    and the toplevel still need their own commands, but all run in the
+    one batch.
+    """
+    refs_proc = git_proc(
+        "for-each-ref",
+        "--format=%(refname)\t%(objectname)\t%(symref)",
+        "refs/heads/",
+        f"refs/remotes/{src}/",
+        check=False,
+    )
+    if refs_proc.returncode != 0:
+        errors.append(f"git for-each-ref failed: {refs_proc.stderr.strip()}")
+    refs = parse_ref_snapshot(
+        refs_proc.stdout if refs_proc.returncode == 0 else "", src
+    )
+    src_default = f"{src}/{refs.default_branch}"
+
+    with _Pool(max_workers=6) as pool:
+        status_fut = pool.submit(
+            git_proc, "status", "--porcelain", "--branch", check=False
+        )
+        divergence_fut = pool.submit(
+            git_proc,
+            "rev-list",
+            "--left-right",
+            "--count",
+            f"{src_default}...HEAD",
+            check=False,
+        )
+        behind_commits_fut = pool.submit(
+            git_proc, "log", "--oneline", f"HEAD..{src_default}", check=False
+        )
+        stashes_fut = pool.submit(git_proc, "stash", "list", check=False)
+        worktree_fut = pool.submit(
+            git_proc, "worktree", "list", "--porcelain", check=False
+        )
+        toplevel_fut = pool.submit(
+            git_proc, "rev-parse", "--show-toplevel", check=False
         )
-    behind_commits_raw = behind_commits_proc.stdout.strip()
+        status_proc = status_fut.result()
+        divergence_proc = divergence_fut.result()
+        behind_commits_proc = behind_commits_fut.result()
+        stash_proc = stashes_fut.result()
+        worktree_proc = worktree_fut.result()
+        toplevel_proc = toplevel_fut.result()
 
-    if uncommitted_proc.returncode != 0:
+    if status_proc.returncode != 0:
         errors.append(
-            f"git status --porcelain failed: {uncommitted_proc.stderr.strip()}"
+            f"git status --porcelain --branch failed: {status_proc.stderr.strip()}"
         )
-    uncommitted_raw = uncommitted_proc.stdout.strip()
+        branch_name, uncommitted = "", []
+    else:
+        branch_name, uncommitted = parse_status_branch(status_proc.stdout)
+    behind, ahead = _divergence(divergence_proc, errors)
+    behind_commits = _lines(behind_commits_proc, f"git log HEAD..{src_default}", errors)
+
+    return GitState(
+        default_branch=refs.default_branch,
+        branch_name=branch_name,
+        behind=behind,
+        ahead=ahead,
+        behind_commits=behind_commits[:10],
+        uncommitted=uncommitted,
+        stashes=_lines(stash_proc, "git stash list", errors),
+        local_branch_shas=refs.local_branch_shas,
+        worktree_entries=_worktrees(worktree_proc, errors),
+        repo_toplevel=_toplevel(toplevel_proc),
+    )
+
+
+# ---------- Orchestrator ----------
+
+
+def run_diagnose(
+    backend: str = "plumbing",
+    fetch: str = "auto",
+    fetch_max_age: float = FETCH_MAX_AGE_SECONDS,
+    *,
+    prefetched: tuple[subprocess.CompletedProcess | None, dict[str, Any]] | None = None,
+    merged_pr_heads: dict[str, str] | None = None,
+    merged_cache: bool = True,
+    sections: frozenset[str] | None = None,
+) -> dict[str, Any]:
+    """Collect full diagnosis as a JSON-serializable dict.
+
+    `backend` picks how the post-fetch git facts are gathered (see
+    BACKENDS); the output is the same either way. `fetch` /
+    `fetch_max_age` decide whether the fetch runs (see `run_fetch`).
+    Fleet mode passes `prefetched` (a `run_fetch` result shared by all
+    worktrees of the repo) and `merged_pr_heads` (shared per GitHub
+    slug) to skip those steps here. `merged_cache` serves merged PR
+    heads from the on-disk cache when the source remote is on GitHub.
 
-    if stash_proc.returncode != 0:
-        errors.append(f"git stash list failed: {stash_proc.stderr.strip()}")
-    stash_raw = stash_proc.stdout.strip()
+    `sections` limits the output to those top-level keys (plus `errors`)
+    and skips any work only the other sections need (see SECTION_NEEDS);
+    None means every section.
+
+    Top-level `errors` is a heterogeneous list: legacy git/gh failures
+    are plain strings; shared-CLAUDE.md and post-up-to-date errors are
+    dicts with `{subsystem, code, message, ...}` so the skill can
+    filter by subsystem.
+    """
+    wanted = frozenset(SECTIONS) if sections is None else sections
+    needs = section_needs(wanted)
+    errors: list[Any] = []
+
+    # Remote hygiene — needs to happen before fetch so we know the source name.
+    remotes: list[Remote] = []
+    analysis = RemoteAnalysis(entries=[], source="origin", is_fork_workflow=False)
+    if "remotes" in needs:
+        remotes_raw = git("remote", "-v", check=False)
+        remotes = parse_remotes(remotes_raw)
+        analysis = classify_remotes(remotes, FORK_ORGS)
+    src = analysis.source
+
+    # Run fetch, current-branch PR lookup, and merged-PR-heads lookup in
+    # parallel — all three hit different endpoints and don't depend on each
+    # other. gh pr view/list read local branch state or remote API, not the
+    # remote fetch result.
+    fetch_proc: subprocess.CompletedProcess | None = None
+    fetch_block: dict[str, Any] | None = None
+    pr_data: dict[str, Any] | None = None
+    with _Pool(max_workers=3) as pool:
+        fetch_fut = (
+            pool.submit(run_fetch, fetch, fetch_max_age, remotes)
+            if prefetched is None and "fetch" in needs
+            else None
+        )
+        pr_fut = (
+            pool.submit(
+                gh_pr_view_json,
+                "state,number,title,mergeable,reviewDecision,reviews,comments",
+            )
+            if "pr" in needs
+            else None
+        )
+        merged_heads_fut = (
+            pool.submit(
+                gh_pr_list_merged_heads, repo=source_slug(analysis), cache=merged_cache
+            )
+            if merged_pr_heads is None and "merged_heads" in needs
+            else None
+        )
+        if fetch_fut is not None:
+            fetch_proc, fetch_block = fetch_fut.result()
+        elif prefetched is not None:
+            fetch_proc, fetch_block = prefetched
+        if pr_fut is not None:
+            pr_data = pr_fut.result()
+        if merged_heads_fut is not None:
+            merged_pr_heads = merged_heads_fut.result()
+
+    if fetch_proc is not None and fetch_proc.returncode != 0:
+        errors.append(f"git fetch failed: {fetch_proc.stderr.strip()}")
+
+    result: dict[str, Any] = {}
+    if "remotes" in wanted:
+        result["remotes"] = {
+            "entries": [asdict(r) for r in analysis.entries],
+            "source": analysis.source,
+            "is_fork_workflow": analysis.is_fork_workflow,
+            "issues": [asdict(i) for i in analysis.issues],
+        }
+    if "fetch" in wanted:
+        result["fetch"] = fetch_block
+
+    repo_toplevel: str | None = None
+    if "git_state" in needs:
+        collect = (
+            collect_git_state_plumbing
+            if backend == "plumbing"
+            else collect_git_state_porcelain
+        )
+        state = collect(src, errors)
+        repo_toplevel = state.repo_toplevel
+        result.update(
+            _diagnose_git_sections(state, src, needs, wanted, merged_pr_heads, errors)
+        )
+        # PR state — only on feature branches, and only if we got data
+        if "pr" in wanted:
+            result["pr"] = _pr_block(pr_data, state.branch_name == state.default_branch)
+    elif "toplevel" in needs:
+        repo_toplevel = _toplevel(git_proc("rev-parse", "--show-toplevel", check=False))
+
+    shared_block: dict[str, Any] | None = None
+    if "machine" in needs:
+        shared_block = _shared_claude_md_block(errors)
+
+    if "toplevel" in needs:
+        # The repo toplevel locates the post-up-to-date hook.
+        post_up_to_date_path, hook_errors = check_post_up_to_date(repo_toplevel)
+        errors.extend(hook_errors)
+        result["post_up_to_date_path"] = post_up_to_date_path
+
+    result["errors"] = errors
+    # Per spec: when resolve_chop_root returns None, omit the
+    # `shared_claude_md` key entirely rather than emitting an empty
+    # block. The error in `errors[]` is the signal.
+    if shared_block is not None:
+        result["shared_claude_md"] = shared_block
+    return result
+
+
+def _diagnose_git_sections(
+    state: GitState,
+    src: str,
+    needs: frozenset[str],
+    wanted: frozenset[str],
+    merged_pr_heads: dict[str, str] | None,
+    errors: list[Any],
+) -> dict[str, Any]:
+    """The `branch` / `worktree` / absorption sections of `run_diagnose`.
+
+    Runs `git cherry` for every branch only when an absorption section is
+    wanted (`cherry` in `needs`); `branch` alone needs HEAD's result only.
+    """
+    default_branch = state.default_branch
+    src_default = f"{src}/{default_branch}"
+    branch_name = state.branch_name
+    ahead = state.ahead
+    local_branch_shas = state.local_branch_shas
+    local_branch_names = sorted(local_branch_shas.keys())
+    worktree_entries = state.worktree_entries
+    merged_pr_heads = merged_pr_heads or {}
 
     # `is_main` means "on the source's default branch" regardless of whether
     # that branch is literally named main or master. Kept as `is_main` for
     # JSON output-field stability; SKILL.md prose treats it as the
     # "on-default-branch" signal.
     is_main = branch_name == default_branch
-    behind_commits = [ln for ln in behind_commits_raw.splitlines() if ln][:10]
-
-    # Local branches to check for absorption (skip the default branch, skip empty).
-    # Each line is `<name>\t<sha>`. We need SHAs to detect the post-merge-work
-    # case: a branch whose PR merged (in merged_pr_heads) but whose local tip
-    # has advanced past the merged head — unsafe to auto-absorb.
-    local_branch_shas: dict[str, str] = {}
-    if local_branches_proc.returncode != 0:
-        errors.append(
-            f"git for-each-ref refs/heads/ failed: {local_branches_proc.stderr.strip()}"
-        )
-        local_branch_names: list[str] = []
-    else:
-        for ln in local_branches_proc.stdout.splitlines():
-            if not ln:
-                continue
-            name, _, sha = ln.partition("\t")
-            if name and sha:
-                local_branch_shas[name] = sha
-        local_branch_names = sorted(local_branch_shas.keys())
-
-    # Parse worktree porcelain output. Primary is the first entry.
-    if worktree_proc.returncode != 0:
-        errors.append(f"git worktree list failed: {worktree_proc.stderr.strip()}")
-        worktree_entries: list[WorktreeRef] = []
-    else:
-        worktree_entries = parse_worktree_list(worktree_proc.stdout)
 
     # Run per-branch `git cherry` in parallel for the absorption/worktree
     # audit. HEAD's result comes from this batch when HEAD is a feature
@@ -905,10 +1577,14 @@ def run_diagnose() -> dict[str, Any]:
     #
     # Include any worktree branch not already in local_branch_names (e.g.
     # a worktree branch from a different remote context). De-dupe via set.
-    cherry_targets = set(local_branch_names)
-    for wt in worktree_entries:
-        if wt.branch:
-            cherry_targets.add(wt.branch)
+    cherry_targets: set[str] = set()
+    if "cherry" in needs:
+        cherry_targets.update(local_branch_names)
+        for wt in worktree_entries:
+            if wt.branch:
+                cherry_targets.add(wt.branch)
+    elif "head_cherry" in needs and branch_name:
+        cherry_targets.add(branch_name)
     # Skip the source's default branch — we never audit it against itself
     # for absorption (it IS the absorption target), and downstream
     # consumers of cherry_by_branch (absorbable_branches, the worktree
@@ -921,10 +1597,11 @@ def run_diagnose() -> dict[str, Any]:
     # The result stays OUT of cherry_by_branch so the absorption audit
     # never sees the default branch.
     head_cherry: CherryAnalysis | None = None
-    total_cherry_calls = len(cherry_targets) + (1 if is_main else 0)
+    run_head_cherry = is_main and "head_cherry" in needs
+    total_cherry_calls = len(cherry_targets) + (1 if run_head_cherry else 0)
     cherry_by_branch: dict[str, CherryAnalysis] = {}
     if total_cherry_calls:
-        with ThreadPoolExecutor(max_workers=min(10, total_cherry_calls)) as pool:
+        with _Pool(max_workers=min(10, total_cherry_calls)) as pool:
             cherry_futs = {
                 b: pool.submit(git_proc, "cherry", "-v", src_default, b, check=False)
                 for b in cherry_targets
@@ -933,7 +1610,7 @@ def run_diagnose() -> dict[str, Any]:
                 pool.submit(
                     git_proc, "cherry", "-v", src_default, branch_name, check=False
                 )
-                if is_main
+                if run_head_cherry
                 else None
             )
             for b, fut in cherry_futs.items():
@@ -954,29 +1631,48 @@ def run_diagnose() -> dict[str, Any]:
                 else:
                     head_cherry = parse_cherry_status(proc.stdout.strip())
 
-    # HEAD's cherry result: the dedicated call when HEAD is the default
-    # branch, the batch otherwise. The empty fallback covers detached
-    # HEAD and errored cherry calls.
-    if head_cherry is not None:
-        cherry = head_cherry
-    else:
-        cherry = cherry_by_branch.get(
-            branch_name, CherryAnalysis(unique_commits=[], equivalent_commits=[])
+    out: dict[str, Any] = {}
+    if "branch" in wanted:
+        # HEAD's cherry result: the dedicated call when HEAD is the default
+        # branch, the batch otherwise. The empty fallback covers detached
+        # HEAD and errored cherry calls.
+        if head_cherry is not None:
+            cherry = head_cherry
+        else:
+            cherry = cherry_by_branch.get(
+                branch_name, CherryAnalysis(unique_commits=[], equivalent_commits=[])
+            )
+        ahead_patch_unique_commits = cherry.unique_commits[:10]
+        ahead_patch_equivalent_commits = cherry.equivalent_commits[:10]
+        # True only when a *successful* cherry call proved every ahead commit
+        # patch-equivalent upstream. head_cherry is None when the call failed
+        # (or HEAD isn't the default branch) — never grant force-push license
+        # on missing data.
+        can_force_align = (
+            is_main
+            and ahead > 0
+            and head_cherry is not None
+            and not head_cherry.unique_commits
         )
-    ahead_patch_unique_commits = cherry.unique_commits[:10]
-    ahead_patch_equivalent_commits = cherry.equivalent_commits[:10]
-    # True only when a *successful* cherry call proved every ahead commit
-    # patch-equivalent upstream. head_cherry is None when the call failed
-    # (or HEAD isn't the default branch) — never grant force-push license
-    # on missing data.
-    can_force_align = (
-        is_main
-        and ahead > 0
-        and head_cherry is not None
-        and not head_cherry.unique_commits
-    )
-
-    leftover_commits = [] if is_main else ahead_patch_unique_commits
+        out["branch"] = {
+            "name": branch_name,
+            "is_main": is_main,
+            "default_branch_name": default_branch,
+            "behind": state.behind,
+            "ahead": ahead,
+            "behind_commits": state.behind_commits,
+            "ahead_patch_unique_commits": ahead_patch_unique_commits,
+            "ahead_patch_equivalent_commits": ahead_patch_equivalent_commits,
+            "can_force_align": can_force_align,
+            "leftover_commits": [] if is_main else ahead_patch_unique_commits,
+        }
+    if "worktree" in wanted:
+        out["worktree"] = {
+            "uncommitted": state.uncommitted,
+            "stashes": state.stashes,
+        }
+    if "cherry" not in needs:
+        return out
 
     # Absorbable branches: local branches whose work is fully in $src_default,
     # caught via either (a) zero unique patch-ids from `git cherry`, or
@@ -1072,25 +1768,36 @@ def run_diagnose() -> dict[str, Any]:
             }
         )
 
-    # Worktree state
-    uncommitted = [ln for ln in uncommitted_raw.splitlines() if ln]
-    stashes = [ln for ln in stash_raw.splitlines() if ln]
-
-    # PR state — only on feature branches, and only if we got data
-    pr_block: dict[str, Any] | None = None
-    if not is_main and pr_data:
-        reviews = pr_data.get("reviews", []) or []
-        comments = pr_data.get("comments", []) or []
-        pr_block = {
-            "state": pr_data.get("state"),
-            "number": pr_data.get("number"),
-            "title": pr_data.get("title"),
-            "mergeable": pr_data.get("mergeable"),
-            "review_decision": pr_data.get("reviewDecision"),
-            "recent_reviews": reviews[-3:],
-            "recent_comments": comments[-3:],
-        }
+    absorption = {
+        "worktrees": worktrees_out,
+        "absorbable_branches": absorbable_branches,
+        "squash_merged_branches": sorted(squash_absorbed),
+        "squash_merged_diverged_branches": sorted(squash_diverged),
+    }
+    out.update((k, v) for k, v in absorption.items() if k in wanted)
+    return out
 
+
+def _pr_block(pr_data: dict[str, Any] | None, is_main: bool) -> dict[str, Any] | None:
+    """The `pr` section: None on the default branch or without gh data."""
+    if is_main or not pr_data:
+        return None
+    reviews = pr_data.get("reviews", []) or []
+    comments = pr_data.get("comments", []) or []
+    return {
+        "state": pr_data.get("state"),
+        "number": pr_data.get("number"),
+        "title": pr_data.get("title"),
+        "mergeable": pr_data.get("mergeable"),
+        "review_decision": pr_data.get("reviewDecision"),
+        "recent_reviews": reviews[-3:],
+        "recent_comments": comments[-3:],
+    }
+
+
+def _shared_claude_md_block(errors: list[Any]) -> dict[str, Any] | None:
+    """The `shared_claude_md` section, or None (with an error appended)
+    when no chop-conventions checkout can be found."""
     # Machine detection — pure Python, no shelling out.
     machine_info = detect_machine()
 
@@ -1098,7 +1805,6 @@ def run_diagnose() -> dict[str, Any]:
     home = Path.home()
     env = dict(os.environ)
     chop_root = resolve_chop_root(env, home)
-    shared_block: dict[str, Any] | None = None
     if chop_root is None:
         probed: list[str] = []
         if env.get("CHOP_CONVENTIONS_ROOT"):
@@ -1116,63 +1822,120 @@ def run_diagnose() -> dict[str, Any]:
                 "probed": probed,
             }
         )
-    else:
-        enabled = (home / ".claude" / "claude-md" / ".enabled").is_file()
-        shared_block, shared_errors = check_shared_claude_md(
-            chop_root=chop_root,
-            home=home,
-            enabled=enabled,
-            machine_info=machine_info,
-        )
-        errors.extend(shared_errors)
+        return None
+    enabled = (home / ".claude" / "claude-md" / ".enabled").is_file()
+    shared_block, shared_errors = check_shared_claude_md(
+        chop_root=chop_root,
+        home=home,
+        enabled=enabled,
+        machine_info=machine_info,
+    )
+    errors.extend(shared_errors)
+    return shared_block
 
-    # Locate the repo toplevel for the post-up-to-date hook. `git
-    # rev-parse --show-toplevel` is the canonical way — NOT cwd.
-    toplevel_proc = git_proc("rev-parse", "--show-toplevel", check=False)
-    if toplevel_proc.returncode == 0:
-        repo_toplevel: Path | None = Path(toplevel_proc.stdout.strip())
-    else:
-        repo_toplevel = None
-    post_up_to_date_path, hook_errors = check_post_up_to_date(repo_toplevel)
-    errors.extend(hook_errors)
 
-    result: dict[str, Any] = {
-        "remotes": {
-            "entries": [asdict(r) for r in analysis.entries],
-            "source": analysis.source,
-            "is_fork_workflow": analysis.is_fork_workflow,
-            "issues": [asdict(i) for i in analysis.issues],
-        },
-        "branch": {
-            "name": branch_name,
-            "is_main": is_main,
-            "default_branch_name": default_branch,
-            "behind": behind,
-            "ahead": ahead,
-            "behind_commits": behind_commits,
-            "ahead_patch_unique_commits": ahead_patch_unique_commits,
-            "ahead_patch_equivalent_commits": ahead_patch_equivalent_commits,
-            "can_force_align": can_force_align,
-            "leftover_commits": leftover_commits,
-        },
-        "worktree": {
-            "uncommitted": uncommitted,
-            "stashes": stashes,
-        },
-        "worktrees": worktrees_out,
-        "absorbable_branches": absorbable_branches,
-        "squash_merged_branches": sorted(squash_absorbed),
-        "squash_merged_diverged_branches": sorted(squash_diverged),
-        "pr": pr_block,
-        "post_up_to_date_path": post_up_to_date_path,
-        "errors": errors,
+# ---------- Fleet mode ----------
+
+
+def _probe_repo(path: str) -> dict[str, Any]:
+    """Validate `path` and read what fleet grouping needs: the git common
+    dir (shared by every worktree of a repo), remotes and GitHub slug."""
+    p = Path(path).expanduser()
+    if not p.is_dir():
+        return {"error": "not a directory"}
+    dirs = _in_repo(str(p), git_dirs)
+    if dirs is None:
+        return {"error": "not a git repository"}
+    remotes = parse_remotes(_in_repo(str(p), git, "remote", "-v", check=False))
+    return {
+        "path": str(p),
+        "common_dir": dirs[1],
+        "remotes": remotes,
+        "slug": source_slug(classify_remotes(remotes, FORK_ORGS)),
     }
-    # Per spec: when resolve_chop_root returns None, omit the
-    # `shared_claude_md` key entirely rather than emitting an empty
-    # block. The error in `errors[]` is the signal.
-    if shared_block is not None:
-        result["shared_claude_md"] = shared_block
-    return result
+
+
+def run_fleet(
+    paths: list[str],
+    backend: str = "plumbing",
+    fetch: str = "auto",
+    fetch_max_age: float = FETCH_MAX_AGE_SECONDS,
+    max_workers: int = FLEET_MAX_WORKERS,
+    merged_cache: bool = True,
+    sections: frozenset[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Diagnose many checkouts in one process.
+
+    Checkouts sharing a git common dir (a repo and its worktrees) share
+    one `run_fetch`; `gh pr list --state merged` runs once per GitHub
+    slug; fetches, lookups and the per-repo `run_diagnose` calls all go
+    through one pool of `max_workers`. Shared steps that `sections` does
+    not need are skipped. Returns bulk-up-to-date's shape,
+    `[{repo, diagnose_json, error?}]`, in input order.
+    """
+    needs = section_needs(frozenset(SECTIONS) if sections is None else sections)
+    out: list[dict[str, Any]] = []
+    with _Pool(max_workers=max_workers) as pool:
+        probes = list(pool.map(_probe_repo, paths))
+        groups: dict[Path, dict[str, Any]] = {}
+        slugs: set[str] = set()
+        for probe in probes:
+            if "error" not in probe:
+                groups.setdefault(probe["common_dir"], probe)
+                if probe["slug"]:
+                    slugs.add(probe["slug"])
+        fetch_futs = {
+            common_dir: pool.submit(
+                _in_repo,
+                probe["path"],
+                run_fetch,
+                fetch,
+                fetch_max_age,
+                probe["remotes"],
+            )
+            for common_dir, probe in groups.items()
+            if "fetch" in needs
+        }
+        heads_futs = {
+            slug: pool.submit(gh_pr_list_merged_heads, repo=slug, cache=merged_cache)
+            for slug in slugs
+            if "merged_heads" in needs
+        }
+        fetched = {common_dir: fut.result() for common_dir, fut in fetch_futs.items()}
+        heads = {slug: fut.result() for slug, fut in heads_futs.items()}
+
+        diag_futs: dict[str, Any] = {}
+        for probe in probes:
+            if "error" in probe or probe["path"] in diag_futs:
+                continue
+            diag_futs[probe["path"]] = pool.submit(
+                _in_repo,
+                probe["path"],
+                run_diagnose,
+                backend,
+                prefetched=fetched.get(probe["common_dir"]),
+                merged_cache=merged_cache,
+                sections=sections,
+                # Non-GitHub remotes: let run_diagnose ask gh itself.
+                merged_pr_heads=heads.get(probe["slug"]),
+            )
+        for path, probe in zip(paths, probes):
+            if "error" in probe:
+                out.append({"repo": path, "diagnose_json": None, **probe})
+                continue
+            try:
+                result = diag_futs[probe["path"]].result()
+            except Exception as exc:  # noqa: BLE001
+                out.append(
+                    {
+                        "repo": probe["path"],
+                        "diagnose_json": None,
+                        "error": f"{type(exc).__name__}: {exc}",
+                    }
+                )
+                continue
+            out.append({"repo": probe["path"], "diagnose_json": result})
+    return out
 
 
 def main() -> int:
@@ -1180,9 +1943,82 @@ def main() -> int:
         description="Diagnose git repo state for up-to-date skill"
     )
     parser.add_argument("--pretty", action="store_true", help="pretty-print JSON")
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="plumbing",
+        help="how post-fetch git facts are gathered (default: plumbing)",
+    )
+    parser.add_argument(
+        "--fetch",
+        choices=FETCH_MODES,
+        default="auto",
+        help=(
+            "auto: skip `git fetch` if the repo (any worktree) fetched within "
+            "--fetch-max-age; always / never: as named (default: auto)"
+        ),
+    )
+    parser.add_argument(
+        "--fetch-max-age",
+        type=float,
+        default=FETCH_MAX_AGE_SECONDS,
+        metavar="SECONDS",
+        help=f"freshness window for --fetch=auto (default: {FETCH_MAX_AGE_SECONDS:g})",
+    )
+    parser.add_argument(
+        "--repos",
+        nargs="+",
+        metavar="PATH",
+        help=(
+            "fleet mode: diagnose every PATH in one process and print "
+            "[{repo, diagnose_json, error?}, ...]"
+        ),
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=FLEET_MAX_WORKERS,
+        help=f"fleet mode parallelism (default: {FLEET_MAX_WORKERS})",
+    )
+    parser.add_argument(
+        "--no-merged-cache",
+        action="store_true",
+        help="query merged PR heads from gh afresh instead of the on-disk cache",
+    )
+    parser.add_argument(
+        "--sections",
+        metavar="NAME[,NAME...]",
+        help=(
+            "emit only these top-level keys (plus errors) and skip work only "
+            f"the others need; choose from {', '.join(SECTIONS)} (default: all)"
+        ),
+    )
     args = parser.parse_args()
-
-    data = run_diagnose()
+    sections: frozenset[str] | None = None
+    if args.sections is not None:
+        try:
+            sections = parse_sections(args.sections)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    if args.repos:
+        data: Any = run_fleet(
+            args.repos,
+            backend=args.backend,
+            fetch=args.fetch,
+            fetch_max_age=args.fetch_max_age,
+            max_workers=max(1, args.max_workers),
+            merged_cache=not args.no_merged_cache,
+            sections=sections,
+        )
+    else:
+        data = run_diagnose(
+            backend=args.backend,
+            fetch=args.fetch,
+            fetch_max_age=args.fetch_max_age,
+            merged_cache=not args.no_merged_cache,
+            sections=sections,
+        )
     indent = 2 if args.pretty else None
     json.dump(data, sys.stdout, indent=indent)
     sys.stdout.write("\n")
@@ -4,6 +4,7 @@
 Run with: python3 -m unittest test_diagnose.py
 """
 
+import contextlib
 import json
 import os
 import subprocess
@@ -11,6 +12,7 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 # sys.path setup for sibling module imports lives in conftest.py —
 # `unittest discover` adds the start dir automatically; pytest and
@@ -19,22 +21,33 @@ import diagnose
 from diagnose import (
     CherryAnalysis,
     MachineInfo,
+    RefSnapshot,
     Remote,
     WorktreeRef,
+    cached_merged_heads,
     check_post_up_to_date,
     check_shared_claude_md,
     classify_dev_machine,
     classify_machine,
     classify_remotes,
     compute_slot_action,
+    fetch_age,
     gh_pr_list_merged_heads,
+    github_slug,
     is_fork_url,
+    merge_merged_prs,
+    merged_heads_cache_path,
     parse_cherry_status,
     parse_left_right_count,
+    parse_ref_snapshot,
+    parse_sections,
     parse_remotes,
+    parse_status_branch,
     parse_symbolic_ref_output,
     parse_worktree_list,
+    remotes_key,
     resolve_chop_root,
+    section_needs,
 )
 
 FORK_ORGS = ["idvorkin-ai-tools"]
@@ -312,6 +325,262 @@ class TestParseSymbolicRefOutput(unittest.TestCase):
         self.assertIsNone(parse_symbolic_ref_output("refs/remotes/origin/", "origin"))
 
 
+class TestParseRefSnapshot(unittest.TestCase):
+    def test_symref_head_wins(self):
+        raw = (
+            "refs/heads/feat\taaa\t\n"
+            "refs/heads/main\tbbb\t\n"
+            "refs/remotes/origin/HEAD\tccc\trefs/remotes/origin/trunk\n"
+            "refs/remotes/origin/main\tccc\t\n"
+        )
+        self.assertEqual(
+            parse_ref_snapshot(raw, "origin"),
+            RefSnapshot(
+                local_branch_shas={"feat": "aaa", "main": "bbb"},
+                default_branch="trunk",
+            ),
+        )
+
+    def test_falls_back_to_master_then_main(self):
+        raw = "refs/remotes/upstream/master\tccc\t\n"
+        self.assertEqual(parse_ref_snapshot(raw, "upstream").default_branch, "master")
+        self.assertEqual(parse_ref_snapshot("", "origin").default_branch, "main")
+
+    def test_other_remote_head_ignored(self):
+        raw = "refs/remotes/origin/HEAD\tccc\trefs/remotes/origin/dev\n"
+        self.assertEqual(parse_ref_snapshot(raw, "upstream").default_branch, "main")
+
+    def test_slashed_branch_names_kept_whole(self):
+        raw = "refs/heads/delegated/fix-x\taaa\t\n"
+        self.assertEqual(
+            parse_ref_snapshot(raw, "origin").local_branch_shas,
+            {"delegated/fix-x": "aaa"},
+        )
+
+
+class TestParseStatusBranch(unittest.TestCase):
+    def test_tracking_branch_and_entries(self):
+        raw = '## main...origin/main [ahead 1]\nMM "a b.txt"\n?? new\n'
+        self.assertEqual(parse_status_branch(raw), ("main", ['MM "a b.txt"', "?? new"]))
+
+    def test_header_forms(self):
+        self.assertEqual(parse_status_branch("## feat/x")[0], "feat/x")
+        self.assertEqual(parse_status_branch("## No commits yet on main")[0], "main")
+        self.assertEqual(parse_status_branch("## HEAD (no branch)")[0], "")
+        self.assertEqual(parse_status_branch("## main...origin/main [gone]")[0], "main")
+
+    def test_empty(self):
+        self.assertEqual(parse_status_branch(""), ("", []))
+
+
+class TestGithubSlug(unittest.TestCase):
+    def test_ssh_and_https(self):
+        self.assertEqual(
+            github_slug("git@github.com:idvorkin/chop.git"), "idvorkin/chop"
+        )
+        self.assertEqual(
+            github_slug("https://github.com/idvorkin/chop"), "idvorkin/chop"
+        )
+        self.assertEqual(github_slug("https://github.com/a/b.c.git/"), "a/b.c")
+
+    def test_non_github(self):
+        self.assertIsNone(github_slug("/tmp/origin"))
+        self.assertIsNone(github_slug("git@gitlab.com:a/b.git"))
+
+
+class TestParseSections(unittest.TestCase):
+    def test_comma_list_with_blanks_and_spaces(self):
+        self.assertEqual(
+            parse_sections("branch, worktree,,"), frozenset({"branch", "worktree"})
+        )
+
+    def test_unknown_names_raise(self):
+        with self.assertRaisesRegex(ValueError, "bogus, nope"):
+            parse_sections("branch,nope,bogus")
+
+    def test_every_section_has_needs(self):
+        self.assertEqual(set(diagnose.SECTIONS), set(diagnose.SECTION_NEEDS))
+
+
+class TestSectionNeeds(unittest.TestCase):
+    def test_local_sections_need_no_network(self):
+        needs = section_needs({"worktree", "post_up_to_date_path"})
+        self.assertFalse(needs & {"fetch", "pr", "merged_heads", "machine"})
+
+    def test_branch_needs_head_cherry_only(self):
+        needs = section_needs({"branch"})
+        self.assertIn("head_cherry", needs)
+        self.assertNotIn("cherry", needs)
+        self.assertNotIn("merged_heads", needs)
+
+    def test_absorption_needs_merged_heads_and_cherry_batch(self):
+        needs = section_needs({"squash_merged_branches"})
+        self.assertLessEqual({"cherry", "merged_heads", "fetch"}, needs)
+
+    def test_union(self):
+        self.assertEqual(
+            section_needs({"pr", "shared_claude_md"}),
+            frozenset({"remotes", "git_state", "pr", "machine"}),
+        )
+
+
+class TestFetchAge(unittest.TestCase):
+    ONE = [Remote("origin", "git@github.com:idvorkin/chop.git")]
+    TWO = ONE + [Remote("upstream", "git@github.com:other/chop.git")]
+
+    def stamp(self, remotes, at):
+        return {"fetched_at": at, "remotes": remotes_key(remotes)}
+
+    def test_no_evidence(self):
+        self.assertIsNone(fetch_age(None, None, self.ONE, now=100.0))
+
+    def test_stamp_for_same_remotes(self):
+        self.assertEqual(
+            fetch_age(self.stamp(self.TWO, 90.0), None, self.TWO, 100.0), 10.0
+        )
+
+    def test_stamp_for_other_remotes_ignored(self):
+        self.assertIsNone(fetch_age(self.stamp(self.ONE, 90.0), None, self.TWO, 100.0))
+
+    def test_fetch_head_counts_only_for_single_remote(self):
+        self.assertEqual(fetch_age(None, 95.0, self.ONE, 100.0), 5.0)
+        self.assertIsNone(fetch_age(None, 95.0, self.TWO, 100.0))
+
+    def test_freshest_evidence_wins_and_future_clamps(self):
+        self.assertEqual(
+            fetch_age(self.stamp(self.ONE, 50.0), 98.0, self.ONE, 100.0), 2.0
+        )
+        self.assertEqual(
+            fetch_age(self.stamp(self.ONE, 150.0), None, self.ONE, 100.0), 0.0
+        )
+
+    def test_malformed_state(self):
+        self.assertIsNone(fetch_age({"fetched_at": "x"}, None, self.TWO, 100.0))
+        self.assertIsNone(fetch_age(["nope"], None, self.TWO, 100.0))
+
+
+class TestRunFetchSharedAcrossWorktrees(unittest.TestCase):
+    """A fetch stamped from one worktree lets another worktree of the same
+    repo skip its fetch under --fetch=auto; `always` / `never` override."""
+
+    def _git(self, cwd: Path, *args: str) -> None:
+        subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+    def test_stamp_is_shared(self):
+        with tempfile.TemporaryDirectory() as td:
+            env = {k: v for k, v in os.environ.items() if not k.startswith("GIT_")}
+            env["HOME"] = td
+            env["GIT_CONFIG_NOSYSTEM"] = "1"
+            cwd = os.getcwd()
+            with mock.patch.dict(os.environ, env, clear=True):
+                for key, value in (
+                    ("user.email", "test@test"),
+                    ("user.name", "test"),
+                    ("commit.gpgsign", "false"),
+                ):
+                    self._git(Path(td), "config", "--global", key, value)
+                origin, local = Path(td) / "origin", Path(td) / "local"
+                origin.mkdir()
+                self._git(origin, "init", "-q")
+                self._git(origin, "commit", "-q", "--allow-empty", "-m", "i")
+                self._git(Path(td), "clone", "-q", str(origin), str(local))
+                self._git(local, "worktree", "add", "-q", "../wt", "-b", "wt")
+                remotes = [Remote("origin", str(origin))]
+                try:
+                    os.chdir(local)
+                    proc, first = diagnose.run_fetch("auto", 60.0, remotes)
+                    self.assertTrue(first["performed"])
+                    self.assertEqual(proc.returncode, 0)
+                    os.chdir(Path(td) / "wt")
+                    proc, second = diagnose.run_fetch("auto", 60.0, remotes)
+                    self.assertIsNone(proc)
+                    self.assertFalse(second["performed"])
+                    self.assertLess(second["age_seconds"], 60.0)
+                    # always / never ignore the stamp.
+                    self.assertTrue(
+                        diagnose.run_fetch("always", 60.0, remotes)[1]["performed"]
+                    )
+                    self.assertEqual(
+                        diagnose.run_fetch("never", 0.0, remotes),
+                        (
+                            None,
+                            {
+                                "mode": "never",
+                                "performed": False,
+                                "age_seconds": None,
+                                "max_age_seconds": 0.0,
+                            },
+                        ),
+                    )
+                finally:
+                    os.chdir(cwd)
+
+
+class TestRunFleet(unittest.TestCase):
+    """Fleet mode diagnoses N checkouts in one process: one fetch per git
+    common dir, one merged-PR lookup per GitHub slug, results in input
+    order with per-path errors."""
+
+    def _git(self, cwd: Path, *args: str) -> None:
+        subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+    def test_fleet(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            env = {k: v for k, v in os.environ.items() if not k.startswith("GIT_")}
+            env["HOME"] = td
+            env["CHOP_CONVENTIONS_ROOT"] = str(root / "nowhere")
+            env["GIT_CONFIG_NOSYSTEM"] = "1"
+            with mock.patch.dict(os.environ, env, clear=True):
+                for key, value in (
+                    ("user.email", "test@test"),
+                    ("user.name", "test"),
+                    ("commit.gpgsign", "false"),
+                    ("init.defaultBranch", "main"),
+                ):
+                    self._git(root, "config", "--global", key, value)
+                origin = root / "origin"
+                origin.mkdir()
+                self._git(origin, "init", "-q")
+                self._git(origin, "commit", "-q", "--allow-empty", "-m", "i")
+                self._git(root, "clone", "-q", str(origin), str(root / "a"))
+                self._git(root, "clone", "-q", str(origin), str(root / "b"))
+                self._git(root / "a", "worktree", "add", "-q", "../a-wt", "-b", "wt")
+                (root / "plain").mkdir()
+                paths = [
+                    str(root / "a"),
+                    str(root / "a-wt"),
+                    str(root / "b"),
+                    str(root / "missing"),
+                    str(root / "plain"),
+                ]
+                with (
+                    mock.patch.object(diagnose, "gh_pr_view_json", return_value=None),
+                    mock.patch.object(
+                        diagnose, "gh_pr_list_merged_heads", return_value={}
+                    ) as heads,
+                    mock.patch.object(
+                        diagnose, "github_slug", return_value="acme/widgets"
+                    ),
+                    mock.patch.object(
+                        diagnose, "run_fetch", wraps=diagnose.run_fetch
+                    ) as fetch,
+                ):
+                    out = diagnose.run_fleet(paths, max_workers=4)
+
+        self.assertEqual([e["repo"] for e in out], paths)
+        self.assertEqual(fetch.call_count, 2)  # a + its worktree share one
+        heads.assert_called_once_with(repo="acme/widgets", cache=True)
+        a, wt, b, missing, plain = out
+        self.assertEqual(a["diagnose_json"]["branch"]["name"], "main")
+        self.assertEqual(wt["diagnose_json"]["branch"]["name"], "wt")
+        self.assertEqual(b["diagnose_json"]["branch"]["name"], "main")
+        self.assertTrue(a["diagnose_json"]["fetch"]["performed"])
+        self.assertEqual(missing["error"], "not a directory")
+        self.assertEqual(plain["error"], "not a git repository")
+        self.assertIsNone(plain["diagnose_json"])
+
+
 class TestClassifyMachine(unittest.TestCase):
     def test_darwin_with_mac_ver(self):
         machine, reasons = classify_machine(
@@ -863,6 +1132,142 @@ class TestRunDiagnoseForceAlignOnMain(unittest.TestCase):
             self.assertEqual(len(branch["ahead_patch_equivalent_commits"]), 1)
 
 
+class TestBackendsAgree(unittest.TestCase):
+    """The plumbing and porcelain git backends must produce identical
+    diagnose output. Runs `run_diagnose` in-process against a throwaway
+    origin + clone with branches, a linked worktree, a stash, and
+    staged / renamed / untracked files (including a path with a space);
+    gh lookups are stubbed out. The same fixture checks that `sections`
+    subsets match the full output and skip the work they don't need."""
+
+    def _git(self, cwd: Path, *args: str) -> None:
+        subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+    def _commit(self, repo: Path, name: str, content: str) -> None:
+        (repo / name).write_text(content, encoding="utf-8")
+        self._git(repo, "add", name)
+        self._git(repo, "commit", "-q", "-m", f"add {name}")
+
+    @contextlib.contextmanager
+    def _repo(self):
+        """Yield the fixture clone as the cwd, inside a scrubbed env."""
+        with tempfile.TemporaryDirectory() as td:
+            env = {k: v for k, v in os.environ.items() if not k.startswith("GIT_")}
+            env["HOME"] = str(Path(td) / "home")
+            env["CHOP_CONVENTIONS_ROOT"] = str(Path(td) / "nowhere")
+            env["GIT_CONFIG_NOSYSTEM"] = "1"
+            cwd = os.getcwd()
+            with mock.patch.dict(os.environ, env, clear=True):
+                Path(env["HOME"]).mkdir()
+                for key, value in (
+                    ("user.email", "test@test"),
+                    ("user.name", "test"),
+                    ("commit.gpgsign", "false"),
+                    ("init.defaultBranch", "main"),
+                ):
+                    self._git(Path(td), "config", "--global", key, value)
+                origin, local = Path(td) / "origin", Path(td) / "local"
+                origin.mkdir()
+                self._git(origin, "init", "-q")
+                self._commit(origin, "README.md", "# r\n")
+                self._git(Path(td), "clone", "-q", str(origin), str(local))
+                self._commit(origin, "upstream.txt", "u\n")
+                self._git(local, "checkout", "-q", "-b", "feat")
+                self._commit(local, "feat.txt", "f\n")
+                self._git(local, "branch", "old", "main")
+                self._git(local, "worktree", "add", "-q", "../wt", "-b", "wt-branch")
+                (local / "stashed.txt").write_text("s\n", encoding="utf-8")
+                self._git(local, "add", "stashed.txt")
+                self._git(local, "stash", "-q")
+                self._git(local, "mv", "feat.txt", "renamed.txt")
+                (local / "a b.txt").write_text("x\n", encoding="utf-8")
+                try:
+                    os.chdir(local)
+                    yield local
+                finally:
+                    os.chdir(cwd)
+
+    def test_same_output(self):
+        with (
+            self._repo(),
+            mock.patch.object(diagnose, "gh_pr_view_json", return_value=None),
+            mock.patch.object(diagnose, "gh_pr_list_merged_heads", return_value={}),
+        ):
+            porcelain = diagnose.run_diagnose(backend="porcelain")
+            plumbing = diagnose.run_diagnose(backend="plumbing")
+        # The first run fetched and stamped, so the second one skipped.
+        self.assertTrue(porcelain.pop("fetch")["performed"])
+        self.assertFalse(plumbing.pop("fetch")["performed"])
+        self.assertEqual(plumbing, porcelain)
+        # Only the expected chop_root_unresolved dict; no git failures.
+        self.assertEqual([e for e in plumbing["errors"] if isinstance(e, str)], [])
+        branch = plumbing["branch"]
+        self.assertEqual(
+            (branch["name"], branch["behind"], branch["ahead"]), ("feat", 1, 1)
+        )
+        self.assertEqual(len(plumbing["worktree"]["stashes"]), 1)
+        self.assertIn('?? "a b.txt"', plumbing["worktree"]["uncommitted"])
+        self.assertEqual(len(plumbing["worktrees"]), 2)
+        self.assertIn("old", plumbing["absorbable_branches"])
+
+    def test_unstaged_modify_as_first_entry(self):
+        # `status --porcelain` lists README.md first; its ` M` code must
+        # keep the leading space on both backends.
+        with (
+            self._repo() as local,
+            mock.patch.object(diagnose, "gh_pr_view_json", return_value=None),
+            mock.patch.object(diagnose, "gh_pr_list_merged_heads", return_value={}),
+        ):
+            (local / "README.md").write_text("# changed\n", encoding="utf-8")
+            porcelain = diagnose.run_diagnose(fetch="never", backend="porcelain")
+            plumbing = diagnose.run_diagnose(fetch="never", backend="plumbing")
+        self.assertEqual(plumbing, porcelain)
+        self.assertEqual(plumbing["worktree"]["uncommitted"][0], " M README.md")
+
+    def test_sections_subset_matches_full_output(self):
+        with (
+            self._repo(),
+            mock.patch.object(diagnose, "gh_pr_view_json", return_value=None) as view,
+            mock.patch.object(
+                diagnose, "gh_pr_list_merged_heads", return_value={}
+            ) as heads,
+            mock.patch.object(diagnose, "run_fetch", wraps=diagnose.run_fetch) as fetch,
+            mock.patch.object(
+                diagnose, "detect_machine", wraps=diagnose.detect_machine
+            ) as machine,
+        ):
+            full = diagnose.run_diagnose(fetch="never")
+            calls = (view, heads, fetch, machine)
+            for m in calls:
+                m.reset_mock()
+            local_only = diagnose.run_diagnose(
+                fetch="never", sections=frozenset({"worktree", "post_up_to_date_path"})
+            )
+            for m in calls:
+                m.assert_not_called()
+            branch_only = diagnose.run_diagnose(
+                fetch="never", sections=frozenset({"branch"})
+            )
+            absorption = diagnose.run_diagnose(
+                fetch="never", sections=frozenset({"absorbable_branches"})
+            )
+        self.assertEqual(
+            local_only,
+            {
+                "worktree": full["worktree"],
+                "post_up_to_date_path": full["post_up_to_date_path"],
+                "errors": [],
+            },
+        )
+        self.assertEqual(branch_only, {"branch": full["branch"], "errors": []})
+        self.assertEqual(
+            absorption,
+            {"absorbable_branches": full["absorbable_branches"], "errors": []},
+        )
+        heads.assert_called_once()
+        view.assert_not_called()
+
+
 class TestGhPrListMergedHeads(unittest.TestCase):
     """Unit tests for the squash-merge absorption fallback.
 
@@ -963,5 +1368,128 @@ class TestGhPrListMergedHeads(unittest.TestCase):
         self.assertEqual(result, {"kept": "sha1", "also-kept": "sha2"})
 
 
+class TestMergeMergedPrs(unittest.TestCase):
+    def test_adds_new_names(self):
+        out = merge_merged_prs({}, [("a", "sha1", "2026-01-02T00:00:00Z")])
+        self.assertEqual(out, {"a": ["sha1", "2026-01-02T00:00:00Z"]})
+
+    def test_newer_merge_of_same_branch_name_wins(self):
+        held = {"dup": ["old", "2026-01-01T00:00:00Z"]}
+        out = merge_merged_prs(held, [("dup", "new", "2026-02-01T00:00:00Z")])
+        self.assertEqual(out, {"dup": ["new", "2026-02-01T00:00:00Z"]})
+
+    def test_older_or_equal_merge_keeps_held_entry(self):
+        held = {"dup": ["newer", "2026-02-01T00:00:00Z"]}
+        prs = [
+            ("dup", "same-ts", "2026-02-01T00:00:00Z"),
+            ("dup", "older", "2026-01-01T00:00:00Z"),
+        ]
+        self.assertEqual(merge_merged_prs(held, prs), held)
+
+    def test_does_not_mutate_input(self):
+        held = {"a": ["sha1", "2026-01-01T00:00:00Z"]}
+        merge_merged_prs(held, [("b", "sha2", "2026-01-02T00:00:00Z")])
+        self.assertEqual(held, {"a": ["sha1", "2026-01-01T00:00:00Z"]})
+
+    def test_trims_to_newest_names(self):
+        prs = [(f"b{i}", "sha", f"2026-01-0{i}T00:00:00Z") for i in range(1, 6)]
+        with mock.patch.object(diagnose, "MERGED_HEADS_CACHE_MAX", 2):
+            out = merge_merged_prs({}, prs)
+        self.assertEqual(set(out), {"b4", "b5"})
+
+
+class TestCachedMergedHeads(unittest.TestCase):
+    """The on-disk merged-PR cache: cold fill, incremental `merged:>=`
+    refresh, gap refill on a full page, and stale serve when gh fails."""
+
+    def setUp(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.path = Path(td.name) / "acme__widgets.json"
+        self.calls: list[list[str]] = []
+
+    def _call(self, responses):
+        """Run `cached_merged_heads` with `_run` answering from `responses`
+        in order; a `None` response is a failing gh."""
+        answers = list(responses)
+
+        def fake_run(cmd, check=True):
+            _ = check
+            self.calls.append(cmd)
+            stdout = answers.pop(0)
+            return subprocess.CompletedProcess(
+                args=cmd,
+                returncode=1 if stdout is None else 0,
+                stdout=json.dumps(stdout) if stdout is not None else "",
+                stderr="",
+            )
+
+        with mock.patch.object(diagnose, "_run", fake_run):
+            return cached_merged_heads("acme/widgets", path=self.path)
+
+    @staticmethod
+    def _pr(name, oid, merged_at):
+        return {"headRefName": name, "headRefOid": oid, "mergedAt": merged_at}
+
+    def _search(self, cmd):
+        return cmd[cmd.index("--search") + 1] if "--search" in cmd else None
+
+    def test_cold_then_incremental(self):
+        first = self._call([[self._pr("feat/a", "aaa", "2026-03-01T10:00:00Z")]])
+        self.assertEqual(first, {"feat/a": "aaa"})
+        self.assertIsNone(self._search(self.calls[0]))
+        self.assertIn(str(diagnose.MERGED_HEADS_COLD_LIMIT), self.calls[0])
+        self.assertEqual(self.calls[0][-2:], ["--repo", "acme/widgets"])
+
+        self.calls.clear()
+        second = self._call([[self._pr("fix/b", "bbb", "2026-03-02T09:00:00Z")]])
+        self.assertEqual(second, {"feat/a": "aaa", "fix/b": "bbb"})
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self._search(self.calls[0]), "merged:>=2026-03-01T10:00:00Z")
+
+    def test_gh_failure_serves_stale_cache(self):
+        self._call([[self._pr("feat/a", "aaa", "2026-03-01T10:00:00Z")]])
+        self.assertEqual(self._call([None]), {"feat/a": "aaa"})
+
+    def test_gh_failure_without_cache_returns_empty(self):
+        self.assertEqual(self._call([None]), {})
+        self.assertFalse(self.path.exists())
+
+    def test_full_incremental_page_refills_horizon(self):
+        self._call([[self._pr("feat/a", "aaa", "2026-03-01T10:00:00Z")]])
+        self.calls.clear()
+        page = [self._pr(f"b{i}", f"sha{i}", "2026-03-05T00:00:00Z") for i in range(2)]
+        cold = [self._pr("gap", "ggg", "2026-03-03T00:00:00Z")]
+        with mock.patch.object(diagnose, "MERGED_HEADS_PAGE_LIMIT", 2):
+            result = self._call([page, cold])
+        self.assertEqual(len(self.calls), 2)
+        self.assertIsNotNone(self._search(self.calls[0]))
+        self.assertIsNone(self._search(self.calls[1]))
+        self.assertEqual(set(result), {"feat/a", "b0", "b1", "gap"})
+
+    def test_corrupt_cache_is_treated_as_cold(self):
+        self.path.write_text("{not json", encoding="utf-8")
+        result = self._call([[self._pr("feat/a", "aaa", "2026-03-01T10:00:00Z")]])
+        self.assertEqual(result, {"feat/a": "aaa"})
+        self.assertIsNone(self._search(self.calls[0]))
+
+    def test_cache_path_honours_xdg_cache_home(self):
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": "/x/cache"}):
+            self.assertEqual(
+                merged_heads_cache_path("acme/widgets"),
+                Path("/x/cache/chop-up-to-date/merged-heads/acme__widgets.json"),
+            )
+
+    def test_uncached_call_without_repo_never_touches_disk(self):
+        with mock.patch.object(diagnose, "cached_merged_heads") as cached:
+            with mock.patch.object(
+                diagnose,
+                "_run",
+                lambda cmd, check=True: subprocess.CompletedProcess(cmd, 1, "", ""),
+            ):
+                self.assertEqual(gh_pr_list_merged_heads(cache=True), {})
+        cached.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()